@@ -1,6 +1,227 @@
 import re
+from collections import namedtuple
+from functools import lru_cache
 
-def analyze_password(password, name, birth_date):
+from Lr1_entropy import estimate_strength
+
+# Результат класифікації пароля за один прохід
+PasswordClasses = namedtuple(
+    "PasswordClasses",
+    ["length", "lower", "has_upper", "has_lower", "has_digit", "has_symbol"],
+)
+
+# Бітові прапорці класів символів
+_UPPER, _LOWER, _DIGIT, _SYMBOL = 1, 2, 4, 8
+
+
+def _build_ascii_classes():
+    r"""
+    Таблиця для bytes.translate: кожен ASCII-байт -> його клас.
+    Відповідає регуляркам [A-Z], [a-z], \d та [^a-zA-Z0-9\s].
+    """
+    table = bytearray()
+    for code in range(256):
+        char = chr(code)
+        if "A" <= char <= "Z":
+            table.append(_UPPER)
+        elif "a" <= char <= "z":
+            table.append(_LOWER)
+        elif "0" <= char <= "9":
+            table.append(_DIGIT)
+        elif char.isspace():
+            table.append(0)
+        else:
+            table.append(_SYMBOL)
+    return bytes(table)
+
+
+_ASCII_CLASSES = _build_ascii_classes()
+
+
+def _classes_from_flags(password, flags):
+    return PasswordClasses(
+        len(password), password.lower(),
+        _UPPER in flags, _LOWER in flags, _DIGIT in flags, _SYMBOL in flags,
+    )
+
+
+def _unicode_flags(password):
+    """Повільний шлях для не-ASCII паролів (ті ж правила, що й у регулярках)."""
+    flags = set()
+    for char in password:
+        if char.isascii():
+            flags.add(_ASCII_CLASSES[ord(char)])
+            continue
+        # Не-ASCII цифра (\d) одночасно є і "спецсимволом" для [^a-zA-Z0-9\s]
+        if char.isdecimal():
+            flags.add(_DIGIT)
+        if not char.isspace():
+            flags.add(_SYMBOL)
+    return flags
+
+
+def classify_password(password):
+    """
+    Визначає класи символів, довжину та нижній регістр пароля за один прохід.
+
+    Для ASCII-паролів весь прохід виконується у C через bytes.translate.
+
+    Args:
+        password (str): Пароль.
+
+    Returns:
+        PasswordClasses: Довжина, пароль у нижньому регістрі та прапорці класів.
+    """
+    if password.isascii():
+        flags = set(password.encode("ascii").translate(_ASCII_CLASSES))
+    else:
+        flags = _unicode_flags(password)
+    return _classes_from_flags(password, flags)
+
+
+def classify_passwords(passwords):
+    """
+    Класифікує цілий пакет паролів.
+
+    ASCII-паролі пакуються в один буфер, який перекодовується в класи
+    одним викликом translate; далі кожен пароль - це лише зріз буфера.
+
+    Args:
+        passwords (list): Список паролів.
+
+    Returns:
+        list: PasswordClasses для кожного пароля у тому ж порядку.
+    """
+    ascii_passwords = [p for p in passwords if p.isascii()]
+    packed = "".join(ascii_passwords).encode("ascii").translate(_ASCII_CLASSES)
+
+    results = []
+    offset = 0
+    for password in passwords:
+        if password.isascii():
+            end = offset + len(password)
+            flags = set(packed[offset:end])
+            offset = end
+        else:
+            flags = _unicode_flags(password)
+        results.append(_classes_from_flags(password, flags))
+    return results
+
+
+# --- Особисті дані: похідні токени ---
+
+# Транслітерація кирилиці латиницею (спрощена українська схема)
+_TRANSLIT = str.maketrans({
+    "а": "a", "б": "b", "в": "v", "г": "h", "ґ": "g", "д": "d", "е": "e", "є": "ie",
+    "ж": "zh", "з": "z", "и": "y", "і": "i", "ї": "i", "й": "i", "к": "k", "л": "l",
+    "м": "m", "н": "n", "о": "o", "п": "p", "р": "r", "с": "s", "т": "t", "у": "u",
+    "ф": "f", "х": "kh", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "shch", "ь": "",
+    "ю": "iu", "я": "ia", "'": "", "ʼ": "", "ё": "e", "ы": "y", "э": "e", "ъ": "",
+})
+
+# Типові leetspeak-заміни літер
+_LEET = {"a": "4@", "b": "8", "e": "3", "g": "9", "i": "1!", "l": "1", "o": "0", "s": "5$", "t": "7"}
+
+# Мінімальна довжина частини імені, яку варто шукати окремо
+_MIN_NAME_PART = 3
+
+
+def _leet_pattern(token):
+    """Регулярний вираз для токена з урахуванням leetspeak (anna -> [a4@]nn[a4@])."""
+    parts = []
+    for char in token:
+        variants = _LEET.get(char)
+        if variants:
+            parts.append("[" + re.escape(char + variants) + "]")
+        else:
+            parts.append(re.escape(char))
+    return "".join(parts)
+
+
+def _alternation(tokens):
+    # Довші токени першими, щоб "08112004" мав пріоритет над "0811"
+    return "|".join(sorted(tokens, key=lambda token: (-len(token), token)))
+
+
+class PersonalDataMatcher:
+    """
+    Усі похідні токени особистих даних одного користувача.
+
+    Токени генеруються один раз і для кожної категорії компілюються в один
+    регулярний вираз. Категорії шукаються окремо: збіги різних категорій
+    можуть перекриватися (день/місяць "01" усередині року "1990").
+
+    Категорії:
+        name      - ім'я, його частини, транслітерація та leetspeak-форми;
+        year      - рік та всі форми дати, що містять рік (DDMMYYYY, YYMMDD, ...);
+        day_month - день, місяць, DDMM та MMDD.
+
+    Порожні токени відкидаються, тож порожня дата нічого не знаходить.
+    Порожнє ім'я, як і раніше ("" in password), вважається знайденим у будь-якому паролі.
+    """
+
+    def __init__(self, name, birth_date):
+        self.tokens = {
+            "name": self._name_tokens(name),
+            "year": set(),
+            "day_month": set(),
+        }
+        self._date_tokens(birth_date)
+        for tokens in self.tokens.values():
+            tokens.discard("")
+        self._always = {"name"} if name == "" else set()
+
+        self._patterns = []
+        for category, tokens in self.tokens.items():
+            if tokens:
+                patterns = {_leet_pattern(t) if category == "name" else re.escape(t) for t in tokens}
+                self._patterns.append((category, re.compile(_alternation(patterns))))
+
+    @staticmethod
+    def _name_tokens(name):
+        name_lower = name.lower()
+        tokens = {name_lower}
+        tokens.update(part for part in re.split(r"[\s\-]+", name_lower) if len(part) >= _MIN_NAME_PART)
+        tokens.update([token.translate(_TRANSLIT) for token in tokens])
+        return tokens
+
+    def _date_tokens(self, birth_date):
+        parts = birth_date.split(".")
+        year = parts[-1]
+        self.tokens["year"].add(year)
+        if len(parts) != 3:
+            return
+
+        day, month = parts[0], parts[1]
+        short_year = year[-2:]
+        self.tokens["year"].update([
+            day + month + year, year + month + day, month + day + year,
+            day + month + short_year, short_year + month + day,
+            (day + month + year)[::-1], year[::-1], birth_date,
+        ])
+        self.tokens["day_month"].update([day + month, month + day, day, month])
+
+    def scan(self, password_lower):
+        """
+        Шукає токени у паролі (в нижньому регістрі): один пошук на категорію.
+
+        Returns:
+            set: Категорії, знайдені в паролі.
+        """
+        found = set(self._always)
+        for category, pattern in self._patterns:
+            if category not in found and pattern.search(password_lower):
+                found.add(category)
+        return found
+
+
+@lru_cache(maxsize=4096)
+def personal_matcher(name, birth_date):
+    """Кешований PersonalDataMatcher: токени користувача будуються лише раз."""
+    return PersonalDataMatcher(name, birth_date)
+
+
+def analyze_password(password, name, birth_date, breach_index=None):
     """
     Аналізує пароль на основі особистих даних та різних критеріїв.
 
@@ -8,6 +229,8 @@ def analyze_password(password, name, birth_date):
         password (str): Пароль для аналізу.
         name (str): Ім'я користувача.
         birth_date (str): Дата народження користувача (у форматі DD.MM.YYYY).
+        breach_index (BreachIndex): Індекс зламаних паролів з Lr1_index
+            (None - вбудований список поширених слів).
 
     Returns:
         tuple: Оцінка безпеки (1-10) та список рекомендацій.
@@ -15,28 +238,27 @@ def analyze_password(password, name, birth_date):
 
     score = 0
     recommendations = []
+    classes = classify_password(password)
+    password_lower = classes.lower
 
     # 1. Аналіз зв'язку з особистими даними
-    name_lower = name.lower()
-    if name_lower in password.lower():
+    personal = personal_matcher(name, birth_date).scan(password_lower)
+    if "name" in personal:
         recommendations.append("Уникайте використання імені у паролі.")
     else:
         score += 2 # Не містить імені
 
-    year = birth_date.split('.')[-1]
-    if year in password :
+    if "year" in personal:
         recommendations.append("Уникайте використання року народження у паролі.")
     else:
         score += 2 # Не містить рік
 
-#Інші варіанти дати    
-# month = birth_date.split('.')[1]
-    # day = birth_date.split('.')[0]
-    # if month in password or day in password:
-    #     recommendations.append("Уникайте використання місяця або дня народження у паролі")
+    # Інші варіанти дати
+    if "day_month" in personal:
+        recommendations.append("Уникайте використання місяця або дня народження у паролі.")
 
     # 2. Оцінювання складності
-    length = len(password)
+    length = classes.length
     if length >= 12:
         score += 3
     elif length >= 8:
@@ -45,26 +267,24 @@ def analyze_password(password, name, birth_date):
         recommendations.append("Збільште довжину пароля (мінімум 8 символів, краще 12+).")
 
     # Різноманітність символів
-    has_upper = bool(re.search(r"[A-Z]", password))
-    has_lower = bool(re.search(r"[a-z]", password))
-    has_digit = bool(re.search(r"\d", password))
-    has_symbol = bool(re.search(r"[^a-zA-Z0-9\s]", password))
-
-    if has_upper and has_lower and has_digit and has_symbol:
+    if classes.has_upper and classes.has_lower and classes.has_digit and classes.has_symbol:
         score += 3
-    elif (has_upper or has_lower) and has_digit:
+    elif (classes.has_upper or classes.has_lower) and classes.has_digit:
         score += 1
     else:
         recommendations.append("Використовуйте великі та малі літери, цифри та спеціальні символи.")
 
 
     #Приклад простої перевірки на словникові слова (потрібна база даних для кращого аналізу)
-    common_words = ["password", "qwerty", "123456"]
-    password_lower = password.lower()
-    for word in common_words:
-        if word in password_lower:
+    if breach_index is not None:
+        if password_lower in breach_index or breach_index.has_substring(password_lower):
             recommendations.append("Уникайте використання поширених слів у паролі.")
-            break
+    else:
+        common_words = ["password", "qwerty", "123456"]
+        for word in common_words:
+            if word in password_lower:
+                recommendations.append("Уникайте використання поширених слів у паролі.")
+                break
 
 
     # Нормалізація оцінки
@@ -83,6 +303,10 @@ if __name__ == "__main__":
     print("\nРезультати аналізу:")
     print(f"Оцінка безпеки: {score}/10")
 
+    # Детальніша оцінка: скільки спроб знадобиться для підбору
+    estimate = estimate_strength(password)
+    print(f"Орієнтовна кількість спроб для підбору: ~10^{estimate.guesses_log10:.1f}")
+
     if recommendations:
         print("\nРекомендації:")
         for recommendation in recommendations:
@@ -0,0 +1,147 @@
+import argparse
+import csv
+import json
+import sys
+import time
+from multiprocessing import Pool
+
+from Lr1 import analyze_password
+from Lr1_entropy import estimate_strength
+from Lr1_index import BreachIndex
+
+# Поля, які очікуються у кожному рядку вхідного файлу
+FIELDS = ("password", "name", "birth_date")
+
+
+# --- Читання вхідних даних ---
+
+def read_rows(path):
+    """
+    Потоково читає рядки (password, name, birth_date) з CSV або JSONL файлу.
+
+    Формат визначається за розширенням: `.jsonl`/`.ndjson` - JSON-об'єкт
+    на рядок, усе інше - CSV із заголовком password,name,birth_date.
+    Файл не завантажується в пам'ять повністю.
+
+    Args:
+        path (str): Шлях до файлу або "-" для стандартного вводу.
+
+    Yields:
+        tuple: (password, name, birth_date).
+    """
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8", newline="")
+    try:
+        if path.endswith((".jsonl", ".ndjson")):
+            for line in stream:
+                if line.strip():
+                    record = json.loads(line)
+                    yield tuple(record.get(field, "") for field in FIELDS)
+        else:
+            for record in csv.DictReader(stream):
+                yield tuple(record.get(field) or "" for field in FIELDS)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+# Налаштування поточного процесу (задаються один раз на воркер)
+_breach_index = None
+_with_estimate = False
+
+
+def _init_worker(index_path, with_estimate):
+    global _breach_index, _with_estimate
+    _breach_index = BreachIndex(index_path) if index_path else None
+    _with_estimate = with_estimate
+
+
+def _analyze_row(row):
+    """Обгортка для пулу процесів: один рядок -> (оцінка, рекомендації, log10 спроб)."""
+    score, recommendations = analyze_password(*row, breach_index=_breach_index)
+    guesses_log10 = round(estimate_strength(row[0]).guesses_log10, 2) if _with_estimate else None
+    return score, recommendations, guesses_log10
+
+
+# --- Пакетний аналіз ---
+
+def analyze_rows(rows, workers=None, chunksize=1000, index_path=None, with_estimate=False):
+    """
+    Аналізує потік рядків у пулі процесів, зберігаючи порядок.
+
+    Оцінки повністю збігаються з викликом analyze_password для кожного
+    рядка окремо, бо воркери викликають саме цю функцію.
+
+    Args:
+        rows (iterable): Кортежі (password, name, birth_date).
+        workers (int): Кількість процесів (None - за кількістю ядер, 0 - без пулу).
+        chunksize (int): Скільки рядків передавати воркеру за раз.
+        index_path (str): Індекс зламаних паролів (див. Lr1_index), необов'язково.
+        with_estimate (bool): Додатково оцінити log10 кількості спроб (Lr1_entropy).
+
+    Yields:
+        tuple: (оцінка, список рекомендацій, log10 спроб або None) у порядку вхідних рядків.
+    """
+    if workers == 0:
+        _init_worker(index_path, with_estimate)
+        for row in rows:
+            yield _analyze_row(row)
+        return
+
+    # Кожен воркер відображає той самий файл індексу - сторінки спільні між процесами
+    with Pool(workers, initializer=_init_worker, initargs=(index_path, with_estimate)) as pool:
+        # imap не вичитує весь вхід наперед, тому пам'ять не росте з розміром файлу
+        yield from pool.imap(_analyze_row, rows, chunksize)
+
+
+def write_results(results, stream):
+    """
+    Записує результати у потік по одному JSON-об'єкту на рядок.
+
+    Returns:
+        int: Кількість записаних рядків.
+    """
+    count = 0
+    for count, (score, recommendations, guesses_log10) in enumerate(results, 1):
+        record = {"row": count, "score": score, "recommendations": recommendations}
+        if guesses_log10 is not None:
+            record["guesses_log10"] = guesses_log10
+        stream.write(json.dumps(record, ensure_ascii=False))
+        stream.write("\n")
+    return count
+
+
+def run_batch(input_path, output_path="-", workers=None, chunksize=1000, index_path=None,
+              with_estimate=False):
+    """
+    Повний цикл: читання -> аналіз у пулі -> потоковий запис.
+
+    Returns:
+        tuple: (кількість рядків, швидкість у рядках/сек).
+    """
+    start = time.perf_counter()
+    results = analyze_rows(read_rows(input_path), workers, chunksize, index_path, with_estimate)
+
+    if output_path == "-":
+        count = write_results(results, sys.stdout)
+    else:
+        with open(output_path, "w", encoding="utf-8") as out:
+            count = write_results(results, out)
+
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else 0.0
+    return count, rate
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Пакетний аудит паролів (CSV/JSONL -> JSONL)")
+    parser.add_argument("input", help="CSV з заголовком password,name,birth_date або JSONL ('-' - stdin)")
+    parser.add_argument("-o", "--output", default="-", help="Файл результатів JSONL ('-' - stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Кількість процесів (0 - без пулу)")
+    parser.add_argument("-c", "--chunksize", type=int, default=1000, help="Розмір пакета для воркера")
+    parser.add_argument("-i", "--index", default=None, help="Індекс зламаних паролів (Lr1_index.py build)")
+    parser.add_argument("-e", "--estimate", action="store_true", help="Додати оцінку log10 кількості спроб")
+    args = parser.parse_args()
+
+    total, rows_per_sec = run_batch(args.input, args.output, args.workers, args.chunksize,
+                                    args.index, args.estimate)
+    print(f"[+] Оброблено рядків: {total}, швидкість: {rows_per_sec:.0f} рядків/сек", file=sys.stderr)
@@ -0,0 +1,368 @@
+import math
+import re
+from collections import namedtuple
+from datetime import date
+from functools import lru_cache
+
+# Оцінка кількості спроб для підбору пароля в стилі zxcvbn:
+# пароль розбивається на фрагменти (слова, клавіатурні доріжки, повтори,
+# послідовності, дати), для кожного фрагмента оцінюється кількість спроб,
+# а динамічне програмування шукає найдешевше для зловмисника розбиття.
+
+Match = namedtuple("Match", ["pattern", "token", "guesses"])
+StrengthEstimate = namedtuple("StrengthEstimate", ["guesses", "guesses_log10", "score", "sequence"])
+
+# Довші паролі аналізуються лише за першими символами (решта - перебір)
+MAX_ANALYZED_LENGTH = 64
+
+# Потужність алфавіту для перебору та мінімальні оцінки фрагментів
+BRUTEFORCE_CARDINALITY = 10
+MIN_GUESSES_SINGLE_CHAR = 10
+MIN_GUESSES_MULTI_CHAR = 50
+
+REFERENCE_YEAR = date.today().year
+MIN_YEAR_SPACE = 20
+
+
+# --- Таблиці (будуються один раз при імпорті і спільні для всіх викликів) ---
+
+# Найпоширеніші паролі та слова у порядку популярності (ранг = позиція + 1)
+_BUILTIN_WORDS = """
+123456 password 12345678 qwerty 123456789 12345 1234 111111 1234567 dragon
+123123 baseball abc123 football monkey letmein 696969 shadow master 666666
+qwertyuiop 123321 mustang 1234567890 michael 654321 superman 1qaz2wsx 7777777
+121212 000000 qazwsx 123qwe killer trustno1 jordan jennifer zxcvbnm asdfgh hunter
+buster soccer harley batman andrew tigger sunshine iloveyou 2000 charlie robert
+thomas hockey ranger daniel starwars klaster 112233 george computer michelle
+jessica pepper 1111 zxcvbn 555555 11111111 131313 freedom 777777 pass maggie
+159753 aaaaaa ginger princess joshua cheese amanda summer love ashley nicole
+chelsea biteme matthew access yankees 987654321 dallas austin thunder taylor
+matrix admin welcome login secret hello world anna olena oksana kyiv ukraine
+""".split()
+
+RANKED_DICTIONARY = {word: rank for rank, word in enumerate(_BUILTIN_WORDS, 1)}
+
+# Зворотні leetspeak-заміни (дві таблиці, бо "1" може бути і "i", і "l")
+_UNLEET_TABLES = (
+    str.maketrans({"4": "a", "@": "a", "8": "b", "3": "e", "9": "g", "1": "i", "!": "i",
+                   "0": "o", "5": "s", "$": "s", "7": "t"}),
+    str.maketrans({"4": "a", "@": "a", "8": "b", "3": "e", "9": "g", "1": "l", "!": "i",
+                   "0": "o", "5": "s", "$": "s", "7": "t"}),
+)
+_LEET_CHARS = frozenset("4@83915$70!")
+
+# Клавіатура QWERTY: ряди зі зсувом вправо, як на реальній клавіатурі
+_QWERTY_ROWS = (
+    ("`~", "1!", "2@", "3#", "4$", "5%", "6^", "7&", "8*", "9(", "0)", "-_", "=+"),
+    ("qQ", "wW", "eE", "rR", "tT", "yY", "uU", "iI", "oO", "pP", "[{", "]}", "\\|"),
+    ("aA", "sS", "dD", "fF", "gG", "hH", "jJ", "kK", "lL", ";:", "'\""),
+    ("zZ", "xX", "cC", "vV", "bB", "nN", "mM", ",<", ".>", "/?"),
+)
+
+
+def _build_keyboard_graph():
+    """
+    Граф сусідства клавіш: символ -> {сусідній символ: напрямок}.
+    Напрямки 0..5: ліво, право, верх-ліво, верх-право, низ-ліво, низ-право.
+    """
+    positions = {}
+    for row_idx, row in enumerate(_QWERTY_ROWS):
+        for col_idx, key in enumerate(row):
+            positions[(row_idx, col_idx)] = key
+
+    # На похилій клавіатурі верхні сусіди - (col, col+1), нижні - (col-1, col)
+    offsets = ((0, -1), (0, 1), (-1, 0), (-1, 1), (1, -1), (1, 0))
+    graph = {}
+    for (row_idx, col_idx), key in positions.items():
+        neighbours = {}
+        for direction, (d_row, d_col) in enumerate(offsets):
+            other = positions.get((row_idx + d_row, col_idx + d_col))
+            if other:
+                for char in other:
+                    neighbours[char] = direction
+        for char in key:
+            graph[char] = neighbours
+    return graph
+
+
+KEYBOARD_GRAPH = _build_keyboard_graph()
+_SHIFTED_KEYS = frozenset(key[1] for row in _QWERTY_ROWS for key in row)
+_KEYBOARD_STARTS = sum(len(row) for row in _QWERTY_ROWS)
+_KEYBOARD_AVG_DEGREE = sum(len(n) for n in KEYBOARD_GRAPH.values()) / len(KEYBOARD_GRAPH)
+
+_DATE_WITH_SEPARATOR = re.compile(r"^(\d{1,4})([\s/\\_.-])(\d{1,2})\2(\d{1,4})$")
+
+
+def load_ranked_dictionary(path):
+    """
+    Додає до словника рангів слова з файлу (одне на рядок, від найпопулярнішого).
+    Викликається один раз при старті; скидає кеш оцінок.
+    """
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            word = line.strip().lower()
+            if word and word not in RANKED_DICTIONARY:
+                RANKED_DICTIONARY[word] = len(RANKED_DICTIONARY) + 1
+    _token_match.cache_clear()
+    estimate_strength.cache_clear()
+
+
+# --- Оцінки окремих шаблонів ---
+
+def _uppercase_variations(token):
+    if token.islower() or not any(c.isalpha() for c in token):
+        return 1
+    # Велика лише перша/остання літера або все великими - типові варіанти
+    if token.isupper() or (token[0].isupper() and token[1:].islower()) or \
+            (token[-1].isupper() and token[:-1].islower()):
+        return 2
+    upper = sum(1 for c in token if c.isupper())
+    lower = sum(1 for c in token if c.islower())
+    return sum(math.comb(upper + lower, i) for i in range(1, min(upper, lower) + 1))
+
+
+def _dictionary_guesses(token):
+    lowered = token.lower()
+    best = None
+    rank = RANKED_DICTIONARY.get(lowered)
+    if rank:
+        best = rank * _uppercase_variations(token)
+
+    rank = RANKED_DICTIONARY.get(lowered[::-1])
+    if rank and len(token) > 1:
+        guesses = rank * _uppercase_variations(token) * 2
+        best = guesses if best is None else min(best, guesses)
+
+    if _LEET_CHARS.intersection(lowered):
+        substitutions = len(_LEET_CHARS.intersection(lowered))
+        for table in _UNLEET_TABLES:
+            rank = RANKED_DICTIONARY.get(lowered.translate(table))
+            if rank:
+                guesses = rank * _uppercase_variations(token) * 2 ** substitutions
+                best = guesses if best is None else min(best, guesses)
+    return best
+
+
+def _spatial_guesses(token):
+    if len(token) < 3:
+        return None
+    turns = 0
+    last_direction = None
+    for prev, char in zip(token, token[1:]):
+        direction = KEYBOARD_GRAPH.get(prev, {}).get(char)
+        if direction is None:
+            return None
+        if direction != last_direction:
+            turns += 1
+            last_direction = direction
+    shifted = sum(1 for c in token if c in _SHIFTED_KEYS)
+
+    guesses = 0
+    length = len(token)
+    for i in range(2, length + 1):
+        for j in range(1, min(turns, i - 1) + 1):
+            guesses += math.comb(i - 1, j - 1) * _KEYBOARD_STARTS * _KEYBOARD_AVG_DEGREE ** j
+    if shifted:
+        unshifted = length - shifted
+        guesses *= 2 if unshifted == 0 else sum(
+            math.comb(length, i) for i in range(1, min(shifted, unshifted) + 1))
+    return guesses
+
+
+def _sequence_guesses(token):
+    if len(token) < 3:
+        return None
+    delta = ord(token[1]) - ord(token[0])
+    if delta == 0 or abs(delta) > 5:
+        return None
+    for prev, char in zip(token[1:], token[2:]):
+        if ord(char) - ord(prev) != delta:
+            return None
+
+    first = token[0]
+    if first in "aAzZ019":
+        base = 4
+    elif first.isdigit():
+        base = 10
+    else:
+        base = 26
+    if delta < 0:
+        base *= 2
+    return base * len(token)
+
+
+def _repeat_guesses(token):
+    length = len(token)
+    for period in range(1, length // 2 + 1):
+        if length % period == 0 and token[:period] * (length // period) == token:
+            base = token[:period]
+            return estimate_strength(base).guesses * (length // period)
+    return None
+
+
+def _year_space(year):
+    return max(abs(year - REFERENCE_YEAR), MIN_YEAR_SPACE)
+
+
+def _two_digit_year(year):
+    return year + (1900 if year > 50 else 2000)
+
+
+def _valid_date(day, month, year):
+    return 1 <= month <= 12 and 1 <= day <= 31 and 1900 <= year <= 2050
+
+
+def _date_guesses(token):
+    # Окремий рік перевіряється першим: "1990" інакше читається як 19.9.0 чи 1.9.90
+    # і отримує оцінку дати (365 * роки) замість кількох десятків варіантів року
+    if token.isdigit() and len(token) == 4 and 1900 <= int(token) <= 2050:
+        return _year_space(int(token))
+
+    match = _DATE_WITH_SEPARATOR.match(token)
+    if match:
+        first, _, middle, last = match.groups()
+        has_separator = True
+        candidates = [(first, middle, last), (last, middle, first)]
+    elif token.isdigit() and 4 <= len(token) <= 8:
+        has_separator = False
+        candidates = []
+        for year_len in (4, 2):
+            rest_len = len(token) - year_len
+            if not 2 <= rest_len <= 4:
+                continue
+            # Рік на початку або в кінці, решта - день і місяць у будь-якому порядку
+            for year, rest in ((token[:year_len], token[year_len:]), (token[-year_len:], token[:-year_len])):
+                for split in range(1, len(rest)):
+                    candidates.append((rest[:split], rest[split:], year))
+                    candidates.append((rest[split:], rest[:split], year))
+    else:
+        return None
+
+    for day, month, year in candidates:
+        if len(day) > 2 or len(month) > 2 or len(year) not in (2, 4):
+            continue
+        year_value = int(year) if len(year) == 4 else _two_digit_year(int(year))
+        if _valid_date(int(day), int(month), year_value):
+            guesses = 365 * _year_space(year_value)
+            return guesses * 4 if has_separator else guesses
+    return None
+
+
+_MATCHERS = (
+    ("dictionary", _dictionary_guesses),
+    ("spatial", _spatial_guesses),
+    ("sequence", _sequence_guesses),
+    ("date", _date_guesses),
+    ("repeat", _repeat_guesses),
+)
+
+
+@lru_cache(maxsize=1 << 18)
+def _token_match(token):
+    """
+    Найдешевший шаблон, що повністю покриває фрагмент (або None).
+    Кешується: однакові фрагменти у різних паролях рахуються один раз.
+    """
+    best = None
+    for pattern, matcher in _MATCHERS:
+        guesses = matcher(token)
+        if guesses is not None and (best is None or guesses < best.guesses):
+            best = Match(pattern, token, guesses)
+    if best is None:
+        return None
+    minimum = MIN_GUESSES_SINGLE_CHAR if len(token) == 1 else MIN_GUESSES_MULTI_CHAR
+    return best._replace(guesses=max(best.guesses, minimum))
+
+
+def _bruteforce_log10(length):
+    return length * math.log10(BRUTEFORCE_CARDINALITY)
+
+
+# --- Основна функція ---
+
+def _score(guesses_log10):
+    for score, threshold in enumerate((3, 6, 8, 10)):
+        if guesses_log10 < threshold:
+            return score
+    return 4
+
+
+@lru_cache(maxsize=1 << 16)
+def estimate_strength(password):
+    """
+    Оцінює кількість спроб, потрібних для підбору пароля.
+
+    Динамічне програмування: best[j][k] - мінімальний log10 добутку оцінок
+    для префікса довжини j, розбитого на k фрагментів. Підсумок також
+    множиться на k!, бо зловмисник не знає порядку шаблонів.
+
+    Args:
+        password (str): Пароль.
+
+    Returns:
+        StrengthEstimate: Кількість спроб, її log10, оцінка 0-4 та розбиття.
+    """
+    analyzed = password[:MAX_ANALYZED_LENGTH]
+    tail_log10 = _bruteforce_log10(len(password) - len(analyzed))
+    length = len(analyzed)
+    if length == 0:
+        return StrengthEstimate(1, 0.0, 0, ())
+
+    # Оцінки всіх фрагментів analyzed[i:j]
+    candidates = [[] for _ in range(length + 1)]
+    for i in range(length):
+        for j in range(i + 1, length + 1):
+            token = analyzed[i:j]
+            match = _token_match(token)
+            if match is not None:
+                candidates[j].append((i, math.log10(match.guesses), match))
+            candidates[j].append((i, _bruteforce_log10(j - i), Match("bruteforce", token, None)))
+
+    best = [{} for _ in range(length + 1)]
+    best[0][0] = (0.0, None)
+    for j in range(1, length + 1):
+        for i, log_guesses, match in candidates[j]:
+            for count, (log_total, _) in best[i].items():
+                value = log_total + log_guesses
+                current = best[j].get(count + 1)
+                if current is None or value < current[0]:
+                    best[j][count + 1] = (value, (i, count, match))
+
+    count, (log_total, _) = min(
+        best[length].items(),
+        key=lambda item: item[1][0] + math.log10(math.factorial(item[0])))
+    guesses_log10 = log_total + math.log10(math.factorial(count)) + tail_log10
+
+    sequence = []
+    position = length
+    while position > 0:
+        _, (start, prev_count, match) = best[position][count]
+        if match.guesses is None:
+            match = match._replace(guesses=BRUTEFORCE_CARDINALITY ** len(match.token))
+        sequence.append(match)
+        position, count = start, prev_count
+    sequence.reverse()
+
+    # Для дуже довгих паролів float переповнюється - рахуємо цілим степенем
+    guesses = round(10 ** guesses_log10) if guesses_log10 < 300 else 10 ** round(guesses_log10)
+    return StrengthEstimate(guesses, guesses_log10, _score(guesses_log10), tuple(sequence))
+
+
+def crack_times(guesses):
+    """Час підбору (секунди) для типових сценаріїв атаки."""
+    return {
+        "online_throttled": guesses / (100 / 3600),
+        "online": guesses / 10,
+        "offline_slow_hash": guesses / 1e4,
+        "offline_fast_hash": guesses / 1e10,
+    }
+
+
+if __name__ == "__main__":
+    password = input("Введіть пароль: ")
+    estimate = estimate_strength(password)
+    print(f"Кількість спроб: ~10^{estimate.guesses_log10:.1f}, оцінка {estimate.score}/4")
+    for match in estimate.sequence:
+        print(f"  {match.pattern:<10} {match.token!r}: {match.guesses}")
+    for scenario, seconds in crack_times(estimate.guesses).items():
+        print(f"  {scenario:<18} {seconds:.3g} сек")
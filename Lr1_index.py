@@ -0,0 +1,413 @@
+import argparse
+import hashlib
+import heapq
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left
+
+# --- Формат файлу індексу ---
+#
+# Заголовок, далі секції з масивами uint32/uint64 (little-endian):
+#   hashes      - відсортовані 64-бітні хеші слів (точний збіг)
+#   node_first  - індекс першого переходу вузла автомата
+#   node_count  - кількість переходів вузла
+#   node_fail   - fail-посилання (Ахо-Корасік)
+#   node_out    - 1, якщо з вузла досяжне кінцеве слово (з урахуванням fail)
+#   edge_char   - код символу переходу (відсортовані в межах вузла)
+#   edge_target - вузол, у який веде перехід
+MAGIC = b"LR1BRIDX"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQQQ")  # magic, версія, min_length, слів, вузлів, переходів
+
+# Слова, коротші за це, не додаються в автомат підрядків
+# (інакше "1" чи "a" з реального дампу позначали б майже кожен пароль)
+DEFAULT_MIN_LENGTH = 4
+
+
+def word_hash(word):
+    """64-бітний хеш слова для масиву точних збігів."""
+    return int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+# --- Побудова індексу (одноразова команда) ---
+#
+# Словник може бути більшим за пам'ять, тож індекс будується зовнішнім сортуванням:
+# слова і хеші читаються порціями по run_size, кожна порція сортується і пишеться
+# у тимчасовий файл, далі порції зливаються (heapq.merge). З відсортованих слів
+# префіксне дерево виходить обходом у глибину: у пам'яті лише шлях до поточного
+# слова, а вузол записується, щойно всі слова з його префіксом пройдено.
+# Fail-посилання рахуються вже по відображеному у пам'ять файлу індексу.
+
+# Скільки слів сортувати в пам'яті за раз
+RUN_SIZE = 1 << 20
+# Скільки елементів масиву читати/писати за раз
+_IO_ITEMS = 1 << 16
+
+
+def _read_words(wordlist_path):
+    with open(wordlist_path, encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            word = line.strip().lower()
+            if word:
+                yield word
+
+
+def _read_array(path, typecode, reverse=False):
+    """Елементи масиву з файлу порціями; reverse - з кінця файлу"""
+    itemsize = array(typecode).itemsize
+    total = os.path.getsize(path) // itemsize
+    with open(path, "rb") as f:
+        starts = range(0, total, _IO_ITEMS)
+        for start in reversed(starts) if reverse else starts:
+            chunk = array(typecode)
+            f.seek(start * itemsize)
+            chunk.fromfile(f, min(_IO_ITEMS, total - start))
+            if reverse:
+                chunk.reverse()
+            yield chunk
+
+
+class _ArrayWriter:
+    """Дописує числа у файл масиву через буфер"""
+
+    def __init__(self, path, typecode):
+        self.path = path
+        self.count = 0
+        self._f = open(path, "wb")
+        self._buffer = array(typecode)
+
+    def append(self, value):
+        self._buffer.append(value)
+        if len(self._buffer) >= _IO_ITEMS:
+            self.flush()
+
+    def flush(self):
+        self.count += len(self._buffer)
+        self._buffer.tofile(self._f)
+        del self._buffer[:]
+
+    def close(self):
+        self.flush()
+        self._f.close()
+
+
+def _unique(items):
+    previous = None
+    for item in items:
+        if item != previous:
+            previous = item
+            yield item
+
+
+def _sorted_runs(wordlist_path, tmp_dir, min_length, run_size):
+    """Відсортовані порції хешів усіх слів і слів для автомата. Returns: (файли хешів, файли слів)"""
+    hash_runs, word_runs = [], []
+    words = _read_words(wordlist_path)
+    while True:
+        chunk = [word for _, word in zip(range(run_size), words)]
+        if not chunk:
+            return hash_runs, word_runs
+        hash_runs.append(os.path.join(tmp_dir, f"hashes{len(hash_runs)}"))
+        with open(hash_runs[-1], "wb") as f:
+            array("Q", sorted(map(word_hash, chunk))).tofile(f)
+        long_words = sorted(word for word in chunk if len(word) >= min_length)
+        if long_words:
+            word_runs.append(os.path.join(tmp_dir, f"words{len(word_runs)}"))
+            with open(word_runs[-1], "w", encoding="utf-8", newline="") as f:
+                f.writelines(word + "\n" for word in long_words)
+
+
+def _merged_words(word_runs):
+    files = [open(path, encoding="utf-8", newline="") for path in word_runs]
+    try:
+        yield from _unique(heapq.merge(*((line[:-1] for line in f) for f in files)))
+    finally:
+        for f in files:
+            f.close()
+
+
+def _emit_trie(words, tmp_dir):
+    """
+    Префіксне дерево з відсортованих унікальних слів у порядку після обходу (post-order).
+
+    Вузол отримує номер, коли закривається; його переходи пишуться у зворотному
+    порядку символів. Після розвороту всіх масивів корінь стає вузлом 0, а
+    переходи кожного вузла - суцільними та відсортованими, як у форматі індексу.
+
+    Returns:
+        tuple: (файл кількостей переходів, файл прапорців кінця слова, файли символів і цілей переходів).
+    """
+    counts = _ArrayWriter(os.path.join(tmp_dir, "counts"), "I")
+    ends = _ArrayWriter(os.path.join(tmp_dir, "ends"), "B")
+    edge_char = _ArrayWriter(os.path.join(tmp_dir, "edge_char"), "I")
+    edge_target = _ArrayWriter(os.path.join(tmp_dir, "edge_target"), "I")
+
+    # Шлях від кореня до поточного слова: [символ переходу, переходи (символ, номер), кінець слова]
+    path = [[None, [], 0]]
+    closed = 0
+
+    def close_node():
+        nonlocal closed
+        code, edges, end = path.pop()
+        for char, target in reversed(edges):
+            edge_char.append(char)
+            edge_target.append(target)
+        counts.append(len(edges))
+        ends.append(end)
+        if path:
+            path[-1][1].append((code, closed))
+        closed += 1
+
+    previous = ""
+    for word in words:
+        common = 0
+        for a, b in zip(previous, word):
+            if a != b:
+                break
+            common += 1
+        while len(path) > common + 1:
+            close_node()
+        for char in word[common:]:
+            path.append([ord(char), [], 0])
+        path[-1][2] = 1
+        previous = word
+    while path:
+        close_node()
+
+    for writer in (counts, ends, edge_char, edge_target):
+        writer.close()
+    return counts.path, ends.path, edge_char.path, edge_target.path
+
+
+def _write_sections(f, hash_runs, trie):
+    """Пише секції індексу; fail-посилання поки нульові. Returns: (слів, вузлів, переходів)"""
+    counts_path, ends_path, edge_char_path, edge_target_path = trie
+    n_nodes = os.path.getsize(counts_path) // 4
+    n_edges = os.path.getsize(edge_char_path) // 4
+
+    n_words = 0
+    hashes = array("Q")
+    for value in _unique(heapq.merge(*(
+            (value for chunk in _read_array(path, "Q") for value in chunk) for path in hash_runs))):
+        hashes.append(value)
+        if len(hashes) >= _IO_ITEMS:
+            n_words += len(hashes)
+            hashes.tofile(f)
+            del hashes[:]
+    n_words += len(hashes)
+    hashes.tofile(f)
+
+    # node_first - накопичена сума кількостей переходів у новому порядку вузлів
+    first = 0
+    for chunk in _read_array(counts_path, "I", reverse=True):
+        starts = array("I")
+        for count in chunk:
+            starts.append(first)
+            first += count
+        starts.tofile(f)
+    for chunk in _read_array(counts_path, "I", reverse=True):
+        chunk.tofile(f)
+    for start in range(0, n_nodes, _IO_ITEMS):
+        f.write(bytes(4 * min(_IO_ITEMS, n_nodes - start)))
+    for chunk in _read_array(edge_char_path, "I", reverse=True):
+        chunk.tofile(f)
+    last = n_nodes - 1
+    for chunk in _read_array(edge_target_path, "I", reverse=True):
+        array("I", (last - target for target in chunk)).tofile(f)
+    for chunk in _read_array(ends_path, "B", reverse=True):
+        chunk.tofile(f)
+    return n_words, n_nodes, n_edges
+
+
+def _link_failures(index_path):
+    """Fail-посилання обходом у ширину по файлу індексу; out поширюється fail-ланцюжками"""
+    with open(index_path, "r+b") as f, mmap.mmap(f.fileno(), 0) as mm:
+        sections = _map_sections(mm)[1]
+        try:
+            _link_sections(*sections[1:])
+        finally:
+            # Спершу звільняємо memoryview, інакше mmap не закриється
+            for section in sections:
+                section.release()
+        mm.flush()
+
+
+def _link_sections(node_first, node_count, fail, edge_char, edge_target, out):
+    """fail і out заповнюються на місці; вузли обходяться в ширину"""
+
+    def step(state, code):
+        while True:
+            lo = node_first[state]
+            hi = lo + node_count[state]
+            pos = bisect_left(edge_char, code, lo, hi)
+            if pos < hi and edge_char[pos] == code:
+                return edge_target[pos]
+            if state == 0:
+                return 0
+            state = fail[state]
+
+    # Черга обходу - масив номерів вузлів (4 байти на вузол), а не об'єкти
+    queue = array("I", [0])
+    head = 0
+    while head < len(queue):
+        node = queue[head]
+        head += 1
+        lo = node_first[node]
+        for pos in range(lo, lo + node_count[node]):
+            nxt = edge_target[pos]
+            target = step(fail[node], edge_char[pos]) if node else 0
+            fail[nxt] = target if target != nxt else 0
+            # Вузол "містить слово", якщо слово закінчується в ньому або в його fail-ланцюжку
+            out[nxt] |= out[fail[nxt]]
+            queue.append(nxt)
+
+
+def build_index(wordlist_path, index_path, min_length=DEFAULT_MIN_LENGTH, run_size=RUN_SIZE):
+    """
+    Будує індекс зламаних паролів зі словника (одне слово на рядок).
+
+    Args:
+        wordlist_path (str): Текстовий словник.
+        index_path (str): Куди записати індекс.
+        min_length (int): Мінімальна довжина слова для пошуку підрядків.
+        run_size (int): Скільки слів сортувати в пам'яті за раз.
+
+    Returns:
+        tuple: (кількість слів, кількість вузлів автомата).
+    """
+    if sys.byteorder != "little":
+        raise ValueError("Індекс підтримується лише на little-endian платформах")
+    # Тимчасові файли поруч з індексом: на тому ж диску, що й результат
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(index_path))) as tmp_dir:
+        hash_runs, word_runs = _sorted_runs(wordlist_path, tmp_dir, min_length, run_size)
+        trie = _emit_trie(_merged_words(word_runs), tmp_dir)
+        with open(index_path, "wb") as f:
+            f.write(bytes(HEADER.size))
+            n_words, n_nodes, n_edges = _write_sections(f, hash_runs, trie)
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, VERSION, min_length, n_words, n_nodes, n_edges))
+    _link_failures(index_path)
+    return n_words, n_nodes
+
+
+# --- Використання індексу ---
+
+def _map_sections(mm):
+    """
+    Секції індексу як memoryview поверх mmap (без копіювання).
+
+    Returns:
+        tuple: (min_length, [hashes, node_first, node_count, node_fail, edge_char, edge_target, node_out]).
+    """
+    magic, version, min_length, n_words, n_nodes, n_edges = HEADER.unpack_from(mm)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Невідомий формат індексу")
+    if sys.byteorder != "little":
+        raise ValueError("Індекс підтримується лише на little-endian платформах")
+
+    view = memoryview(mm)
+    offset = HEADER.size
+    sections = []
+    for fmt, count in (("Q", n_words), ("I", n_nodes), ("I", n_nodes), ("I", n_nodes),
+                       ("I", n_edges), ("I", n_edges), ("B", n_nodes)):
+        size = count * struct.calcsize(fmt)
+        sections.append(view[offset:offset + size].cast(fmt))
+        offset += size
+    view.release()
+    return min_length, sections
+
+
+class BreachIndex:
+    """
+    Індекс зламаних паролів, відображений у пам'ять (mmap).
+
+    Файл не читається при відкритті: сторінки підвантажує ОС, коли
+    до них звертаються, і вони спільні між процесами. Точний збіг -
+    двійковий пошук по хешах, пошук підрядків - автомат Ахо-Корасік.
+    Обидві перевірки не залежать від розміру словника (з точністю до log).
+    """
+
+    def __init__(self, index_path):
+        self._file = open(index_path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            self.min_length, sections = _map_sections(self._mm)
+        except ValueError as e:
+            raise ValueError(f"{e}: {index_path}") from None
+        (self._hashes, self._node_first, self._node_count, self._node_fail,
+         self._edge_char, self._edge_target, self._node_out) = sections
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def __contains__(self, word):
+        """Точний збіг слова (у нижньому регістрі) зі словником."""
+        value = word_hash(word)
+        pos = bisect_left(self._hashes, value)
+        return pos < len(self._hashes) and self._hashes[pos] == value
+
+    def _step(self, node, code):
+        while True:
+            first = self._node_first[node]
+            last = first + self._node_count[node]
+            pos = bisect_left(self._edge_char, code, first, last)
+            if pos < last and self._edge_char[pos] == code:
+                return self._edge_target[pos]
+            if node == 0:
+                return 0
+            node = self._node_fail[node]
+
+    def has_substring(self, text):
+        """Чи містить текст (у нижньому регістрі) хоча б одне слово зі словника."""
+        node = 0
+        for char in text:
+            node = self._step(node, ord(char))
+            if self._node_out[node]:
+                return True
+        return False
+
+    def close(self):
+        # Спершу звільняємо memoryview, інакше mmap не закриється
+        for name in ("_hashes", "_node_first", "_node_count", "_node_fail",
+                     "_edge_char", "_edge_target", "_node_out"):
+            getattr(self, name).release()
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Індекс зламаних паролів для Lr1")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_cmd = commands.add_parser("build", help="Одноразова побудова індексу зі словника")
+    build_cmd.add_argument("wordlist", help="Словник: одне слово на рядок")
+    build_cmd.add_argument("index", help="Файл індексу, який буде створено")
+    build_cmd.add_argument("--min-length", type=int, default=DEFAULT_MIN_LENGTH,
+                           help="Мінімальна довжина слова для пошуку підрядків")
+
+    check_cmd = commands.add_parser("check", help="Перевірити пароль за індексом")
+    check_cmd.add_argument("index")
+    check_cmd.add_argument("password")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        words, nodes = build_index(args.wordlist, args.index, args.min_length)
+        size = os.path.getsize(args.index)
+        print(f"[+] Індекс збережено: {args.index} (слів: {words}, вузлів: {nodes}, {size} байт)")
+    else:
+        with BreachIndex(args.index) as index:
+            password = args.password.lower()
+            print(f"Точний збіг: {'ТАК' if password in index else 'ні'}")
+            print(f"Містить слово зі словника: {'ТАК' if index.has_substring(password) else 'ні'}")
@@ -0,0 +1,223 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict, deque
+
+from Lr1 import analyze_password
+from Lr1_index import BreachIndex
+
+# Скільки останніх запитів враховувати у статистиці затримок
+LATENCY_WINDOW = 10000
+MAX_BODY_SIZE = 16 * 1024 * 1024
+
+
+# --- Кеш результатів ---
+
+class ResultCache:
+    """
+    Обмежений LRU-кеш результатів analyze_password.
+
+    Ключ - хеш BLAKE2b з випадковою сіллю процесу, тому ні паролі,
+    ні особисті дані у відкритому вигляді в пам'яті кешу не зберігаються.
+    """
+
+    def __init__(self, max_size=100000):
+        self.max_size = max_size
+        self._salt = os.urandom(16)
+        self._items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, password, name, birth_date):
+        digest = hashlib.blake2b(key=self._salt, digest_size=16)
+        for value in (password, name, birth_date):
+            data = value.encode("utf-8")
+            # Довжина перед значенням, щоб ("ab", "c") і ("a", "bc") не збігались
+            digest.update(len(data).to_bytes(4, "little"))
+            digest.update(data)
+        return digest.digest()
+
+    def get(self, key):
+        result = self._items.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key, result):
+        self._items[key] = result
+        self._items.move_to_end(key)
+        if len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def __len__(self):
+        return len(self._items)
+
+
+# --- Сервіс ---
+
+class PasswordService:
+    """Обробка запитів на аналіз паролів та збір статистики."""
+
+    def __init__(self, cache_size=100000, breach_index=None):
+        self.cache = ResultCache(cache_size)
+        self.breach_index = breach_index
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.requests = 0
+        self.items = 0
+
+    def analyze(self, item):
+        password = item.get("password", "")
+        name = item.get("name", "")
+        birth_date = item.get("birth_date", "")
+
+        key = self.cache.key(password, name, birth_date)
+        result = self.cache.get(key)
+        if result is None:
+            score, recommendations = analyze_password(password, name, birth_date, self.breach_index)
+            result = {"score": score, "recommendations": recommendations}
+            self.cache.put(key, result)
+        return result
+
+    def handle_analyze(self, payload):
+        # Приймаємо як один об'єкт, так і пакет {"items": [...]}
+        items = payload["items"] if "items" in payload else [payload]
+        results = [self.analyze(item) for item in items]
+        # Рахуємо лише пакети, які повністю пройшли перевірку (інакше відповідь - 400)
+        self.items += len(results)
+        return {"results": results}
+
+    def stats(self):
+        ordered = sorted(self.latencies)
+
+        def percentile(p):
+            if not ordered:
+                return 0.0
+            return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000
+
+        return {
+            "requests": self.requests,
+            "items": self.items,
+            "cache": {"size": len(self.cache), "hits": self.cache.hits, "misses": self.cache.misses},
+            "latency_ms": {"p50": round(percentile(50), 4), "p99": round(percentile(99), 4)},
+        }
+
+
+# --- Мінімальний HTTP/1.1 поверх asyncio ---
+
+def _response(status, body, keep_alive):
+    data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+    head = (f"HTTP/1.1 {status}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("ascii") + data
+
+
+def _content_length(headers):
+    """Довжина тіла запиту або None, якщо Content-Length не є невід'ємним цілим числом"""
+    value = headers.get("content-length", "")
+    if not value:
+        return 0
+    # int() приймає також "+5", "1_0" і нелатинські цифри - тут лише ASCII-цифри
+    if not (value.isascii() and value.isdigit()):
+        return None
+    return int(value)
+
+
+async def handle_connection(service, reader, writer):
+    """
+    Обслуговує одне з'єднання. З'єднання тримається відкритим (keep-alive),
+    щоб синхронний клієнт не платив за встановлення TCP на кожен виклик.
+    """
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                break
+
+            start = time.perf_counter()
+            lines = head.decode("latin-1").split("\r\n")
+            method, path, _ = (lines[0].split(" ") + ["", ""])[:3]
+            headers = {}
+            for line in lines[1:]:
+                if ":" in line:
+                    field, value = line.split(":", 1)
+                    headers[field.strip().lower()] = value.strip()
+            keep_alive = headers.get("connection", "").lower() != "close"
+
+            length = _content_length(headers)
+            if length is None:
+                # Межа тіла невідома, тож з'єднання далі читати не можна
+                writer.write(_response("400 Bad Request", {"error": "bad request: invalid Content-Length"}, False))
+                break
+            if length > MAX_BODY_SIZE:
+                writer.write(_response("413 Payload Too Large", {"error": "too large"}, False))
+                break
+            try:
+                body = await reader.readexactly(length) if length else b""
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+
+            if method == "POST" and path == "/analyze":
+                try:
+                    result = service.handle_analyze(json.loads(body or b"{}"))
+                    status = "200 OK"
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    result, status = {"error": f"bad request: {e}"}, "400 Bad Request"
+            elif method == "GET" and path == "/stats":
+                result, status = service.stats(), "200 OK"
+            else:
+                result, status = {"error": "not found"}, "404 Not Found"
+
+            writer.write(_response(status, result, keep_alive))
+            await writer.drain()
+
+            if path == "/analyze":
+                service.requests += 1
+                service.latencies.append(time.perf_counter() - start)
+            if not keep_alive:
+                break
+    finally:
+        writer.close()
+
+
+async def serve(host="127.0.0.1", port=8080, unix_path=None, cache_size=100000, index_path=None):
+    """Запускає сервіс на TCP-порту або Unix-сокеті."""
+    breach_index = BreachIndex(index_path) if index_path else None
+    service = PasswordService(cache_size, breach_index)
+
+    async def handler(reader, writer):
+        await handle_connection(service, reader, writer)
+
+    if unix_path:
+        server = await asyncio.start_unix_server(handler, path=unix_path)
+        where = unix_path
+    else:
+        server = await asyncio.start_server(handler, host, port)
+        where = f"http://{host}:{port}"
+
+    print(f"[*] Сервіс аналізу паролів слухає {where}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HTTP/JSON сервіс аналізу паролів (POST /analyze, GET /stats)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--unix", default=None, help="Шлях Unix-сокета замість TCP")
+    parser.add_argument("--cache-size", type=int, default=100000, help="Максимум записів у LRU-кеші")
+    parser.add_argument("--index", default=None, help="Індекс зламаних паролів (Lr1_index.py build)")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.cache_size, args.index))
+    except KeyboardInterrupt:
+        print("\n[*] Сервіс зупинено.")
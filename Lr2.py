@@ -1,13 +1,180 @@
+import os
 import string
-import matplotlib.pyplot as plt
-
-
-def generate_caesar_key(birth_date):
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
+from itertools import islice
+
+import numpy as np
+
+UKRAINIAN_UPPER = 'АБВГҐДЕЄЖЗИІЇЙКЛМНОПРСТУФХЦЧШЩЬЮЯ'
+ENGLISH_UPPER = string.ascii_uppercase
+
+# Орієнтовні частоти літер українського тексту, %
+UKRAINIAN_FREQUENCIES = {
+    'А': 7.2, 'Б': 1.7, 'В': 5.2, 'Г': 1.6, 'Ґ': 0.01, 'Д': 3.5, 'Е': 1.7, 'Є': 0.8,
+    'Ж': 0.9, 'З': 2.3, 'И': 6.1, 'І': 5.7, 'Ї': 0.6, 'Й': 1.2, 'К': 3.5, 'Л': 3.6,
+    'М': 3.1, 'Н': 6.5, 'О': 9.4, 'П': 2.9, 'Р': 4.7, 'С': 4.1, 'Т': 5.5, 'У': 4.0,
+    'Ф': 0.3, 'Х': 1.2, 'Ц': 1.0, 'Ч': 1.8, 'Ш': 0.9, 'Щ': 0.4, 'Ь': 2.9, 'Ю': 0.4,
+    'Я': 2.9,
+}
+
+# Орієнтовні частоти літер англійського тексту, %
+ENGLISH_FREQUENCIES = {
+    'A': 8.2, 'B': 1.5, 'C': 2.8, 'D': 4.3, 'E': 12.7, 'F': 2.2, 'G': 2.0, 'H': 6.1,
+    'I': 7.0, 'J': 0.15, 'K': 0.77, 'L': 4.0, 'M': 2.4, 'N': 6.7, 'O': 7.5, 'P': 1.9,
+    'Q': 0.095, 'R': 6.0, 'S': 6.3, 'T': 9.1, 'U': 2.8, 'V': 0.98, 'W': 2.4, 'X': 0.15,
+    'Y': 2.0, 'Z': 0.074,
+}
+
+
+# --- Алфавіти ---
+#
+# Літери алфавіту кодуються однобайтовим кодуванням (cp1251 містить і кирилицю,
+# і латиницю), тож текст обробляється bytes.translate з таблицями на 256
+# значень - без посимвольного циклу в Python. Символи, яких немає в кодуванні,
+# замінюються на '?', який теж поза алфавітом.
+
+_SPACE = ord(' ')
+
+
+class Alphabet:
+    """
+    Скомпільований алфавіт: літери, модуль, індекси, частоти та таблиці
+    перекодування. Таблиці зсувів будуються один раз і кешуються в об'єкті,
+    тож шифри не перебудовують їх на кожен виклик.
+
+    Готові алфавіти - UKRAINIAN, ENGLISH, UKRAINIAN_ENGLISH (див. get_alphabet).
+    """
+
+    def __init__(self, name, letters, frequencies=None, codec='cp1251'):
+        self.name = name
+        self.letters = letters
+        self.size = len(letters)
+        self.codec = codec
+        self.letter_bytes = letters.encode(codec)
+        if len(self.letter_bytes) != self.size or len(set(self.letter_bytes)) != self.size:
+            raise ValueError(f"Літери алфавіту {name} мають бути різними однобайтовими символами {codec}")
+        if _SPACE in self.letter_bytes:
+            raise ValueError("Пробіл не може бути літерою алфавіту")
+
+        if frequencies is None:
+            frequencies = dict.fromkeys(letters, 100 / self.size)
+        missing = set(letters) - set(frequencies)
+        if missing:
+            raise ValueError(f"Немає частот для літер: {''.join(sorted(missing))}")
+        self.frequencies = {letter: frequencies[letter] for letter in letters}
+        total = sum(self.frequencies.values())
+        # Очікувана частка кожної літери в порядку алфавіту (для хі-квадрат)
+        self.expected_shares = tuple(self.frequencies[letter] / total for letter in letters)
+
+        self.index = {letter: idx for idx, letter in enumerate(letters)}
+        self.letter_set = frozenset(self.letter_bytes)
+        # Байти, які видаляються при підготовці тексту та в шифрі Цезаря
+        self.non_alphabet = bytes(b for b in range(256) if b not in self.letter_set and b != _SPACE)
+        # Все, що не літера, стає пробілом - для підрахунку n-грам у межах слова
+        self.ngram_table = bytes(b if b in self.letter_set else _SPACE for b in range(256))
+
+        self._caesar_tables = {}
+        self._vigenere_tables = lru_cache(maxsize=256)(self._build_vigenere_tables)
+
+    def __repr__(self):
+        return f"Alphabet({self.name!r}, {self.size} літер)"
+
+    def _key(self):
+        return self.name, self.letters, self.codec, self.expected_shares
+
+    def __eq__(self, other):
+        # За значенням: незареєстрований алфавіт після пулу процесів - новий, але рівний об'єкт
+        if not isinstance(other, Alphabet):
+            return NotImplemented
+        return self is other or self._key() == other._key()
+
+    def __hash__(self):
+        return hash((self.name, self.letters, self.codec))
+
+    def __reduce__(self):
+        # Зареєстрований алфавіт у дочірньому процесі береться з реєстру, а не будується знову
+        if ALPHABETS.get(self.name) is self:
+            return get_alphabet, (self.name,)
+        return Alphabet, (self.name, self.letters, self.frequencies, self.codec)
+
+    def encode(self, text):
+        return text.encode(self.codec, errors='replace')
+
+    def decode(self, data):
+        return data.decode(self.codec)
+
+    def find(self, char):
+        """Індекс літери або -1, як str.find у початковій реалізації"""
+        return self.index.get(char, -1)
+
+    def shift_table(self, shift, default=None):
+        """
+        Таблиця для bytes.translate: літера -> літера, зсунута на shift.
+        Інші байти лишаються як є або замінюються на default.
+        """
+        table = bytearray(range(256)) if default is None else bytearray([default] * 256)
+        for idx, byte in enumerate(self.letter_bytes):
+            table[byte] = self.letter_bytes[(idx + shift) % self.size]
+        table[_SPACE] = _SPACE
+        return bytes(table)
+
+    def caesar_table(self, shift):
+        """Таблиця зсуву для Цезаря (невідомі символи видаляються окремо)"""
+        shift %= self.size
+        table = self._caesar_tables.get(shift)
+        if table is None:
+            table = self._caesar_tables[shift] = self.shift_table(shift)
+        return table
+
+    def vigenere_tables(self, key, encrypt):
+        """
+        Таблиці зсуву для кожної позиції ключа.
+        Повертаються лише для префікса ключа до першого символу поза алфавітом.
+        Невідомий символ тексту шифрується як індекс -1 (так працював find()).
+        """
+        return self._vigenere_tables(key, encrypt)
+
+    def _build_vigenere_tables(self, key, encrypt):
+        tables = []
+        for key_char in key:
+            key_char_idx = self.find(key_char)
+            if key_char_idx == -1:
+                break
+            shift = key_char_idx if encrypt else -key_char_idx
+            tables.append(self.shift_table(shift, default=self.letter_bytes[(shift - 1) % self.size]))
+        return tuple(tables)
+
+
+def _mixed_frequencies(*parts):
+    """Частоти об'єднаного алфавіту: кожна мова має однакову вагу"""
+    return {letter: freq / len(parts) for part in parts for letter, freq in part.items()}
+
+
+UKRAINIAN = Alphabet('uk', UKRAINIAN_UPPER, UKRAINIAN_FREQUENCIES)
+ENGLISH = Alphabet('en', ENGLISH_UPPER, ENGLISH_FREQUENCIES)
+UKRAINIAN_ENGLISH = Alphabet('uk+en', UKRAINIAN_UPPER + ENGLISH_UPPER,
+                             _mixed_frequencies(UKRAINIAN_FREQUENCIES, ENGLISH_FREQUENCIES))
+
+ALPHABETS = {alphabet.name: alphabet for alphabet in (UKRAINIAN, ENGLISH, UKRAINIAN_ENGLISH)}
+
+
+def get_alphabet(name):
+    """Алфавіт за назвою ('uk', 'en', 'uk+en'); об'єкт Alphabet повертається як є"""
+    if isinstance(name, Alphabet):
+        return name
+    try:
+        return ALPHABETS[name]
+    except KeyError:
+        raise ValueError(f"Невідомий алфавіт: {name} (доступні: {', '.join(ALPHABETS)})") from None
+
+
+def generate_caesar_key(birth_date, alphabet=UKRAINIAN):
     """Генерація ключа для шифру Цезаря на основі дати народження"""
     # Сума цифр дати (наприклад, 12.05.2004 -> 1+2+0+5+2+0+0+4 = 14)
     date_str = birth_date.replace('.', '')
     key = sum(int(digit) for digit in date_str if digit.isdigit())
-    return key % 33  # Для українського алфавіту
+    return key % alphabet.size  # 33 для українського алфавіту
 
 
 def generate_vigenere_key(surname):
@@ -15,114 +182,331 @@ def generate_vigenere_key(surname):
     return surname.upper()
 
 
-def prepare_ukrainian_text(text):
-    """Підготовка тексту: приводимо до верхнього регістра, залишаємо лише українські літери"""
-    ukrainian_upper = 'АБВГҐДЕЄЖЗИІЇЙКЛМНОПРСТУФХЦЧШЩЬЮЯ'
-    text = text.upper()
-    # Видаляємо всі символи, крім українських літер та пробілів
-    cleaned_text = ''
-    for char in text:
-        if char in ukrainian_upper or char == ' ':
-            cleaned_text += char
-    return cleaned_text
+def prepare_ukrainian_text(text, alphabet=UKRAINIAN):
+    """Підготовка тексту: приводимо до верхнього регістра, залишаємо лише літери алфавіту"""
+    # Видаляємо всі символи, крім літер алфавіту та пробілів
+    return alphabet.decode(alphabet.encode(text.upper()).translate(None, alphabet.non_alphabet))
 
 
-def caesar_cipher(text, key, mode='encrypt'):
+def caesar_cipher(text, key, mode='encrypt', alphabet=UKRAINIAN):
     """Шифр Цезаря"""
-    ukrainian_upper = 'АБВГҐДЕЄЖЗИІЇЙКЛМНОПРСТУФХЦЧШЩЬЮЯ'
-    result = ''
-
-    for char in text:
-        if char == ' ':
-            result += ' '
-            continue
-
-        idx = ukrainian_upper.find(char)
-        if idx == -1:
-            continue
-
-        if mode == 'encrypt':
-            new_idx = (idx + key) % 33
-        else:  # decrypt
-            new_idx = (idx - key) % 33
-
-        result += ukrainian_upper[new_idx]
-
-    return result
-
-
-def vigenere_cipher(text, key, mode='encrypt'):
-    """Шифр Віженера"""
-    ukrainian_upper = 'АБВГҐДЕЄЖЗИІЇЙКЛМНОПРСТУФХЦЧШЩЬЮЯ'
-    result = ''
+    shift = key if mode == 'encrypt' else -key
+    return alphabet.decode(alphabet.encode(text).translate(alphabet.caesar_table(shift), alphabet.non_alphabet))
+
+
+def _restore_spaces(data, letters):
+    """Повертає пробіли на їхні місця в data, заповнюючи решту позицій з letters"""
+    if _SPACE not in data:
+        return letters
+    pieces = []
+    pos = 0
+    for word in data.split(b' '):
+        pieces.append(letters[pos:pos + len(word)])
+        pos += len(word)
+    return b' '.join(pieces)
+
+
+def vigenere_cipher_chunk(text, key, mode='encrypt', key_offset=0, alphabet=UKRAINIAN):
+    """
+    Шифр Віженера для фрагмента тексту, що починається з позиції ключа key_offset.
+    Повертає (результат, позиція ключа для наступного фрагмента), тож
+    довгий текст можна обробляти частинами з тим самим результатом.
+    """
     key = key.upper()
     key_len = len(key)
-    key_idx = 0
-
-    for char in text:
-        if char == ' ':
-            result += ' '
-            continue
+    data = alphabet.encode(text)
+    letters = data.replace(b' ', b'')
+    if not letters:
+        return text, key_offset
+    if not key_len:
+        raise ValueError("Ключ Віженера не може бути порожнім")
 
-        if key[key_idx % key_len] not in ukrainian_upper:
-            continue
+    tables = alphabet.vigenere_tables(key, mode == 'encrypt')
+    if len(tables) < key_len:
+        # Символ ключа поза алфавітом зупиняє шифрування: далі лишаються тільки пробіли
+        letters = letters[:max(0, len(tables) - key_offset)]
 
-        key_char_idx = ukrainian_upper.find(key[key_idx % key_len])
-        text_char_idx = ukrainian_upper.find(char)
+    # Кожна позиція ключа - окремий стовпець зі своєю таблицею зсуву
+    result = bytearray(len(letters))
+    for column in range(min(key_len, len(letters))):
+        table = tables[(key_offset + column) % key_len]
+        result[column::key_len] = letters[column::key_len].translate(table)
 
-        if mode == 'encrypt':
-            new_idx = (text_char_idx + key_char_idx) % 33
-        else:  # decrypt
-            new_idx = (text_char_idx - key_char_idx) % 33
+    return alphabet.decode(_restore_spaces(data, bytes(result))), key_offset + len(letters)
 
-        result += ukrainian_upper[new_idx]
-        key_idx += 1
 
-    return result
+def vigenere_cipher(text, key, mode='encrypt', alphabet=UKRAINIAN):
+    """Шифр Віженера"""
+    return vigenere_cipher_chunk(text, key, mode, alphabet=alphabet)[0]
 
 
-def brute_force_caesar(ciphertext):
+def brute_force_caesar(ciphertext, alphabet=UKRAINIAN):
     """Метод brute force для шифру Цезаря"""
-    ukrainian_upper = 'АБВГҐДЕЄЖЗИІЇЙКЛМНОПРСТУФХЦЧШЩЬЮЯ'
-    results = []
-
-    for key in range(33):
-        decrypted = ''
-        for char in ciphertext:
-            if char == ' ':
-                decrypted += ' '
-                continue
-
-            idx = ukrainian_upper.find(char)
-            if idx == -1:
-                continue
-
-            new_idx = (idx - key) % 33
-            decrypted += ukrainian_upper[new_idx]
-
-        results.append((key, decrypted))
-
-    return results
-
-
-def frequency_analysis(text):
+    data = alphabet.encode(ciphertext)
+    return [(key, alphabet.decode(data.translate(alphabet.caesar_table(-key), alphabet.non_alphabet)))
+            for key in range(alphabet.size)]
+
+
+@lru_cache(maxsize=None)
+def _ngram_codes(alphabet):
+    """
+    Таблиці NumPy для гістограм (будуються один раз на алфавіт):
+    байт -> компактний індекс (літери 0..size-1, усе інше - size, тобто пробіл),
+    індекс -> байт (для назв n-грам) і байти літер як масив.
+    """
+    letter_bytes = np.frombuffer(alphabet.letter_bytes, dtype=np.uint8)
+    index = np.full(256, alphabet.size, dtype=np.intp)
+    index[letter_bytes] = np.arange(alphabet.size)
+    return index, alphabet.letter_bytes + bytes([_SPACE]), letter_bytes
+
+
+class LetterHistogram:
+    """
+    Гістограма літер (та, за бажанням, біграм і триграм), яку можна
+    будувати частинами і зливати.
+
+    Байти алфавіту рахуються np.bincount на 256 кошиків. Для n-грам байти
+    переводяться в компактні індекси алфавіту (size - пробіл), і біграма
+    a*(size+1)+b чи триграма (a*(size+1)+b)*(size+1)+c теж рахується bincount;
+    усе, що не літера, стає пробілом, тож n-грами не перетинають межі слів.
+    Гістограми окремих фрагментів/файлів (наприклад, з різних процесів)
+    об'єднуються через merge або оператор +.
+    """
+
+    def __init__(self, ngrams=True, alphabet=UKRAINIAN):
+        self.ngrams = ngrams
+        self.alphabet = alphabet
+        self.byte_counts = np.zeros(256, dtype=np.int64)
+        base = alphabet.size + 1
+        self.bigrams = np.zeros(base ** 2, dtype=np.int64) if ngrams else None
+        self.trigrams = np.zeros(base ** 3, dtype=np.int64) if ngrams else None
+        # Літери в порядку першої появи (для percentages)
+        self._order = []
+        # Індекси останніх символів попереднього фрагмента, щоб n-грами не рвались на межі
+        self._tail = np.zeros(0, dtype=np.intp)
+
+    @classmethod
+    def from_text(cls, text, ngrams=True, alphabet=UKRAINIAN):
+        histogram = cls(ngrams, alphabet)
+        histogram.update(text)
+        return histogram
+
+    @classmethod
+    def from_bytes(cls, data, ngrams=False, alphabet=UKRAINIAN):
+        """Гістограма з уже закодованих байтів алфавіту (bytes або memoryview, зокрема зі кроком)"""
+        histogram = cls(ngrams, alphabet)
+        histogram._update_bytes(data)
+        return histogram
+
+    def update(self, text):
+        """Додає наступний фрагмент тексту"""
+        self._update_bytes(self.alphabet.encode(text))
+        return self
+
+    def _update_bytes(self, data):
+        codes = np.asarray(memoryview(data))
+        counts = np.bincount(codes, minlength=256)
+        self._note_new_letters(counts, codes)
+        self.byte_counts += counts
+        if not self.ngrams:
+            return
+        index, _, _ = _ngram_codes(self.alphabet)
+        base = self.alphabet.size + 1
+        joined = np.concatenate((self._tail, index[codes]))
+        # n-грами, що повністю лежать у хвості, вже пораховані на попередньому фрагменті
+        bigrams = joined[max(len(self._tail) - 1, 0):]
+        trigrams = joined[max(len(self._tail) - 2, 0):]
+        self.bigrams += np.bincount(bigrams[:-1] * base + bigrams[1:], minlength=base ** 2)
+        self.trigrams += np.bincount((trigrams[:-2] * base + trigrams[1:-1]) * base + trigrams[2:],
+                                     minlength=base ** 3)
+        self._tail = joined[-2:]
+
+    def _note_new_letters(self, counts, codes):
+        """Дописує в _order літери, яких ще не було, у порядку їх першої появи в codes"""
+        _, _, letter_bytes = _ngram_codes(self.alphabet)
+        new = letter_bytes[(counts[letter_bytes] > 0) & (self.byte_counts[letter_bytes] == 0)]
+        if len(new):
+            # Нові літери з'являються лише в перших фрагментах, тож пошук першої позиції рідкісний
+            self._order.extend(sorted(new.tolist(), key=lambda byte: int(np.argmax(codes == byte))))
+
+    def merge(self, other):
+        """Додає лічильники іншої гістограми (n-грами на межі фрагментів не відновлюються)"""
+        if other.alphabet != self.alphabet:
+            raise ValueError(f"Різні алфавіти гістограм: {self.alphabet.name} і {other.alphabet.name}")
+        self._order.extend(byte for byte in other._order if not self.byte_counts[byte])
+        self.byte_counts += other.byte_counts
+        if other.bigrams is not None:
+            if self.bigrams is None:
+                self.bigrams, self.trigrams = other.bigrams.copy(), other.trigrams.copy()
+            else:
+                self.bigrams += other.bigrams
+                self.trigrams += other.trigrams
+        self._tail = self._tail[:0]
+        return self
+
+    def __add__(self, other):
+        result = LetterHistogram(self.ngrams and other.ngrams, self.alphabet)
+        return result.merge(self).merge(other)
+
+    @property
+    def total(self):
+        return sum(self.counts())
+
+    def counts(self):
+        """Список лічильників у порядку алфавіту"""
+        _, _, letter_bytes = _ngram_codes(self.alphabet)
+        return self.byte_counts[letter_bytes].tolist()
+
+    def percentages(self):
+        """Частка кожної літери, % (літери в порядку першої появи, як у frequency_analysis)"""
+        total = self.total
+        return {self.alphabet.decode(bytes([byte])): int(self.byte_counts[byte]) / total * 100
+                for byte in self._order}
+
+    def index_of_coincidence(self):
+        """IoC = sum(n_i * (n_i - 1)) / (N * (N - 1)); для української ~0.055, для випадкового тексту ~0.030"""
+        total = self.total
+        if total < 2:
+            return 0.0
+        return sum(n * (n - 1) for n in self.counts()) / (total * (total - 1))
+
+    def _named(self, counts, length, top_k):
+        if counts is None:
+            return {}
+        _, symbols, _ = _ngram_codes(self.alphabet)
+        base = self.alphabet.size + 1
+        items = []
+        for code in np.flatnonzero(counts).tolist():
+            gram = []
+            rest = code
+            for _ in range(length):
+                rest, digit = divmod(rest, base)
+                gram.append(symbols[digit])
+            if _SPACE not in gram:
+                items.append((self.alphabet.decode(bytes(reversed(gram))), int(counts[code])))
+        return dict(sorted(items, key=lambda item: item[1], reverse=True)[:top_k])
+
+    def top_bigrams(self, top_k=None):
+        return self._named(self.bigrams, 2, top_k)
+
+    def top_trigrams(self, top_k=None):
+        return self._named(self.trigrams, 3, top_k)
+
+
+def letter_counts(text, alphabet=UKRAINIAN):
+    """Гістограма літер за один прохід: список лічильників у порядку алфавіту"""
+    return LetterHistogram.from_text(text, False, alphabet).counts()
+
+
+# Для корпусів текст приводиться до верхнього регістру, щоб рахувались і малі літери
+
+def _file_histogram(path, chunk_size, ngrams, alphabet):
+    histogram = LetterHistogram(ngrams, alphabet)
+    with open(path, encoding='utf-8', newline='') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            histogram.update(chunk.upper())
+    return histogram
+
+
+def _text_histogram(text, ngrams, alphabet):
+    return LetterHistogram.from_text(text.upper(), ngrams, alphabet)
+
+
+def _merge_in_pool(total, workers, function, items, *args):
+    """
+    Рахує function(item, *args) для кожного елемента в пулі процесів і зливає
+    результати в total. У роботі не більше двох задач на процес: наступний
+    елемент читається лише після завершення попередньої задачі, тож потік
+    фрагментів будь-якої довжини не накопичується в пам'яті.
+    """
+    items = iter(items)
+    window = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(workers) as pool:
+        in_flight = {pool.submit(function, item, *args) for item in islice(items, window)}
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                total.merge(future.result())
+            in_flight.update(pool.submit(function, item, *args) for item in islice(items, len(done)))
+    return total
+
+
+def histogram_from_files(paths, workers=None, ngrams=False, chunk_size=1 << 20, alphabet=UKRAINIAN):
+    """
+    Будує гістограму корпусу: кожен файл рахується в окремому процесі
+    (читання фрагментами), результати зливаються. Біграми й триграми
+    рахуються лише з ngrams=True.
+    """
+    return _merge_in_pool(LetterHistogram(ngrams, alphabet), workers, _file_histogram, paths,
+                          chunk_size, ngrams, alphabet)
+
+
+def histogram_from_chunks(chunks, workers=None, ngrams=False, alphabet=UKRAINIAN):
+    """Те саме для довільного потоку фрагментів тексту (наприклад, частин одного великого файлу)"""
+    return _merge_in_pool(LetterHistogram(ngrams, alphabet), workers, _text_histogram, chunks, ngrams, alphabet)
+
+
+def rank_shifts(counts, alphabet=UKRAINIAN):
+    """
+    Ранжує всі зсуви алфавіту для гістограми літер (список лічильників у порядку алфавіту).
+
+    Гістограма "повертається" на кожен зсув і порівнюється з частотами
+    мови алфавіту за критерієм хі-квадрат (менше - правдоподібніше).
+
+    Returns:
+        list: [(зсув, хі-квадрат), ...] від найімовірнішого.
+        Якщо літер немає, жоден зсув не кращий за інший: зсуви по порядку з оцінкою 0.
+    """
+    total = sum(counts)
+    size = alphabet.size
+    if total == 0:
+        return [(shift, 0.0) for shift in range(size)]
+    expected_share = alphabet.expected_shares
+
+    scores = []
+    for shift in range(size):
+        chi_squared = 0.0
+        for idx, observed in enumerate(counts):
+            # Літера шифротексту idx походить від літери відкритого тексту idx - shift
+            expected = total * expected_share[(idx - shift) % size]
+            chi_squared += (observed - expected) ** 2 / expected
+        scores.append((shift, chi_squared))
+
+    scores.sort(key=lambda item: item[1])
+    return scores
+
+
+def rank_caesar_keys(ciphertext, top_k=None, alphabet=UKRAINIAN):
+    """
+    Ранжує всі ключі Цезаря без розшифрування тексту:
+    гістограма шифротексту будується один раз і оцінюється rank_shifts.
+
+    Returns:
+        list: [(ключ, хі-квадрат), ...] від найімовірнішого.
+    """
+    scores = rank_shifts(letter_counts(ciphertext, alphabet), alphabet)
+    return scores[:top_k] if top_k else scores
+
+
+def brute_force_caesar_ranked(ciphertext, top_k=5, alphabet=UKRAINIAN):
+    """
+    Ранжований brute force: розшифровуються лише top_k найкращих ключів
+    і лише тоді, коли до них доходить ітерація.
+
+    Yields:
+        tuple: (ключ, хі-квадрат, розшифрований текст).
+    """
+    data = alphabet.encode(ciphertext)
+    for key, chi_squared in rank_caesar_keys(ciphertext, top_k, alphabet):
+        yield key, chi_squared, alphabet.decode(data.translate(alphabet.caesar_table(-key), alphabet.non_alphabet))
+
+
+def frequency_analysis(text, alphabet=UKRAINIAN):
     """Частотний аналіз тексту"""
-    ukrainian_upper = 'АБВГҐДЕЄЖЗИІЇЙКЛМНОПРСТУФХЦЧШЩЬЮЯ'
-    freq = {}
-    total_letters = 0
-
-    # Підрахунок кількості кожної літери
-    for char in text:
-        if char in ukrainian_upper:
-            freq[char] = freq.get(char, 0) + 1
-            total_letters += 1
-
-    # Обчислення відсотків
-    percentages = {}
-    for letter, count in freq.items():
-        percentages[letter] = (count / total_letters * 100) if total_letters > 0 else 0
-
-    return percentages
+    return LetterHistogram.from_text(text, False, alphabet).percentages()
 
 
 def compare_algorithms(original, caesar_enc, vigenere_enc):
@@ -163,38 +547,23 @@ def compare_algorithms(original, caesar_enc, vigenere_enc):
     print("4. Для підвищення стійкості важливо використовувати довгі та складні ключі")
 
 
-def visualize_frequencies(original, caesar_enc, vigenere_enc):
-    """Візуалізація частотного аналізу"""
-    # Аналіз частот для кожного тексту
-    orig_freq = frequency_analysis(original)
-    caesar_freq = frequency_analysis(caesar_enc)
-    vigenere_freq = frequency_analysis(vigenere_enc)
-
-    # Підготовка даних для графіка
-    letters = sorted(set(list(orig_freq.keys()) + list(caesar_freq.keys()) + list(vigenere_freq.keys())))
-
-    orig_values = [orig_freq.get(letter, 0) for letter in letters]
-    caesar_values = [caesar_freq.get(letter, 0) for letter in letters]
-    vigenere_values = [vigenere_freq.get(letter, 0) for letter in letters]
+def visualize_frequencies(original, caesar_enc, vigenere_enc, output_path=None, alphabet=UKRAINIAN):
+    """
+    Візуалізація частотного аналізу.
+    Якщо задано output_path - графік зберігається у файл (PNG/SVG) без вікна.
+    matplotlib імпортується лише тут, тож шифрування його не завантажує.
+    """
+    from Lr2_report import draw_frequency_chart, save_frequency_chart
 
-    # Створення графіка
-    plt.figure(figsize=(15, 6))
+    if output_path:
+        save_frequency_chart(output_path, original, caesar_enc, vigenere_enc, alphabet=alphabet)
+        return
 
-    x = range(len(letters))
-    width = 0.25
+    import matplotlib.pyplot as plt
 
-    plt.bar([i - width for i in x], orig_values, width, label='Оригінальний текст', alpha=0.7)
-    plt.bar(x, caesar_values, width, label='Цезарь (зашифрований)', alpha=0.7)
-    plt.bar([i + width for i in x], vigenere_values, width, label='Віженер (зашифрований)', alpha=0.7)
-
-    plt.xlabel('Літери')
-    plt.ylabel('Частота, %')
-    plt.title('Частотний аналіз текстів')
-    plt.xticks(x, letters)
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-
-    plt.tight_layout()
+    fig, ax = plt.subplots(figsize=(15, 6))
+    draw_frequency_chart(ax, original, caesar_enc, vigenere_enc, alphabet=alphabet)
+    fig.tight_layout()
     plt.show()
 
 
@@ -264,6 +633,10 @@ def main():
         key, text = brute_results[i]
         print(f"Ключ {key}: {text}")
 
+    print("\nНайімовірніші ключі (частотний аналіз, хі-квадрат):")
+    for key, chi_squared, text in brute_force_caesar_ranked(caesar_encrypted, top_k=3):
+        print(f"Ключ {key} (χ² = {chi_squared:.1f}): {text}")
+
     # Порівняльний аналіз
     compare_algorithms(prepared_text, caesar_encrypted, vigenere_encrypted)
 
@@ -0,0 +1,198 @@
+import argparse
+import random
+import subprocess
+import sys
+import time
+from functools import partial
+
+import Lr2
+import Lr2_crack
+
+try:
+    import Lr2_vector
+except ImportError:  # NumPy не встановлено - векторизований режим пропускається
+    Lr2_vector = None
+
+# Початкові (посимвольні) реалізації з Lr2 - еталон для перевірки та порівняння швидкості.
+# Рядок літер можна замінити, щоб перевіряти інші алфавіти; модуль - його довжина.
+
+
+def reference_caesar_cipher(text, key, mode='encrypt', ukrainian_upper='АБВГҐДЕЄЖЗИІЇЙКЛМНОПРСТУФХЦЧШЩЬЮЯ'):
+    modulus = len(ukrainian_upper)
+    result = ''
+    for char in text:
+        if char == ' ':
+            result += ' '
+            continue
+        idx = ukrainian_upper.find(char)
+        if idx == -1:
+            continue
+        if mode == 'encrypt':
+            new_idx = (idx + key) % modulus
+        else:
+            new_idx = (idx - key) % modulus
+        result += ukrainian_upper[new_idx]
+    return result
+
+
+def reference_vigenere_cipher(text, key, mode='encrypt', ukrainian_upper='АБВГҐДЕЄЖЗИІЇЙКЛМНОПРСТУФХЦЧШЩЬЮЯ'):
+    modulus = len(ukrainian_upper)
+    result = ''
+    key = key.upper()
+    key_len = len(key)
+    key_idx = 0
+    for char in text:
+        if char == ' ':
+            result += ' '
+            continue
+        if key[key_idx % key_len] not in ukrainian_upper:
+            continue
+        key_char_idx = ukrainian_upper.find(key[key_idx % key_len])
+        text_char_idx = ukrainian_upper.find(char)
+        if mode == 'encrypt':
+            new_idx = (text_char_idx + key_char_idx) % modulus
+        else:
+            new_idx = (text_char_idx - key_char_idx) % modulus
+        result += ukrainian_upper[new_idx]
+        key_idx += 1
+    return result
+
+
+def make_text(size_chars, seed=0, alphabet=Lr2.UKRAINIAN):
+    """Випадковий текст з літер алфавіту зі словами середньої довжини ~6 літер"""
+    rng = random.Random(seed)
+    letters = alphabet.letters
+    words = []
+    total = 0
+    while total < size_chars:
+        word = ''.join(rng.choice(letters) for _ in range(rng.randint(2, 10)))
+        words.append(word)
+        total += len(word) + 1
+    return ' '.join(words)[:size_chars]
+
+
+def make_natural_text(size_chars, seed=0, alphabet=Lr2.UKRAINIAN):
+    """Текст, літери якого мають частоти мови алфавіту (для перевірки криптоаналізу)"""
+    rng = random.Random(seed)
+    letters = list(alphabet.frequencies)
+    weights = list(alphabet.frequencies.values())
+    chars = []
+    while len(chars) < size_chars:
+        chars.extend(rng.choices(letters, weights, k=rng.randint(2, 10)))
+        chars.append(' ')
+    return ''.join(chars[:size_chars])
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def bench_ciphers(size_mb=2.0, key_caesar=14, key_vigenere="ПЕТРЕНКО", with_reference=True, alphabet=Lr2.UKRAINIAN):
+    """
+    Порівнює табличні шифри Lr2 з посимвольними еталонами на тексті size_mb МБ.
+    Перевіряє, що результати ідентичні.
+    """
+    # Кириличний символ займає 2 байти в UTF-8
+    text = make_text(int(size_mb * 1024 * 1024 / 2), alphabet=alphabet)
+    print(f"[*] Текст: {len(text)} символів (~{size_mb} МБ UTF-8), алфавіт {alphabet.name}")
+    caesar = partial(Lr2.caesar_cipher, alphabet=alphabet)
+    vigenere = partial(Lr2.vigenere_cipher, alphabet=alphabet)
+    reference_caesar = partial(reference_caesar_cipher, ukrainian_upper=alphabet.letters)
+    reference_vigenere = partial(reference_vigenere_cipher, ukrainian_upper=alphabet.letters)
+    print(f"{'Операція':<28} {'Таблиці (с)':>12} {'Еталон (с)':>12} {'Прискорення':>12}")
+    print("-" * 68)
+
+    cases = [
+        ("Цезар (шифрування)", caesar, reference_caesar, (text, key_caesar, 'encrypt')),
+        ("Віженер (шифрування)", vigenere, reference_vigenere, (text, key_vigenere, 'encrypt')),
+        ("Віженер (розшифрування)", vigenere, reference_vigenere, (text, key_vigenere, 'decrypt')),
+    ]
+    for title, fast, reference, args in cases:
+        fast_result, fast_time = _timed(fast, *args)
+        if with_reference:
+            ref_result, ref_time = _timed(reference, *args)
+            assert fast_result == ref_result, f"Результати відрізняються: {title}"
+            print(f"{title:<28} {fast_time:>12.4f} {ref_time:>12.4f} {ref_time / fast_time:>11.1f}x")
+        else:
+            print(f"{title:<28} {fast_time:>12.4f} {'-':>12} {'-':>12}")
+
+    if Lr2_vector is None:
+        print("[!] NumPy не встановлено, векторизований режим не перевірявся")
+        return
+
+    print(f"\n{'Операція (NumPy)':<28} {'NumPy (с)':>12} {'Таблиці (с)':>12} {'Відношення':>12}")
+    print("-" * 68)
+    caesar_np = partial(Lr2_vector.caesar_cipher_np, alphabet=alphabet)
+    vigenere_np = partial(Lr2_vector.vigenere_cipher_np, alphabet=alphabet)
+    vector_cases = [
+        ("Цезар (шифрування)", caesar_np, caesar, (text, key_caesar, 'encrypt')),
+        ("Віженер (шифрування)", vigenere_np, vigenere, (text, key_vigenere, 'encrypt')),
+        ("Віженер (розшифрування)", vigenere_np, vigenere, (text, key_vigenere, 'decrypt')),
+    ]
+    for title, vector, tables, args in vector_cases:
+        vector_result, vector_time = _timed(vector, *args)
+        table_result, table_time = _timed(tables, *args)
+        assert vector_result == table_result, f"Результати відрізняються: {title}"
+        print(f"{title:<28} {vector_time:>12.4f} {table_time:>12.4f} {table_time / vector_time:>11.1f}x")
+
+
+def bench_vigenere_crack(sizes=(1000, 5000, 20000, 100000),
+                         keys=("КЛЮЧ", "ПЕТРЕНКО", "ЗАХИСТІНФОРМАЦІЇ"), workers=None, alphabet=Lr2.UKRAINIAN):
+    """Час і успішність автоматичного зламу Віженера для різних довжин шифротексту та ключа"""
+    print(f"\n{'Символів':>10} {'Ключ':<20} {'Знайдено':<20} {'Час (с)':>8}")
+    print("-" * 62)
+    for size in sizes:
+        for seed, key in enumerate(keys):
+            ciphertext = Lr2.vigenere_cipher(make_natural_text(size, seed, alphabet), key, alphabet=alphabet)
+            (found, _), elapsed = _timed(Lr2_crack.crack_vigenere, ciphertext,
+                                         Lr2_crack.DEFAULT_MAX_KEY_LENGTH, workers, alphabet)
+            status = found if found == key else f"{found} (!)"
+            print(f"{size:>10} {key:<20} {status:<20} {elapsed:>8.3f}")
+
+
+def bench_startup(runs=5):
+    """
+    Час запуску інтерпретатора з імпортом Lr2 у чистому процесі
+    та перевірка, що matplotlib при цьому не завантажується.
+    """
+    probes = {
+        "import Lr2": "import sys, Lr2; print('matplotlib' in sys.modules)",
+        "import Lr2 + pyplot": "import sys, Lr2, matplotlib.pyplot; print('matplotlib' in sys.modules)",
+    }
+    print(f"\n{'Запуск':<24} {'Мін. час (с)':>13} {'matplotlib':>11}")
+    print("-" * 50)
+    for title, code in probes.items():
+        best = None
+        for _ in range(runs):
+            start = time.perf_counter()
+            output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        loaded = "так" if output.stdout.strip() == "True" else "ні"
+        print(f"{title:<24} {best:>13.3f} {loaded:>11}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарки шифрів Lr2")
+    parser.add_argument("--size-mb", type=float, default=2.0, help="Розмір тексту в МБ")
+    parser.add_argument("--no-reference", action="store_true", help="Не запускати повільні еталони")
+    parser.add_argument("--crack", action="store_true", help="Також виміряти злам Віженера")
+    parser.add_argument("--workers", type=int, default=None, help="Процеси для зламу (0 - без пулу)")
+    parser.add_argument("--startup", action="store_true", help="Також виміряти час імпорту Lr2")
+    parser.add_argument("--alphabet", default="uk", choices=list(Lr2.ALPHABETS))
+    args = parser.parse_args()
+
+    # Ключі за замовчуванням - українські; для англійського алфавіту беруться латинські
+    alphabet = Lr2.get_alphabet(args.alphabet)
+    keys = {"en": ("KEY", "PETRENKO", "INFORMATIONSECURITY")}.get(alphabet.name)
+    bench_ciphers(args.size_mb, key_vigenere=keys[1] if keys else "ПЕТРЕНКО",
+                  with_reference=not args.no_reference, alphabet=alphabet)
+    if args.crack:
+        if keys:
+            bench_vigenere_crack(keys=keys, workers=args.workers, alphabet=alphabet)
+        else:
+            bench_vigenere_crack(workers=args.workers, alphabet=alphabet)
+    if args.startup:
+        bench_startup()
@@ -0,0 +1,185 @@
+import argparse
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from Lr2 import ALPHABETS, UKRAINIAN, LetterHistogram, get_alphabet, rank_shifts, vigenere_cipher
+
+# Автоматичний криптоаналіз шифру Віженера:
+# 1. довжина ключа - метод Касіскі та індекс збігів (IoC) по стовпцях;
+# 2. кожен стовпець - шифр Цезаря, який розв'язується частотним аналізом (rank_shifts).
+
+DEFAULT_MAX_KEY_LENGTH = 20
+# Скільки найкращих довжин ключа перевіряти повним розв'язанням
+CANDIDATES_TO_SOLVE = 5
+# З якого обсягу шифротексту варто запускати пул процесів
+PARALLEL_MIN_LETTERS = 200000
+# Для методу Касіскі достатньо початку шифротексту
+KASISKI_SAMPLE = 20000
+
+
+def cipher_letters(ciphertext, alphabet=UKRAINIAN):
+    """Лише літери шифротексту (Віженер просуває ключ тільки на них) у вигляді байтів алфавіту"""
+    return alphabet.encode(ciphertext).translate(None, alphabet.non_alphabet + b' ')
+
+
+def average_ioc(letters, key_length, alphabet=UKRAINIAN):
+    """Середній IoC стовпців; стовпці - це зрізи memoryview з кроком, без копіювання"""
+    view = memoryview(letters)
+    return sum(LetterHistogram.from_bytes(view[start::key_length], False, alphabet).index_of_coincidence()
+               for start in range(key_length)) / key_length
+
+
+def kasiski_votes(letters, max_key_length=DEFAULT_MAX_KEY_LENGTH, ngram=3):
+    """
+    Метод Касіскі: відстані між повторами триграм кратні довжині ключа.
+
+    Returns:
+        Counter: довжина ключа -> кількість відстаней, які на неї діляться.
+    """
+    last_seen = {}
+    votes = Counter()
+    for pos in range(len(letters) - ngram + 1):
+        gram = letters[pos:pos + ngram]
+        previous = last_seen.get(gram)
+        if previous is not None:
+            distance = pos - previous
+            for length in range(2, max_key_length + 1):
+                if distance % length == 0:
+                    votes[length] += 1
+        last_seen[gram] = pos
+    return votes
+
+
+def estimate_key_lengths(letters, max_key_length=DEFAULT_MAX_KEY_LENGTH, workers=0, alphabet=UKRAINIAN):
+    """
+    Ранжує можливі довжини ключа.
+
+    Args:
+        workers (int): Процеси для IoC різних довжин (None - за кількістю ядер, 0 - без пулу).
+
+    Returns:
+        list: [(довжина, середній IoC, голоси Касіскі), ...] від найімовірнішої.
+    """
+    if workers == 0:
+        return _rank_key_lengths(letters, max_key_length, alphabet)
+    with _letters_pool(letters, workers, alphabet) as pool:
+        return _rank_key_lengths(letters, max_key_length, alphabet, pool)
+
+
+def _rank_key_lengths(letters, max_key_length, alphabet, pool=None):
+    """estimate_key_lengths; pool - лише _letters_pool для тих самих letters і alphabet"""
+    max_key_length = max(1, min(max_key_length, len(letters) // 2))
+    votes = kasiski_votes(letters[:KASISKI_SAMPLE], max_key_length)
+    lengths = range(1, max_key_length + 1)
+    if pool is not None:
+        iocs = pool.map(_worker_ioc, lengths)
+    else:
+        iocs = [average_ioc(letters, length, alphabet) for length in lengths]
+    candidates = [(length, ioc, votes[length]) for length, ioc in zip(lengths, iocs)]
+    # Перш за все IoC, голоси Касіскі - як додатковий критерій
+    candidates.sort(key=lambda item: (round(item[1], 3), item[2]), reverse=True)
+    return candidates
+
+
+def _reduce_period(key):
+    """ПЕТРПЕТР -> ПЕТР: кратні довжини дають той самий ключ, повторений кілька разів"""
+    for period in range(1, len(key)):
+        if len(key) % period == 0 and key[:period] * (len(key) // period) == key:
+            return key[:period]
+    return key
+
+
+def solve_key(letters, key_length, alphabet=UKRAINIAN):
+    """
+    Розв'язує кожен стовпець як шифр Цезаря.
+
+    Returns:
+        tuple: (ключ, сумарний хі-квадрат на літеру).
+    """
+    view = memoryview(letters)
+    key = []
+    total_chi = 0.0
+    for start in range(key_length):
+        column = LetterHistogram.from_bytes(view[start::key_length], False, alphabet)
+        shift, chi_squared = rank_shifts(column.counts(), alphabet)[0]
+        key.append(alphabet.letters[shift])
+        total_chi += chi_squared
+    return _reduce_period(''.join(key)), total_chi / max(1, len(letters))
+
+
+# Шифротекст поточного процесу пулу (передається один раз на воркер, а не з кожною задачею)
+_letters = b''
+_alphabet = UKRAINIAN
+
+
+def _init_worker(letters, alphabet):
+    global _letters, _alphabet
+    _letters = letters
+    _alphabet = alphabet
+
+
+def _worker_ioc(key_length):
+    return average_ioc(_letters, key_length, _alphabet)
+
+
+def _worker_solve(key_length):
+    return solve_key(_letters, key_length, _alphabet)
+
+
+def _letters_pool(letters, workers, alphabet):
+    """Пул процесів, кожен воркер якого отримує letters один раз (задачі містять лише довжину ключа)"""
+    return ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(letters, alphabet))
+
+
+def crack_vigenere(ciphertext, max_key_length=DEFAULT_MAX_KEY_LENGTH, workers=None, alphabet=UKRAINIAN):
+    """
+    Знаходить ключ Віженера та відкритий текст.
+
+    Args:
+        ciphertext (str): Шифротекст (як повертає vigenere_cipher).
+        max_key_length (int): Максимальна довжина ключа, що перевіряється.
+        workers (int): Процеси для перевірки кандидатів (None - пул лише для великих текстів).
+        alphabet (Alphabet): Алфавіт шифру та частоти мови для оцінки стовпців.
+
+    Returns:
+        tuple: (ключ, розшифрований текст).
+    """
+    letters = cipher_letters(ciphertext, alphabet)
+    if not letters:
+        return '', ciphertext
+
+    use_pool = workers != 0 and (workers or len(letters) >= PARALLEL_MIN_LETTERS)
+    pool = _letters_pool(letters, workers, alphabet) if use_pool else None
+    try:
+        ranked = _rank_key_lengths(letters, max_key_length, alphabet, pool)
+        lengths = [length for length, _, _ in ranked[:CANDIDATES_TO_SOLVE]]
+        if pool is not None:
+            solutions = list(pool.map(_worker_solve, lengths))
+        else:
+            solutions = [solve_key(letters, length, alphabet) for length in lengths]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    # Найменший хі-квадрат; за рівності - коротший ключ
+    key, _ = min(solutions, key=lambda item: (round(item[1], 4), len(item[0])))
+    return key, vigenere_cipher(ciphertext, key, 'decrypt', alphabet)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Автоматичний злам шифру Віженера")
+    parser.add_argument("input", help="Файл із шифротекстом (UTF-8)")
+    parser.add_argument("--max-key-length", type=int, default=DEFAULT_MAX_KEY_LENGTH)
+    parser.add_argument("--workers", type=int, default=None, help="Кількість процесів (0 - без пулу)")
+    parser.add_argument("--alphabet", default="uk", choices=list(ALPHABETS))
+    args = parser.parse_args()
+
+    with open(args.input, encoding='utf-8') as f:
+        text = f.read()
+
+    start = time.perf_counter()
+    found_key, plaintext = crack_vigenere(text, args.max_key_length, args.workers,
+                                        get_alphabet(args.alphabet))
+    print(f"[+] Ключ: {found_key} (за {time.perf_counter() - start:.3f} с)")
+    print(plaintext[:500])
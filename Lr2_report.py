@@ -0,0 +1,86 @@
+import argparse
+import os
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from Lr2 import (ALPHABETS, UKRAINIAN, caesar_cipher, frequency_analysis, generate_caesar_key, get_alphabet,
+                 prepare_ukrainian_text, vigenere_cipher)
+
+# Звіти з графіками частотного аналізу без вікон: фігури створюються через
+# Figure + Agg-полотно, а не pyplot, тож працюють на серверах без дисплея
+# і не накопичують глобальний стан при побудові сотень графіків.
+
+SERIES_LABELS = ('Оригінальний текст', 'Цезарь (зашифрований)', 'Віженер (зашифрований)')
+
+
+def draw_frequency_chart(ax, original, caesar_enc, vigenere_enc, title='Частотний аналіз текстів',
+                         alphabet=UKRAINIAN):
+    """Малює стовпчикову діаграму частот трьох текстів на осях ax"""
+    # Аналіз частот для кожного тексту
+    frequencies = [frequency_analysis(text, alphabet) for text in (original, caesar_enc, vigenere_enc)]
+
+    # Підготовка даних для графіка
+    letters = sorted(set().union(*frequencies))
+    x = range(len(letters))
+    width = 0.25
+
+    for offset, label, freq in zip((-width, 0, width), SERIES_LABELS, frequencies):
+        ax.bar([i + offset for i in x], [freq.get(letter, 0) for letter in letters], width,
+               label=label, alpha=0.7)
+
+    ax.set_xlabel('Літери')
+    ax.set_ylabel('Частота, %')
+    ax.set_title(title)
+    ax.set_xticks(list(x))
+    ax.set_xticklabels(letters)
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+
+def save_frequency_chart(path, original, caesar_enc, vigenere_enc, title='Частотний аналіз текстів',
+                         alphabet=UKRAINIAN):
+    """Зберігає графік у файл; формат (png, svg, ...) визначається за розширенням"""
+    fig = Figure(figsize=(15, 6))
+    FigureCanvasAgg(fig)
+    draw_frequency_chart(fig.add_subplot(), original, caesar_enc, vigenere_enc, title, alphabet)
+    fig.tight_layout()
+    fig.savefig(path)
+    return path
+
+
+def render_reports(paths, output_dir, birth_date='12.05.2004', surname='ПЕТРЕНКО', fmt='png',
+                   alphabet=UKRAINIAN):
+    """
+    Будує графіки для багатьох текстів в одному процесі.
+    Кожен текст готується, шифрується Цезарем і Віженером і зберігається як <назва>.<fmt>.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    caesar_key = generate_caesar_key(birth_date, alphabet)
+    outputs = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            prepared = prepare_ukrainian_text(f.read(), alphabet)
+        name = os.path.splitext(os.path.basename(path))[0]
+        output_path = os.path.join(output_dir, f"{name}.{fmt}")
+        save_frequency_chart(output_path, prepared,
+                             caesar_cipher(prepared, caesar_key, 'encrypt', alphabet),
+                             vigenere_cipher(prepared, surname, 'encrypt', alphabet),
+                             title=f'Частотний аналіз: {name}', alphabet=alphabet)
+        outputs.append(output_path)
+    return outputs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Пакетна побудова графіків частотного аналізу (без вікон)")
+    parser.add_argument("texts", nargs="+", help="Текстові файли (UTF-8)")
+    parser.add_argument("-o", "--output-dir", default="reports")
+    parser.add_argument("--birth-date", default="12.05.2004", help="Дата для ключа Цезаря")
+    parser.add_argument("--surname", default="ПЕТРЕНКО", help="Ключ Віженера")
+    parser.add_argument("--format", default="png", choices=["png", "svg", "pdf"])
+    parser.add_argument("--alphabet", default="uk", choices=list(ALPHABETS))
+    args = parser.parse_args()
+
+    for output in render_reports(args.texts, args.output_dir, args.birth_date, args.surname, args.format,
+                                 get_alphabet(args.alphabet)):
+        print(f"[+] {output}")
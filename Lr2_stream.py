@@ -0,0 +1,96 @@
+import argparse
+import time
+
+from Lr2 import ALPHABETS, UKRAINIAN, caesar_cipher, get_alphabet, prepare_ukrainian_text, vigenere_cipher_chunk
+
+# Потокова обробка великих файлів шифрами Lr2.
+# Кожен етап - генератор, тож у пам'яті одночасно лише один фрагмент тексту,
+# а результат збігається з обробкою всього файлу одним рядком.
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # символів
+
+
+def read_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Читає текстовий файл фрагментами по chunk_size символів"""
+    # newline='' - символи переходу рядка передаються без змін
+    with open(path, encoding='utf-8', newline='') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def prepare_stream(chunks, alphabet=UKRAINIAN):
+    """Верхній регістр і фільтрація (prepare_ukrainian_text) для кожного фрагмента"""
+    for chunk in chunks:
+        yield prepare_ukrainian_text(chunk, alphabet)
+
+
+def caesar_stream(chunks, key, mode='encrypt', alphabet=UKRAINIAN):
+    """Шифр Цезаря не має стану між фрагментами"""
+    for chunk in chunks:
+        yield caesar_cipher(chunk, key, mode, alphabet)
+
+
+def vigenere_stream(chunks, key, mode='encrypt', alphabet=UKRAINIAN):
+    """Шифр Віженера: позиція ключа переноситься з фрагмента у фрагмент"""
+    key_offset = 0
+    for chunk in chunks:
+        result, key_offset = vigenere_cipher_chunk(chunk, key, mode, key_offset, alphabet)
+        yield result
+
+
+def write_chunks(chunks, path):
+    """Записує фрагменти у файл; повертає кількість записаних символів"""
+    written = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        for chunk in chunks:
+            f.write(chunk)
+            written += len(chunk)
+    return written
+
+
+def process_file(input_path, output_path, cipher, key, mode='encrypt', prepare=True,
+                 chunk_size=DEFAULT_CHUNK_SIZE, alphabet=UKRAINIAN):
+    """
+    Шифрує/розшифровує файл потоком: читання -> підготовка -> шифр -> запис.
+
+    Args:
+        cipher (str): 'caesar' або 'vigenere'.
+        key: Ключ (число для Цезаря, слово для Віженера).
+        prepare (bool): Чи виконувати prepare_ukrainian_text (для розшифрування зазвичай не потрібно).
+        alphabet (Alphabet): Алфавіт шифру (за замовчуванням український).
+
+    Returns:
+        int: Кількість записаних символів.
+    """
+    chunks = read_chunks(input_path, chunk_size)
+    if prepare:
+        chunks = prepare_stream(chunks, alphabet)
+    if cipher == 'caesar':
+        chunks = caesar_stream(chunks, int(key), mode, alphabet)
+    elif cipher == 'vigenere':
+        chunks = vigenere_stream(chunks, key, mode, alphabet)
+    else:
+        raise ValueError(f"Невідомий шифр: {cipher}")
+    return write_chunks(chunks, output_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Потокове шифрування файлів шифрами Цезаря та Віженера")
+    parser.add_argument("mode", choices=["encrypt", "decrypt"])
+    parser.add_argument("cipher", choices=["caesar", "vigenere"])
+    parser.add_argument("key", help="Зсув для Цезаря або ключове слово для Віженера")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Розмір фрагмента в символах")
+    parser.add_argument("--no-prepare", action="store_true", help="Не виконувати підготовку тексту")
+    parser.add_argument("--alphabet", default="uk", choices=list(ALPHABETS))
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    prepare = args.mode == "encrypt" and not args.no_prepare
+    total = process_file(args.input, args.output, args.cipher, args.key, args.mode, prepare, args.chunk_size,
+                         get_alphabet(args.alphabet))
+    print(f"[+] Записано {total} символів у {args.output} за {time.perf_counter() - start:.2f} с")
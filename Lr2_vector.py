@@ -0,0 +1,93 @@
+from functools import lru_cache
+
+import numpy as np
+
+from Lr2 import UKRAINIAN, _SPACE
+
+# Векторизовані (NumPy) варіанти шифрів Lr2 для великих корпусів.
+# Текст -> масив індексів алфавіту -> модульна арифметика за модулем алфавіту -> назад у текст.
+# Результати збігаються з caesar_cipher та vigenere_cipher з Lr2.
+
+
+@lru_cache(maxsize=None)
+def _lookup_tables(alphabet):
+    """
+    Таблиці NumPy для алфавіту (будуються один раз):
+    байт -> індекс літери, сума двох індексів -> байт літери, байти, що лишаються в Цезарі.
+    """
+    size = alphabet.size
+    letter_bytes = np.frombuffer(alphabet.letter_bytes, dtype=np.uint8)
+
+    # Символ поза алфавітом отримує індекс size - 1,
+    # бо find() у початковій реалізації давав -1, а (-1 + k) % size == (size - 1 + k) % size.
+    # Сума двох індексів має вміститись у тип масиву: для алфавітів до 128 літер - uint8
+    index_lut = np.full(256, size - 1, dtype=np.uint8 if size <= 128 else np.uint16)
+    index_lut[letter_bytes] = np.arange(size)
+
+    # Сума двох індексів (0..2*size-2) -> байт літери; замінює окреме взяття залишку
+    sum_to_letter = letter_bytes[np.arange(2 * size) % size]
+
+    # Байти, що лишаються в шифрі Цезаря (літери та пробіл)
+    keep_lut = np.ones(256, dtype=bool)
+    keep_lut[np.frombuffer(alphabet.non_alphabet, dtype=np.uint8)] = False
+    return index_lut, sum_to_letter, keep_lut
+
+
+def text_to_array(text, alphabet=UKRAINIAN):
+    """Текст -> масив байтів алфавіту (без копіювання буфера)"""
+    return np.frombuffer(alphabet.encode(text), dtype=np.uint8)
+
+
+def text_to_indices(text, alphabet=UKRAINIAN):
+    """Текст -> масив індексів алфавіту (символи поза алфавітом - останній індекс)"""
+    return _lookup_tables(alphabet)[0][text_to_array(text, alphabet)]
+
+
+def caesar_cipher_np(text, key, mode='encrypt', alphabet=UKRAINIAN):
+    """Шифр Цезаря: одна вибірка з таблиці зсуву на весь масив"""
+    shift = key if mode == 'encrypt' else -key
+    data = text_to_array(text, alphabet)
+    keep_lut = _lookup_tables(alphabet)[2]
+    table = np.frombuffer(alphabet.caesar_table(shift), dtype=np.uint8)
+    # Як і в Lr2: пробіли зберігаються, символи поза алфавітом відкидаються
+    return alphabet.decode(table[data[keep_lut[data]]].tobytes())
+
+
+def _key_shifts(key, encrypt, alphabet):
+    """Зсуви для кожної позиції ключа - лише префікс до першого символу поза алфавітом"""
+    shifts = []
+    for key_char in key:
+        key_char_idx = alphabet.find(key_char)
+        if key_char_idx == -1:
+            break
+        shifts.append(key_char_idx if encrypt else -key_char_idx % alphabet.size)
+    return np.array(shifts, dtype=_lookup_tables(alphabet)[0].dtype)
+
+
+def vigenere_cipher_np(text, key, mode='encrypt', alphabet=UKRAINIAN):
+    """
+    Шифр Віженера: ключ розгортається (np.resize) на всі непробільні символи,
+    тож позиція ключа просувається лише на них, як у vigenere_cipher.
+    """
+    key = key.upper()
+    index_lut, sum_to_letter, _ = _lookup_tables(alphabet)
+    data = text_to_array(text, alphabet)
+    non_space = data != _SPACE
+    letters = index_lut[data[non_space]]
+    if not len(letters):
+        return text
+    if not key:
+        raise ValueError("Ключ Віженера не може бути порожнім")
+
+    shifts = _key_shifts(key, mode == 'encrypt', alphabet)
+    result = data.copy()
+    if len(shifts) < len(key):
+        # Символ ключа поза алфавітом: решта непробільних символів відкидається
+        dropped = np.flatnonzero(non_space)[len(shifts):]
+        letters = letters[:len(shifts)]
+        result = np.delete(result, dropped)
+        non_space = np.delete(non_space, dropped)
+
+    key_stream = np.resize(shifts, len(letters)) if len(letters) else shifts[:0]
+    result[non_space] = sum_to_letter[letters + key_stream]
+    return alphabet.decode(result.tobytes())
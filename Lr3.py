@@ -1,3 +1,7 @@
+import struct
+import zlib
+
+import numpy as np
 from PIL import Image
 import os
 
@@ -33,116 +37,425 @@ def binary_to_text(binary_string):
     except UnicodeDecodeError:
         return "Помилка декодування (можливо, невірні дані)"
 
+# --- Векторизовані операції над молодшими бітами ---
+#
+# Зображення обробляється як один масив uint8 (висота x ширина x 3), а біти
+# повідомлення - як масив 0/1: запис і читання LSB - це одна операція NumPy
+# замість циклу по пікселях. Порядок бітів той самий: пікселі рядок за рядком,
+# у кожному R, G, B, старший біт байта першим.
+
+def bytes_to_bits(data):
+    """Байти -> масив бітів (0/1), старший біт першим, як format(byte, '08b')"""
+    return np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+
+
+def embed_bits(img, bits):
+    """
+    Записує біти в молодші біти каналів RGB зображення img (на місці).
+    Змінюються лише рядки, у які потрапляють дані.
+    """
+    return embed_segments(img, [(0, bits, 1, 3)])
+
+
+def embed_segments(img, segments):
+    """
+    Записує сегменти даних (див. make_segment) у зображення img (RGB або RGBA, на місці).
+    Змінюються лише рядки, у які потрапляють дані.
+    """
+    width, _ = img.size
+    rows = -(-max(map(segment_end, segments), default=0) // width)
+    if not rows:
+        return img
+    band = np.array(img.crop((0, 0, width, rows)))
+    pixels = band.reshape(-1, band.shape[-1])
+    for segment in segments:
+        write_segment(pixels, 0, segment)
+    img.paste(Image.fromarray(band, img.mode), (0, 0))
+    return img
+
+
+def read_lsb_bytes(img):
+    """
+    Молодші біти всіх каналів RGB, зібрані по 8 у байти.
+    Неповний останній байт (якщо бітів не кратно 8) повертається
+    як число з цих бітів - так само, як int(byte, 2) для короткого рядка.
+    """
+    bits = np.asarray(img).reshape(-1) & 1
+    full = len(bits) - len(bits) % 8
+    data = np.packbits(bits[:full]).tobytes()
+    if full < len(bits):
+        tail = 0
+        for bit in bits[full:]:
+            tail = (tail << 1) | int(bit)
+        data += bytes([tail])
+    return data
+
+
+class BitCollector:
+    """Збирає біти частинами (рядками, смугами) у байти; неповний байт переноситься далі"""
+
+    def __init__(self):
+        self.data = bytearray()
+        self._pending = np.zeros(0, dtype=np.uint8)
+
+    def add(self, bits):
+        bits = np.concatenate((self._pending, bits))
+        full = len(bits) - len(bits) % 8
+        self.data += np.packbits(bits[:full]).tobytes()
+        self._pending = bits[full:]
+
+    def finish(self):
+        """Неповний останній байт - число з цих бітів, як у read_lsb_bytes"""
+        if len(self._pending):
+            tail = 0
+            for bit in self._pending:
+                tail = (tail << 1) | int(bit)
+            self.data.append(tail)
+            self._pending = self._pending[:0]
+
+
+# --- Щільні режими: k молодших бітів на канал і альфа-канал ---
+#
+# Дані описуються сегментами (перший піксель, значення, k, канали): кожне значення -
+# це k бітів повідомлення, що займають k молодших бітів одного каналу; каналів 3 (R, G, B)
+# або 4 (з альфою). Сегмент пишеться й читається над будь-яким масивом пікселів
+# (кількість x канали), тож однаково працює для зображення PIL, рядка потокового
+# PNG та mmap-файлу. Більше k - менше пікселів змінюється для тих самих даних.
+
+MAX_BITS_PER_CHANNEL = 4
+
+
+def check_bits_per_channel(bits_per_channel):
+    """k зберігається в заголовку двома бітами (k - 1), тож допустимі лише 1..MAX_BITS_PER_CHANNEL"""
+    if not isinstance(bits_per_channel, int) or not 1 <= bits_per_channel <= MAX_BITS_PER_CHANNEL:
+        raise ValueError(f"Біт на канал має бути від 1 до {MAX_BITS_PER_CHANNEL}, отримано: {bits_per_channel!r}")
+
+
+def bits_to_values(bits, bits_per_channel=1):
+    """Біти -> значення по k бітів (старший біт першим); останнє доповнюється нулями"""
+    if bits_per_channel == 1:
+        return bits
+    padded = np.zeros(-(-len(bits) // bits_per_channel) * bits_per_channel, dtype=np.uint8)
+    padded[:len(bits)] = bits
+    weights = np.left_shift(1, np.arange(bits_per_channel - 1, -1, -1)).astype(np.uint8)
+    return (padded.reshape(-1, bits_per_channel) * weights).sum(axis=1, dtype=np.uint8)
+
+
+def values_to_bits(values, bits_per_channel=1):
+    """Значення по k бітів -> біти (обернене до bits_to_values)"""
+    if bits_per_channel == 1:
+        return values
+    shifts = np.arange(bits_per_channel - 1, -1, -1, dtype=np.uint8)
+    return ((values[:, None] >> shifts) & 1).reshape(-1)
+
+
+def make_segment(first_pixel, data, bits_per_channel=1, channels=3):
+    """Сегмент для запису: байти data з пікселя first_pixel, k бітів у кожному з channels каналів"""
+    return first_pixel, bits_to_values(bytes_to_bits(data), bits_per_channel), bits_per_channel, channels
+
+
+def segment_pixels(size, bits_per_channel=1, channels=3):
+    """Скільки пікселів займають size байтів"""
+    slots = -(-size * 8 // bits_per_channel)
+    return -(-slots // channels)
+
+
+def segment_end(segment):
+    """Піксель, наступний за останнім пікселем сегмента"""
+    first_pixel, values, _, channels = segment
+    return first_pixel + -(-len(values) // channels)
+
+
+def write_segment(pixels, first_pixel, segment):
+    """
+    Записує частину сегмента, що припадає на pixels - масив (кількість x канали)
+    пікселів зображення, починаючи з пікселя first_pixel.
+    """
+    start, values, bits_per_channel, channels = segment
+    lo = max(start, first_pixel)
+    hi = min(segment_end(segment), first_pixel + len(pixels))
+    if lo >= hi:
+        return
+    target = pixels[lo - first_pixel:hi - first_pixel, :channels]
+    flat = target.reshape(-1)
+    part = values[(lo - start) * channels:][:len(flat)]
+    # Обнуляємо k молодших бітів і додаємо біти повідомлення
+    keep = 0xFF ^ ((1 << bits_per_channel) - 1)
+    flat[:len(part)] = (flat[:len(part)] & keep) | part
+    # Для несуцільного зрізу (RGB з RGBA) reshape дав копію - повертаємо значення
+    target[...] = flat.reshape(target.shape)
+
+
+def read_segment(pixels, first_pixel, start, size, bits_per_channel=1, channels=3):
+    """size байтів сегмента з пікселя start; pixels (з пікселя first_pixel) мають покривати весь сегмент"""
+    slots = -(-size * 8 // bits_per_channel)
+    offset = start - first_pixel
+    count = segment_pixels(size, bits_per_channel, channels)
+    values = pixels[offset:offset + count, :channels].reshape(-1)[:slots] & ((1 << bits_per_channel) - 1)
+    return np.packbits(values_to_bits(values, bits_per_channel)[:size * 8]).tobytes()
+
+
+def read_pixels(img, first_pixel, count, channels=3):
+    """
+    Пікселі first_pixel..first_pixel+count зображення PIL.
+    Конвертуються лише рядки, що їх містять.
+
+    Returns:
+        tuple: (масив кількість x канали, номер першого пікселя масиву).
+    """
+    width, _ = img.size
+    row0 = first_pixel // width
+    row1 = -(-(first_pixel + count) // width)
+    band = img.crop((0, row0, width, row1)).convert("RGBA" if channels == 4 else "RGB")
+    return np.asarray(band).reshape(-1, channels), row0 * width
+
+
+# --- Формат контейнера ---
+#
+# Заголовок перед даними: магія, версія, прапорці, довжина даних і CRC32.
+# Екстрактор спершу читає лише пікселі заголовка, а потім рівно стільки
+# пікселів, скільки займають дані, - без проходу по всьому зображенню.
+# Маркер "#####" більше не потрібен, тож дані можуть містити будь-які байти.
+# Зображення старого формату (з маркером) читаються як раніше.
+
+MAGIC = b"LSB\x00"
+FORMAT_VERSION = 1
+# Версія 2 - щільні режими: заголовок, як і раніше, 1 бітом у R, G, B перших пікселів,
+# а дані з наступного пікселя - k бітами на канал, за бажанням і в альфа-каналі
+DENSE_FORMAT_VERSION = 2
+HEADER = struct.Struct(">4sBBII")  # магія, версія, прапорці, довжина, CRC32
+HEADER_PIXELS = segment_pixels(HEADER.size)
+
+# Прапорці
+FLAG_TEXT = 0x01  # дані - текст UTF-8
+FLAG_ALPHA = 0x02  # дані також в альфа-каналі
+_BITS_SHIFT = 2  # біти 2-3: k - 1 (кількість молодших бітів на канал)
+
+LEGACY_DELIMITER = "#####"
+
+
+def pack_container(payload, flags=0):
+    """Заголовок + дані"""
+    return HEADER.pack(MAGIC, FORMAT_VERSION, flags, len(payload), zlib.crc32(payload)) + payload
+
+
+def payload_capacity(width, height, bits_per_channel=1, use_alpha=False):
+    """Скільки байтів даних (без заголовка) уміщується в зображення"""
+    if bits_per_channel == 1 and not use_alpha:
+        return max(0, width * height * 3 // 8 - HEADER.size)
+    channels = 4 if use_alpha else 3
+    return max(0, (width * height - HEADER_PIXELS) * channels * bits_per_channel // 8)
+
+
+def plan_bits_per_channel(width, height, size, use_alpha=False, max_bits=MAX_BITS_PER_CHANNEL):
+    """
+    Планувальник ємності: найменше k (біт на канал), з яким size байтів уміщуються.
+    Менше k - менше спотворення зображення.
+
+    Raises:
+        ValueError: Дані не вміщуються навіть з max_bits бітами на канал.
+    """
+    for bits_per_channel in range(1, max_bits + 1):
+        if size <= payload_capacity(width, height, bits_per_channel, use_alpha):
+            return bits_per_channel
+    raise ValueError(f"Дані ({size} байт) не вміщуються навіть з {max_bits} бітами на канал")
+
+
+def container_segments(payload, flags=0, bits_per_channel=1, use_alpha=False):
+    """Сегменти для запису контейнера: для 1 біта в RGB - формат версії 1, інакше версії 2"""
+    check_bits_per_channel(bits_per_channel)
+    if bits_per_channel == 1 and not use_alpha:
+        return [make_segment(0, pack_container(payload, flags))]
+    flags |= (bits_per_channel - 1) << _BITS_SHIFT
+    if use_alpha:
+        flags |= FLAG_ALPHA
+    header = HEADER.pack(MAGIC, DENSE_FORMAT_VERSION, flags, len(payload), zlib.crc32(payload))
+    return [make_segment(0, header),
+            make_segment(HEADER_PIXELS, payload, bits_per_channel, 4 if use_alpha else 3)]
+
+
+def read_lsb_prefix(img, size):
+    """
+    Перші size байтів з молодших бітів зображення.
+    Конвертуються в RGB і читаються лише рядки, що їх містять.
+    """
+    width, height = img.size
+    rows = min(height, -(-size * 8 // (width * 3)))
+    band = img.crop((0, 0, width, rows)).convert("RGB")
+    bits = np.asarray(band).reshape(-1)[:size * 8] & 1
+    return np.packbits(bits).tobytes()
+
+
+def parse_container(read_prefix, width, height, read_payload=None):
+    """
+    Розбирає контейнер нового формату.
+
+    Args:
+        read_prefix (callable): read_prefix(n) повертає перші n байтів з молодших бітів.
+        width, height (int): Розмір зображення.
+        read_payload (callable): read_payload(перший піксель, n, k, канали) - n байтів
+            щільного сегмента (версія 2); None, якщо спосіб читання їх не підтримує.
+
+    Returns:
+        tuple: (прапорці, дані) або None, якщо заголовка немає.
+
+    Raises:
+        ValueError: Заголовок є, але версія невідома або дані пошкоджені.
+    """
+    if width * height * 3 // 8 < HEADER.size:
+        return None
+    magic, version, flags, length, crc = HEADER.unpack(read_prefix(HEADER.size))
+    if magic != MAGIC:
+        return None
+    if version == FORMAT_VERSION:
+        if length > payload_capacity(width, height):
+            return None
+        payload = read_prefix(HEADER.size + length)[HEADER.size:]
+    elif version == DENSE_FORMAT_VERSION:
+        bits_per_channel = ((flags >> _BITS_SHIFT) & 0x03) + 1
+        use_alpha = bool(flags & FLAG_ALPHA)
+        if length > payload_capacity(width, height, bits_per_channel, use_alpha):
+            return None
+        if read_payload is None:
+            raise ValueError("Щільний режим не підтримується цим способом читання")
+        payload = read_payload(HEADER_PIXELS, length, bits_per_channel, 4 if use_alpha else 3)
+    else:
+        raise ValueError(f"Непідтримувана версія формату: {version}")
+    if zlib.crc32(payload) != crc:
+        raise ValueError("Контрольна сума не збігається, дані пошкоджено")
+    return flags, payload
+
+
+def read_container(img):
+    """Контейнер нового формату із зображення PIL (див. parse_container)"""
+    width, height = img.size
+
+    def read_payload(start, size, bits_per_channel, channels):
+        pixels, first_pixel = read_pixels(img, start, segment_pixels(size, bits_per_channel, channels), channels)
+        return read_segment(pixels, first_pixel, start, size, bits_per_channel, channels)
+
+    return parse_container(lambda size: read_lsb_prefix(img, size), width, height, read_payload)
+
+
+def decode_payload(flags, payload):
+    """Дані контейнера -> рядок: текст UTF-8 або, як раніше, chr() кожного байта (latin-1)"""
+    return payload.decode('utf-8', errors='replace') if flags & FLAG_TEXT else payload.decode('latin-1')
+
+
+def find_legacy_payload(img, delimiter=LEGACY_DELIMITER.encode('latin-1')):
+    """Старий формат: дані до першого маркера (потребує читання всього зображення)"""
+    data = read_lsb_bytes(img.convert("RGB"))
+    end_index = data.find(delimiter)
+    return data[:end_index] if end_index != -1 else None
+
+
 # --- Основні функції (Етап 2) ---
 
-def hide_message(image_path, output_path, secret_text):
-    print(f"[*] Починаємо приховування тексту в {image_path}...")
+# Що повертає extract_message, якщо повідомлення немає або воно пошкоджене
+NOT_FOUND_MESSAGE = "[!] Повідомлення або маркер не знайдено."
+CORRUPTED_MESSAGE = "[!] Повідомлення пошкоджено."
+
+
+def _silent(*args, **kwargs):
+    pass
+
+
+def get_log(verbose=True):
+    """print або функція, що нічого не виводить (тихий режим, напр. для пакетної обробки)"""
+    return print if verbose else _silent
+
+
+def hide_message(image_path, output_path, secret_text, legacy=False, bits_per_channel=None, use_alpha=False,
+                 verbose=True):
+    """
+    Ховає текст у зображенні (PNG).
+    legacy=True - старий формат із маркером "#####" замість заголовка.
+    bits_per_channel - скільки молодших бітів кожного каналу займати (1-4);
+    None - найменше, з яким текст уміщується (планувальник ємності).
+    use_alpha=True - дані пишуться й в альфа-канал (результат - RGBA).
+    verbose=False - нічого не виводити.
+    Повертає True, якщо файл збережено, і False, якщо текст не вміщується.
+    ValueError - bits_per_channel поза 1-4.
+    """
+    if bits_per_channel is not None:
+        check_bits_per_channel(bits_per_channel)
+    log = get_log(verbose)
+    log(f"[*] Починаємо приховування тексту в {image_path}...")
     
     # Відкриваємо зображення
     img = Image.open(image_path)
-    # Конвертуємо в RGB, про всяк випадок
-    img = img.convert("RGB")
+    # Конвертуємо в RGB (або RGBA, якщо потрібен альфа-канал)
+    img = img.convert("RGBA" if use_alpha else "RGB")
     width, height = img.size
     
-    # Додаємо маркер кінця повідомлення, щоб знати, коли стоп
-    DELIMITER = "#####"
-    full_text = secret_text + DELIMITER
+    if legacy:
+        # Додаємо маркер кінця повідомлення, щоб знати, коли стоп
+        bits_per_channel, use_alpha = 1, False
+        segments = [make_segment(0, (secret_text + LEGACY_DELIMITER).encode('utf-8'))]
+        fits = len(segments[0][1]) <= width * height * 3
+    else:
+        # Заголовок з довжиною та контрольною сумою замість маркера
+        payload = secret_text.encode('utf-8')
+        if bits_per_channel is None:
+            try:
+                bits_per_channel = plan_bits_per_channel(width, height, len(payload), use_alpha)
+            except ValueError:
+                bits_per_channel = MAX_BITS_PER_CHANNEL
+        fits = len(payload) <= payload_capacity(width, height, bits_per_channel, use_alpha)
+        segments = container_segments(payload, FLAG_TEXT, bits_per_channel, use_alpha)
     
-    # Отримуємо бінарний код
-    binary_msg = text_to_binary(full_text)
-    data_len = len(binary_msg)
+    data_len = sum(len(values) * k for _, values, k, _ in segments)
     
     # Перевірка, чи влізе текст в картинку
-    # В кожному пікселі 3 канали (R, G, B), тому можемо сховати 3 біти
-    max_capacity = width * height * 3
-    if data_len > max_capacity:
-        print(f"[!] Помилка: Текст занадто великий для цієї картинки! Потрібно більше пікселів.")
-        return
-
-    print(f"[*] Довжина повідомлення (біт): {data_len}")
-    print(f"[*] Максимальна ємність картинки (біт): {max_capacity}")
+    # В кожному пікселі 3 канали (R, G, B) або 4 з альфою, у кожному k бітів
+    max_capacity = width * height * (4 if use_alpha else 3) * bits_per_channel
+    if not fits:
+        log(f"[!] Помилка: Текст занадто великий для цієї картинки! Потрібно більше пікселів.")
+        return False
 
-    # Завантажуємо пікселі для редагування
-    pixels = img.load()
+    log(f"[*] Довжина повідомлення (біт): {data_len}")
+    log(f"[*] Максимальна ємність картинки (біт): {max_capacity}")
+    if bits_per_channel > 1 or use_alpha:
+        log(f"[*] Біт на канал: {bits_per_channel}{', з альфа-каналом' if use_alpha else ''}")
 
-    data_index = 0
-    
-    # Проходимо по всіх пікселях (цикли x та y)
-    for y in range(height):
-        for x in range(width):
-            if data_index >= data_len:
-                break
-            
-            # Отримуємо поточний піксель (R, G, B)
-            r, g, b = pixels[x, y]
-            
-            # Змінюємо R (червоний)
-            if data_index < data_len:
-                # Логіка: обнуляємо останній біт (& ~1) і додаємо біт повідомлення (| int(...))
-                r = (r & ~1) | int(binary_msg[data_index])
-                data_index += 1
-                
-            # Змінюємо G (зелений)
-            if data_index < data_len:
-                g = (g & ~1) | int(binary_msg[data_index])
-                data_index += 1
-                
-            # Змінюємо B (синій)
-            if data_index < data_len:
-                b = (b & ~1) | int(binary_msg[data_index])
-                data_index += 1
-            
-            # Записуємо змінений піксель назад
-            pixels[x, y] = (r, g, b)
-        
-        if data_index >= data_len:
-            break
+    # Записуємо всі біти одним присвоєнням у масив пікселів
+    embed_segments(img, segments)
             
     # Зберігаємо результат
     # ВАЖЛИВО: зберігати в PNG, бо JPG зіпсує пікселі стисненням
     img.save(output_path, "PNG")
-    print(f"[+] Успішно збережено в файл: {output_path}")
+    log(f"[+] Успішно збережено в файл: {output_path}")
+    return True
 
 
-def extract_message(image_path):
-    print(f"[*] Спроба витягнути повідомлення з {image_path}...")
+def extract_message(image_path, verbose=True):
+    log = get_log(verbose)
+    log(f"[*] Спроба витягнути повідомлення з {image_path}...")
     
     img = Image.open(image_path)
-    img = img.convert("RGB")
-    width, height = img.size
-    pixels = img.load()
     
-    binary_data = ""
-    DELIMITER = "#####"
-    
-    # Проходимо по пікселях і збираємо останні біти
-    for y in range(height):
-        for x in range(width):
-            r, g, b = pixels[x, y]
-            
-            # Витягуємо останні біти (операція AND 1)
-            binary_data += str(r & 1)
-            binary_data += str(g & 1)
-            binary_data += str(b & 1)
-            
-    # Перевіряємо кожні 8 біт (1 байт), чи не знайшли ми маркер
-    # Але для спрощення просто конвертуємо все в текст і шукаємо маркер
-    # (В реальних задачах краще перевіряти "на льоту", щоб не крутити зайві цикли)
-    
-    # Розбиваємо по 8 біт
-    all_bytes = [binary_data[i:i+8] for i in range(0, len(binary_data), 8)]
-    
-    decoded_msg = ""
-    for byte in all_bytes:
-        # Конвертуємо байт в символ
-        decoded_msg += chr(int(byte, 2))
-        # Перевіряємо чи є маркер в кінці нашого зібраного рядка
-        if decoded_msg.endswith(DELIMITER):
-            # Відрізаємо маркер і виходимо
-            print("[+] Повідомлення знайдено!")
-            return decoded_msg[:-len(DELIMITER)]
-            
-    return "[!] Повідомлення або маркер не знайдено."
+    # Новий формат: читаються лише пікселі заголовка та даних
+    error = None
+    try:
+        container = read_container(img)
+    except ValueError as e:
+        container, error = None, e
+    if container is not None:
+        flags, payload = container
+        log("[+] Повідомлення знайдено!")
+        return decode_payload(flags, payload)
+
+    # Старий формат: збираємо останні біти всіх пікселів і шукаємо перший маркер.
+    # Кожен байт - окремий символ chr(byte), тобто latin-1
+    payload = find_legacy_payload(img)
+    if payload is not None:
+        log("[+] Повідомлення знайдено!")
+        return payload.decode('latin-1')
+
+    if error is not None:
+        log(f"[!] {error}")
+        return CORRUPTED_MESSAGE
+    return NOT_FOUND_MESSAGE
 
 # --- Етап 3: Демонстрація на персональних даних ---
 
@@ -0,0 +1,281 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+import Lr3
+import Lr3_raw
+import Lr3_tiled
+
+# Пакетна стеганографія: багато контейнерів обробляються в пулі процесів.
+# Кожен файл - окрема задача; помилка в одному файлі записується в його
+# результат і не зупиняє решту. Воркери викликають ті самі hide/extract з Lr3
+# (у тихому режимі), тож результат збігається з обробкою кожного файлу окремо.
+
+# Розширення, які вважаються зображеннями при обході каталогу
+IMAGE_EXTENSIONS = (".png", ".bmp", ".ppm", ".tif", ".tiff", ".gif", ".jpg", ".jpeg", ".webp")
+
+
+# --- Вхідні дані ---
+
+def scan_directory(path):
+    """Шляхи до зображень у каталозі (рекурсивно, у відсортованому порядку)"""
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                yield os.path.join(root, name)
+
+
+def read_manifest(path):
+    """
+    Потоково читає маніфест: CSV із заголовком carrier,payload[,output]
+    або JSONL (`.jsonl`/`.ndjson`) з тими самими полями.
+
+    Yields:
+        tuple: (carrier, payload або None, output або None).
+    """
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8", newline="")
+    try:
+        if path.endswith((".jsonl", ".ndjson")):
+            records = (json.loads(line) for line in stream if line.strip())
+        else:
+            records = csv.DictReader(stream)
+        for record in records:
+            yield record["carrier"], record.get("payload"), record.get("output") or None
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def read_tasks(source, text=None):
+    """
+    Задачі з каталогу або маніфесту.
+
+    Для каталогу текст для приховування - text (однаковий для всіх файлів)
+    або вміст сусіднього файлу <ім'я>.txt, якщо він є.
+
+    Yields:
+        tuple: (carrier, payload або None, output або None).
+    """
+    if not os.path.isdir(source):
+        yield from read_manifest(source)
+        return
+    for carrier in scan_directory(source):
+        payload = text
+        sidecar = os.path.splitext(carrier)[0] + ".txt"
+        if payload is None and os.path.exists(sidecar):
+            with open(sidecar, encoding="utf-8") as f:
+                payload = f.read()
+        yield carrier, payload, None
+
+
+def output_path_for(carrier, output_dir, root=None):
+    """
+    Шлях результату в output_dir: для каталогу root зберігається шлях відносно root
+    (a/img.png і b/img.png не перетинаються), без root - лише ім'я файлу.
+    BMP/PPM зберігають формат (mmap), усе інше зберігається як PNG.
+    """
+    name = os.path.relpath(carrier, root) if root is not None else os.path.basename(carrier)
+    if not Lr3_raw.is_raw_carrier(carrier):
+        name = os.path.splitext(name)[0] + ".png"
+    return os.path.join(output_dir, name)
+
+
+def _same_file_key(path):
+    return os.path.normcase(os.path.realpath(path))
+
+
+def plan_outputs(tasks, output_dir, root=None):
+    """
+    Призначає кожній задачі hide вихідний файл (заданий або output_path_for) і
+    відхиляє ті, що перезаписали б вхідний файл або результат попередньої задачі
+    (напр. x.jpg і x.png -> x.png).
+
+    Yields:
+        tuple: (carrier, payload, output, помилка або None).
+    """
+    used = {}
+    for carrier, payload, output in tasks:
+        output = output or output_path_for(carrier, output_dir, root)
+        key = _same_file_key(output)
+        error = None
+        if key == _same_file_key(carrier):
+            error = "Вихідний файл збігається з вхідним"
+        elif key in used:
+            error = f"Вихідний файл уже використано для {used[key]}"
+        else:
+            used[key] = carrier
+        yield carrier, payload, output, error
+
+
+# --- Воркери ---
+
+# Налаштування поточного процесу (задаються один раз на воркер)
+_hide_options = {}
+
+
+def _init_worker(hide_options):
+    global _hide_options
+    _hide_options = hide_options
+
+
+def _hide_task(task):
+    """Одна задача приховування -> запис результату; винятки не виходять за межі задачі"""
+    carrier, payload, output, error = task
+    record = {"carrier": carrier, "status": "ok", "output": output}
+    try:
+        record["bytes"] = os.path.getsize(carrier)
+        if error is not None:
+            raise ValueError(error)
+        if payload is None:
+            raise ValueError("Не задано текст для приховування")
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        # mmap для BMP/PPM, потоковий режим для PNG; інші формати - звичайний Lr3
+        if Lr3_raw.is_raw_carrier(carrier):
+            saved = Lr3_raw.hide_message_raw(carrier, output, payload, verbose=False, **_hide_options)
+        else:
+            saved = Lr3_tiled.hide_message_tiled(carrier, output, payload, verbose=False, **_hide_options)
+        if not saved:
+            record["status"] = "error"
+            record["error"] = "Текст не вміщується в зображення"
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = f"{type(e).__name__}: {e}"
+    return record
+
+
+def _extract_task(task):
+    """Одна задача витягування -> запис результату (ok, not_found, corrupted або error)"""
+    carrier = task[0]
+    record = {"carrier": carrier, "status": "ok"}
+    try:
+        record["bytes"] = os.path.getsize(carrier)
+        if Lr3_raw.is_raw_carrier(carrier):
+            message = Lr3_raw.extract_message_raw(carrier, verbose=False)
+        else:
+            message = Lr3_tiled.extract_message_tiled(carrier, verbose=False)
+        if message == Lr3.NOT_FOUND_MESSAGE:
+            record["status"] = "not_found"
+        elif message == Lr3.CORRUPTED_MESSAGE:
+            record["status"] = "corrupted"
+        else:
+            record["message"] = message
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = f"{type(e).__name__}: {e}"
+    return record
+
+
+# --- Пакетна обробка ---
+
+def process_tasks(tasks, command, workers=None, chunksize=4, output_dir=".", hide_options=None, root=None):
+    """
+    Обробляє задачі в пулі процесів, зберігаючи порядок.
+
+    Args:
+        tasks (iterable): Кортежі (carrier, payload, output) - див. read_tasks.
+        command (str): 'hide' або 'extract'.
+        workers (int): Кількість процесів (None - за кількістю ядер, 0 - без пулу).
+        chunksize (int): Скільки файлів передавати воркеру за раз.
+        output_dir (str): Каталог для результатів hide, якщо output не задано.
+        hide_options (dict): Додаткові параметри hide (legacy, bits_per_channel).
+        root (str): Каталог із контейнерами - шляхи результатів зберігаються відносно нього.
+
+    Yields:
+        dict: Результат для кожного файлу у порядку задач.
+    """
+    task_function = _hide_task if command == "hide" else _extract_task
+    if command == "hide":
+        # Вихідні шляхи призначаються тут, у головному процесі, де видно всі попередні задачі
+        tasks = plan_outputs(tasks, output_dir, root)
+    initargs = (hide_options or {},)
+    if workers == 0:
+        _init_worker(*initargs)
+        for task in tasks:
+            yield task_function(task)
+        return
+
+    with Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+        # imap не вичитує весь вхід наперед: тисячі файлів не тримаються в пам'яті
+        yield from pool.imap(task_function, tasks, chunksize)
+
+
+def write_results(results, stream):
+    """
+    Записує результати по одному JSON-об'єкту на рядок.
+
+    Returns:
+        dict: Кількість файлів за статусами та сумарний розмір контейнерів у байтах.
+    """
+    summary = {"files": 0, "bytes": 0}
+    for record in results:
+        summary["files"] += 1
+        summary["bytes"] += record.get("bytes", 0)
+        summary[record["status"]] = summary.get(record["status"], 0) + 1
+        stream.write(json.dumps(record, ensure_ascii=False))
+        stream.write("\n")
+    return summary
+
+
+def _is_within(path, directory):
+    path, directory = _same_file_key(path), _same_file_key(directory)
+    return os.path.commonpath([path, directory]) == directory
+
+
+def run_batch(command, source, report_path="-", output_dir=".", workers=None, chunksize=4, text=None,
+              hide_options=None):
+    """
+    Повний цикл: задачі -> обробка в пулі -> потоковий запис звіту.
+
+    Returns:
+        dict: Підсумок write_results, доповнений часом і швидкістю (зображень/сек, МБ/сек).
+    """
+    start = time.perf_counter()
+    root = source if os.path.isdir(source) else None
+    if command == "hide":
+        # Результати всередині каталогу з контейнерами перезаписали б їх (BMP/PPM змінюються
+        # через mmap на місці) або потрапили б в обхід каталогу як нові контейнери
+        if root is not None and _is_within(output_dir, root):
+            raise ValueError("Каталог результатів не може бути каталогом із контейнерами або всередині нього")
+        os.makedirs(output_dir, exist_ok=True)
+    results = process_tasks(read_tasks(source, text), command, workers, chunksize, output_dir, hide_options, root)
+
+    if report_path == "-":
+        summary = write_results(results, sys.stdout)
+    else:
+        with open(report_path, "w", encoding="utf-8") as out:
+            summary = write_results(results, out)
+
+    elapsed = time.perf_counter() - start
+    summary["seconds"] = elapsed
+    summary["images_per_sec"] = summary["files"] / elapsed if elapsed > 0 else 0.0
+    summary["mb_per_sec"] = summary["bytes"] / (1024 * 1024) / elapsed if elapsed > 0 else 0.0
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Пакетна LSB-стеганографія (каталог або маніфест -> JSONL)")
+    parser.add_argument("command", choices=["hide", "extract"])
+    parser.add_argument("source", help="Каталог із зображеннями або маніфест CSV/JSONL (carrier,payload[,output])")
+    parser.add_argument("-o", "--report", default="-", help="Файл результатів JSONL ('-' - stdout)")
+    parser.add_argument("-d", "--output-dir", default="stego", help="Каталог для зображень hide")
+    parser.add_argument("-t", "--text", default=None, help="Текст для всіх файлів каталогу (інакше <ім'я>.txt)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Кількість процесів (0 - без пулу)")
+    parser.add_argument("-c", "--chunksize", type=int, default=4, help="Скільки файлів передавати воркеру за раз")
+    parser.add_argument("--bits", type=int, choices=range(1, Lr3.MAX_BITS_PER_CHANNEL + 1), default=None,
+                        help="Біт на канал (за замовчуванням - найменше, з яким текст уміщується)")
+    parser.add_argument("--legacy", action="store_true", help="Старий формат із маркером")
+    args = parser.parse_args()
+
+    options = {"legacy": args.legacy, "bits_per_channel": args.bits}
+    result = run_batch(args.command, args.source, args.report, args.output_dir, args.workers, args.chunksize,
+                       args.text, options)
+    statuses = ", ".join(f"{status}: {result[status]}" for status in ("ok", "not_found", "corrupted", "error")
+                         if status in result)
+    print(f"[+] Оброблено файлів: {result['files']} ({statuses}) за {result['seconds']:.2f} с, "
+          f"швидкість: {result['images_per_sec']:.1f} зображень/сек, {result['mb_per_sec']:.1f} МБ/сек",
+          file=sys.stderr)
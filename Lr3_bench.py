@@ -0,0 +1,318 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+import Lr3
+import Lr3_raw
+import Lr3_tiled
+
+try:
+    import Lr7
+except ImportError:  # cryptography не встановлено - StegoModule пропускається
+    Lr7 = None
+
+# Бенчмарк стеганографії: Lr3 (звичайний, потоковий, mmap) та Lr7.StegoModule
+# на синтетичних контейнерах від 100x100 до 8000x6000 і даних від кількох байтів
+# до повної ємності. Кожен замір виконується в окремому процесі, тож пік RSS
+# належить саме цій операції. Результати пишуться в JSON для порівняння ревізій.
+
+SIZES = ((100, 100), (640, 480), (1920, 1080), (4000, 3000), (8000, 6000))
+# Фіксовані розміри даних; до них завжди додається повна ємність контейнера
+PAYLOAD_SIZES = (16, 1024, 65536)
+BACKENDS = ("lr3", "tiled", "raw", "lr7", "lr7_tiled", "reference")
+# Посимвольний еталон повільний - лише для невеликих контейнерів
+REFERENCE_MAX_PIXELS = 1000000
+
+
+# --- Еталон: початкова попіксельна реалізація Lr3 (формат із маркером) ---
+
+def reference_hide(image_path, output_path, secret_text, delimiter="#####"):
+    img = Image.open(image_path).convert("RGB")
+    width, height = img.size
+    binary_msg = ''.join(format(byte, '08b') for byte in (secret_text + delimiter).encode('utf-8'))
+    data_len = len(binary_msg)
+    if data_len > width * height * 3:
+        return False
+    pixels = img.load()
+    data_index = 0
+    for y in range(height):
+        for x in range(width):
+            if data_index >= data_len:
+                break
+            r, g, b = pixels[x, y]
+            if data_index < data_len:
+                r = (r & ~1) | int(binary_msg[data_index])
+                data_index += 1
+            if data_index < data_len:
+                g = (g & ~1) | int(binary_msg[data_index])
+                data_index += 1
+            if data_index < data_len:
+                b = (b & ~1) | int(binary_msg[data_index])
+                data_index += 1
+            pixels[x, y] = (r, g, b)
+        if data_index >= data_len:
+            break
+    img.save(output_path, "PNG")
+    return True
+
+
+def reference_extract(image_path, delimiter="#####"):
+    img = Image.open(image_path).convert("RGB")
+    width, height = img.size
+    pixels = img.load()
+    bits = []
+    for y in range(height):
+        for x in range(width):
+            r, g, b = pixels[x, y]
+            bits.append(str(r & 1))
+            bits.append(str(g & 1))
+            bits.append(str(b & 1))
+    binary_data = ''.join(bits)
+    decoded_msg = ""
+    for i in range(0, len(binary_data), 8):
+        decoded_msg += chr(int(binary_data[i:i + 8], 2))
+        if decoded_msg.endswith(delimiter):
+            return decoded_msg[:-len(delimiter)]
+    return Lr3.NOT_FOUND_MESSAGE
+
+
+# --- Синтетичні дані ---
+
+def make_carrier(width, height, path, seed=0):
+    """Шумове зображення (найгірший випадок для стиснення PNG); формат - за розширенням"""
+    rng = np.random.default_rng(seed)
+    Image.fromarray(rng.integers(0, 256, (height, width, 3), dtype=np.uint8)).save(path)
+    return path
+
+
+def make_payload(size, seed=0):
+    """size ASCII-літер: у UTF-8 це рівно size байтів і в тексті немає маркера '#'"""
+    rng = np.random.default_rng(seed)
+    return rng.integers(ord('a'), ord('z') + 1, size, dtype=np.uint8).tobytes().decode('ascii')
+
+
+def payload_sizes(width, height, sizes=PAYLOAD_SIZES):
+    """Розміри даних для контейнера: фіксовані, що вміщуються, і повна ємність"""
+    capacity = Lr3.payload_capacity(width, height)
+    return [size for size in sizes if size < capacity] + [capacity]
+
+
+# --- Один замір (виконується в окремому процесі) ---
+
+def _peak_rss_mb():
+    # ru_maxrss після fork+exec успадковує пік батьківського процесу, тому в Linux
+    # беремо VmHWM - пік саме цього процесу; обидва значення в кілобайтах
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _hide(backend, carrier, output, text):
+    if backend == "lr3":
+        return Lr3.hide_message(carrier, output, text, verbose=False)
+    if backend == "tiled":
+        return Lr3_tiled.hide_message_tiled(carrier, output, text, verbose=False)
+    if backend == "raw":
+        return Lr3_raw.hide_message_raw(carrier, output, text, verbose=False)
+    if backend in ("lr7", "lr7_tiled"):
+        return Lr7.StegoModule(tiled=backend == "lr7_tiled").hide(carrier, output, text.encode('ascii')) > 0
+    return reference_hide(carrier, output, text)
+
+
+def _extract(backend, carrier):
+    if backend == "lr3":
+        return Lr3.extract_message(carrier, verbose=False)
+    if backend == "tiled":
+        return Lr3_tiled.extract_message_tiled(carrier, verbose=False)
+    if backend == "raw":
+        return Lr3_raw.extract_message_raw(carrier, verbose=False)
+    if backend in ("lr7", "lr7_tiled"):
+        return Lr7.StegoModule(tiled=backend == "lr7_tiled").extract(carrier).decode('latin-1')
+    return reference_extract(carrier)
+
+
+def run_case(case):
+    """
+    Виконує одну операцію (hide або extract) і вимірює її.
+
+    Args:
+        case (dict): backend, op, carrier, output, payload_size, seed.
+
+    Returns:
+        dict: case, доповнений seconds, rss_before_mb, peak_rss_mb, bytes_written, ok.
+    """
+    text = make_payload(case["payload_size"], case["seed"])
+    result = dict(case)
+    result["rss_before_mb"] = _peak_rss_mb()
+    start = time.perf_counter()
+    if case["op"] == "hide":
+        ok = bool(_hide(case["backend"], case["carrier"], case["output"], text))
+        elapsed = time.perf_counter() - start
+        result["bytes_written"] = os.path.getsize(case["output"]) if ok else 0
+    else:
+        # Перевірка туди-й-назад: витягнуте має збігатися з прихованим
+        ok = _extract(case["backend"], case["carrier"]) == text
+        elapsed = time.perf_counter() - start
+        result["bytes_written"] = 0
+    result["seconds"] = elapsed
+    result["peak_rss_mb"] = _peak_rss_mb()
+    result["ok"] = ok
+    return result
+
+
+def run_isolated(case):
+    """run_case у чистому процесі інтерпретатора (пік RSS не залежить від попередніх замірів)"""
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), "--case", json.dumps(case)],
+                            capture_output=True, text=True)
+    if output.returncode != 0:
+        result = dict(case, ok=False)
+        result["error"] = output.stderr.strip().splitlines()[-1] if output.stderr.strip() else "?"
+        return result
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+# --- Перевірка сумісності з еталоном ---
+
+def check_reference(carrier, workdir, size, seed=0):
+    """
+    Порівнює Lr3 (старий формат) з еталоном: пікселі після hide однакові,
+    а кожна реалізація читає дані, сховані іншою.
+
+    Returns:
+        bool: Чи всі перевірки пройдено.
+    """
+    text = make_payload(size, seed)
+    reference_path = os.path.join(workdir, "check_reference.png")
+    lr3_path = os.path.join(workdir, "check_lr3.png")
+    if not reference_hide(carrier, reference_path, text):
+        return True  # дані зі старим маркером не вміщуються - порівнювати нічого
+    Lr3.hide_message(carrier, lr3_path, text, legacy=True, verbose=False)
+    same_pixels = np.array_equal(np.asarray(Image.open(reference_path)), np.asarray(Image.open(lr3_path)))
+    try:
+        return (same_pixels
+                and Lr3.extract_message(reference_path, verbose=False) == text
+                and reference_extract(lr3_path) == text)
+    finally:
+        os.remove(reference_path)
+        os.remove(lr3_path)
+
+
+# --- Повний прогін ---
+
+def _revision():
+    try:
+        output = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+    except OSError:
+        return None
+    return output.stdout.strip() or None
+
+
+def bench_stego(sizes=SIZES, backends=BACKENDS, workdir=None, reference_max_pixels=REFERENCE_MAX_PIXELS,
+                payloads=PAYLOAD_SIZES):
+    """
+    Прогін усіх комбінацій контейнер x дані x бекенд (hide, потім extract).
+
+    Returns:
+        dict: Опис середовища та список результатів run_case і перевірок еталона.
+    """
+    if Lr7 is None and any(backend.startswith("lr7") for backend in backends):
+        print("[!] cryptography не встановлено, Lr7.StegoModule не перевірявся")
+        backends = [backend for backend in backends if not backend.startswith("lr7")]
+
+    own_workdir = workdir is None
+    workdir = workdir or tempfile.mkdtemp(prefix="lr3_bench_")
+    os.makedirs(workdir, exist_ok=True)
+    report = {"revision": _revision(), "python": platform.python_version(), "machine": platform.machine(),
+              "results": [], "reference_checks": []}
+
+    print(f"{'Бекенд':<10} {'Операція':<8} {'Розмір':>10} {'Дані (байт)':>12} {'Час (с)':>9} "
+          f"{'Пік RSS (МБ)':>13} {'Записано (байт)':>16} {'OK':>4}")
+    print("-" * 89)
+    try:
+        for width, height in sizes:
+            pixels = width * height
+            png = make_carrier(width, height, os.path.join(workdir, f"carrier_{width}x{height}.png"))
+            bmp = make_carrier(width, height, os.path.join(workdir, f"carrier_{width}x{height}.bmp"))
+            for size in payload_sizes(width, height, payloads):
+                if "reference" in backends and pixels <= reference_max_pixels:
+                    passed = check_reference(png, workdir, max(0, size - len(Lr3.LEGACY_DELIMITER)))
+                    report["reference_checks"].append({"width": width, "height": height,
+                                                       "payload_size": size, "ok": passed})
+                    if not passed:
+                        print(f"[!] Результат не збігається з еталоном: {width}x{height}, {size} байт")
+                for backend in backends:
+                    case_size = size
+                    if backend == "reference":
+                        if pixels > reference_max_pixels:
+                            continue
+                        # Маркер займає 5 байтів ємності
+                        case_size = max(0, size - len(Lr3.LEGACY_DELIMITER))
+                    carrier = bmp if backend == "raw" else png
+                    output = os.path.join(workdir, f"stego_{backend}{os.path.splitext(carrier)[1]}")
+                    case = {"backend": backend, "width": width, "height": height, "payload_size": case_size,
+                            "seed": 0, "carrier": carrier, "output": output}
+                    for op in ("hide", "extract"):
+                        step = dict(case, op=op)
+                        if op == "extract":
+                            step["carrier"] = output
+                        result = run_isolated(step)
+                        report["results"].append(result)
+                        print(f"{backend:<10} {op:<8} {f'{width}x{height}':>10} {size:>12} "
+                              f"{result.get('seconds', float('nan')):>9.3f} "
+                              f"{result.get('peak_rss_mb', float('nan')):>13.1f} "
+                              f"{result.get('bytes_written', 0):>16} {'так' if result['ok'] else 'ні':>4}")
+                    if os.path.exists(output):
+                        os.remove(output)
+            os.remove(png)
+            os.remove(bmp)
+    finally:
+        if own_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return report
+
+
+def _parse_size(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарки стеганографії Lr3 та Lr7")
+    parser.add_argument("-o", "--output", default="lr3_bench.json", help="Файл результатів JSON")
+    parser.add_argument("--sizes", nargs="+", type=_parse_size, default=list(SIZES),
+                        help="Розміри контейнерів, напр. 100x100 1920x1080")
+    parser.add_argument("--payloads", nargs="+", type=int, default=list(PAYLOAD_SIZES),
+                        help="Розміри даних у байтах (повна ємність додається завжди)")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--reference-max-pixels", type=int, default=REFERENCE_MAX_PIXELS,
+                        help="Найбільший контейнер (у пікселях) для посимвольного еталона")
+    parser.add_argument("--workdir", default=None, help="Каталог для тимчасових зображень")
+    parser.add_argument("--case", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        # Дочірній процес run_isolated: один замір, результат - останнім рядком
+        print(json.dumps(run_case(json.loads(args.case))))
+        sys.exit(0)
+
+    results = bench_stego(args.sizes, args.backends, args.workdir, args.reference_max_pixels, args.payloads)
+    with open(args.output, "w", encoding="utf-8") as out:
+        json.dump(results, out, ensure_ascii=False, indent=2)
+    failed = sum(not item["ok"] for item in results["results"] + results["reference_checks"])
+    print(f"[+] Замірів: {len(results['results'])}, помилок: {failed}, результати: {args.output}")
@@ -0,0 +1,301 @@
+import argparse
+import mmap
+import os
+import shutil
+import struct
+import time
+
+import numpy as np
+
+import Lr3
+
+# Швидкий шлях для нестиснених контейнерів: BMP (24/32 біт, BI_RGB), PPM (P6, 8 біт)
+# та "сирі" RGB-файли. Файл відображається в пам'ять (mmap), а пікселі - це
+# масив NumPy поверх відображення, без декодування PIL і без повторного збереження.
+# Приховування змінює молодші біти прямо у файлі, витягування читає лише
+# сторінки з потрібними пікселями.
+#
+# Порядок бітів той самий, що в Lr3 (рядки згори донизу, канали R, G, B),
+# тож результат читається і звичайним Lr3.extract_message.
+
+_BMP_FILE_HEADER = struct.Struct("<2sIHHI")
+_BMP_INFO_HEADER = struct.Struct("<IiiHHI")
+
+# Скільки рядків обробляти за раз при пошуку маркера старого формату
+BAND_ROWS = 256
+
+
+def _parse_bmp(buffer):
+    """Returns: (ширина, висота, зсув пікселів, байтів на піксель, крок рядка, згори донизу)"""
+    _, _, _, _, offset = _BMP_FILE_HEADER.unpack_from(buffer, 0)
+    _, width, height, _, bit_count, compression = _BMP_INFO_HEADER.unpack_from(buffer, _BMP_FILE_HEADER.size)
+    if bit_count not in (24, 32) or compression != 0:
+        raise ValueError("Підтримуються лише нестиснені BMP 24/32 біт")
+    bpp = bit_count // 8
+    # Рядки BMP вирівняні на 4 байти; додатна висота - рядки знизу догори
+    stride = (width * bpp + 3) // 4 * 4
+    return width, abs(height), offset, bpp, stride, height < 0
+
+
+def _ppm_token(buffer, pos):
+    """Наступне число заголовка PPM (з пропуском пробілів і коментарів #)"""
+    while True:
+        while buffer[pos:pos + 1].isspace():
+            pos += 1
+        if buffer[pos:pos + 1] != b"#":
+            break
+        pos = buffer.find(b"\n", pos) + 1
+    end = pos
+    while buffer[end:end + 1].isdigit():
+        end += 1
+    if end == pos:
+        raise ValueError("Пошкоджений заголовок PPM")
+    return int(buffer[pos:end]), end
+
+
+def _parse_ppm(buffer):
+    width, pos = _ppm_token(buffer, 2)
+    height, pos = _ppm_token(buffer, pos)
+    maxval, pos = _ppm_token(buffer, pos)
+    if maxval != 255:
+        raise ValueError("Підтримуються лише PPM з 8 бітами на канал")
+    # Після maxval - рівно один пробільний символ, далі пікселі
+    return width, height, pos + 1
+
+
+class RawCarrier:
+    """
+    Нестиснене зображення, відображене в пам'ять.
+
+    pixels - масив (висота, ширина, 3) з каналами R, G, B у порядку рядків
+    згори донизу; це представлення (view) файлу, тож запис у нього змінює файл.
+
+    Args:
+        path (str): BMP, PPM (P6) або сирий RGB-файл.
+        writable (bool): Відкрити для запису.
+        shape (tuple): (ширина, висота) для сирого RGB без заголовка.
+    """
+
+    def __init__(self, path, writable=False, shape=None):
+        self._file = open(path, "r+b" if writable else "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError("Порожній файл") from None
+        try:
+            self.pixels = self._pixel_view(shape)
+        except (ValueError, TypeError, struct.error) as e:
+            self.close()
+            raise ValueError(f"Непідтримуваний контейнер: {e}") from None
+
+    def _pixel_view(self, shape):
+        buffer = self._map
+        if shape is not None:
+            width, height = shape
+            if width <= 0 or height <= 0 or len(buffer) != width * height * 3:
+                raise ValueError(f"розмір файлу не відповідає сирому RGB {width}x{height}")
+            self.width, self.height = width, height
+            return np.ndarray((height, width, 3), np.uint8, buffer)
+
+        magic = buffer[:2]
+        if magic == b"BM":
+            width, height, offset, bpp, stride, top_down = _parse_bmp(buffer)
+            self.width, self.height = width, height
+            rows = np.ndarray((height, width, bpp), np.uint8, buffer, offset, (stride, bpp, 1))
+            if not top_down:
+                rows = rows[::-1]
+            # BMP зберігає канали як B, G, R (X); зріз 2::-1 дає R, G, B без копіювання
+            return rows[:, :, 2::-1]
+        if magic == b"P6":
+            width, height, offset = _parse_ppm(buffer)
+            self.width, self.height = width, height
+            return np.ndarray((height, width, 3), np.uint8, buffer, offset)
+        raise ValueError("Підтримуються лише BMP, PPM (P6) та сирий RGB")
+
+    def _band(self, first_pixel, end_pixel):
+        """Рядки з пікселями first_pixel..end_pixel та номер першого пікселя смуги"""
+        row0 = first_pixel // self.width
+        return self.pixels[row0:-(-end_pixel // self.width)], row0 * self.width
+
+    def read_prefix(self, size):
+        """Перші size байтів з молодших бітів; читаються лише рядки, що їх містять"""
+        band, _ = self._band(0, Lr3.segment_pixels(size))
+        return np.packbits(band.reshape(-1)[:size * 8] & 1).tobytes()
+
+    def read_payload(self, start, size, bits_per_channel, channels):
+        """Щільний сегмент (див. Lr3.parse_container)"""
+        if channels > 3:
+            raise ValueError("У контейнері немає альфа-каналу")
+        band, first_pixel = self._band(start, start + Lr3.segment_pixels(size, bits_per_channel, channels))
+        return Lr3.read_segment(band.reshape(-1, 3), first_pixel, start, size, bits_per_channel, channels)
+
+    def read_container(self):
+        """Контейнер нового формату (див. Lr3.parse_container)"""
+        return Lr3.parse_container(self.read_prefix, self.width, self.height, self.read_payload)
+
+    def embed(self, segments):
+        """Записує сегменти даних (див. Lr3.make_segment) на місці; змінюються лише рядки з даними"""
+        if any(channels > 3 for _, _, _, channels in segments):
+            raise ValueError("У контейнері немає альфа-каналу")
+        end = max(map(Lr3.segment_end, segments), default=0)
+        if end > self.width * self.height:
+            raise ValueError("Дані не вміщуються в зображення")
+        band, _ = self._band(0, end)
+        # Для BMP зріз не суцільний і reshape дає копію - після запису повертаємо її у файл
+        pixels = band.reshape(-1, 3)
+        for segment in segments:
+            Lr3.write_segment(pixels, 0, segment)
+        band[...] = pixels.reshape(band.shape)
+
+    def find(self, delimiter):
+        """Дані до першого маркера (старий формат) або None; читання зупиняється на маркері"""
+        collector = Lr3.BitCollector()
+        searched = 0
+        for start in range(0, self.height, BAND_ROWS):
+            collector.add(self.pixels[start:start + BAND_ROWS].reshape(-1) & 1)
+            if start + BAND_ROWS >= self.height:
+                collector.finish()
+            end_index = collector.data.find(delimiter, max(0, searched - len(delimiter) + 1))
+            if end_index != -1:
+                return bytes(collector.data[:end_index])
+            searched = len(collector.data)
+        return None
+
+    def flush(self):
+        self._map.flush()
+
+    def close(self):
+        # Представлення NumPy тримає буфер відображення - звільняємо його першим
+        self.pixels = None
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def is_raw_carrier(image_path, shape=None):
+    """Чи підтримує файл прямий доступ через mmap (BMP/PPM із заголовком або сирий RGB розміру shape)"""
+    try:
+        RawCarrier(image_path, shape=shape).close()
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+# --- Аналоги hide_message / extract_message з Lr3 ---
+
+def hide_message_raw(image_path, output_path, secret_text, legacy=False, bits_per_channel=None, verbose=True,
+                     shape=None):
+    """
+    hide_message для нестиснених контейнерів: вихідний файл - байтова копія
+    вхідного (того ж формату), у якій змінюються лише молодші біти.
+    Якщо output_path збігається з image_path, файл змінюється на місці.
+    bits_per_channel, verbose і результат - як у Lr3.hide_message (альфа-каналу в цих форматах немає).
+    shape - (ширина, висота) для сирого RGB без заголовка; такий файл не передається в Lr3.
+    """
+    if bits_per_channel is not None:
+        Lr3.check_bits_per_channel(bits_per_channel)
+    log = Lr3.get_log(verbose)
+    if shape is None and not is_raw_carrier(image_path):
+        log("[*] Формат не підтримує прямий доступ, використовується Lr3.hide_message")
+        return Lr3.hide_message(image_path, output_path, secret_text, legacy, bits_per_channel, verbose=verbose)
+
+    log(f"[*] Починаємо приховування тексту в {image_path} (mmap)...")
+    with RawCarrier(image_path, shape=shape) as carrier:
+        width, height = carrier.width, carrier.height
+    if legacy:
+        data = (secret_text + Lr3.LEGACY_DELIMITER).encode('utf-8')
+        fits = len(data) * 8 <= width * height * 3
+        segments = [Lr3.make_segment(0, data)]
+    else:
+        payload = secret_text.encode('utf-8')
+        if bits_per_channel is None:
+            try:
+                bits_per_channel = Lr3.plan_bits_per_channel(width, height, len(payload))
+            except ValueError:
+                bits_per_channel = Lr3.MAX_BITS_PER_CHANNEL
+        fits = len(payload) <= Lr3.payload_capacity(width, height, bits_per_channel)
+        segments = Lr3.container_segments(payload, Lr3.FLAG_TEXT, bits_per_channel)
+    if not fits:
+        log("[!] Помилка: Текст занадто великий для цієї картинки! Потрібно більше пікселів.")
+        return False
+
+    if os.path.abspath(image_path) != os.path.abspath(output_path):
+        shutil.copyfile(image_path, output_path)
+    with RawCarrier(output_path, writable=True, shape=shape) as carrier:
+        carrier.embed(segments)
+        carrier.flush()
+    log(f"[+] Успішно збережено в файл: {output_path}")
+    return True
+
+
+def extract_message_raw(image_path, verbose=True, shape=None):
+    """
+    extract_message для нестиснених контейнерів: читаються лише сторінки із заголовком і даними.
+    shape - (ширина, висота) для сирого RGB без заголовка.
+    """
+    if shape is None and not is_raw_carrier(image_path):
+        return Lr3.extract_message(image_path, verbose)
+
+    log = Lr3.get_log(verbose)
+    log(f"[*] Спроба витягнути повідомлення з {image_path} (mmap)...")
+    error = None
+    with RawCarrier(image_path, shape=shape) as carrier:
+        try:
+            container = carrier.read_container()
+        except ValueError as e:
+            container, error = None, e
+        if container is not None:
+            log("[+] Повідомлення знайдено!")
+            return Lr3.decode_payload(*container)
+
+        payload = carrier.find(Lr3.LEGACY_DELIMITER.encode('latin-1'))
+    if payload is not None:
+        log("[+] Повідомлення знайдено!")
+        return payload.decode('latin-1')
+
+    if error is not None:
+        log(f"[!] {error}")
+        return Lr3.CORRUPTED_MESSAGE
+    return Lr3.NOT_FOUND_MESSAGE
+
+
+def parse_shape(value):
+    """'ШИРИНАxВИСОТА' -> (ширина, висота) для --shape"""
+    try:
+        width, height = (int(part) for part in value.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"очікується ШИРИНАxВИСОТА, отримано {value!r}") from None
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError("ширина і висота мають бути додатними")
+    return width, height
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LSB-стеганографія в BMP/PPM через mmap")
+    parser.add_argument("--shape", type=parse_shape, default=None,
+                        help="ШИРИНАxВИСОТА для сирого RGB-файлу без заголовка (напр. 640x480)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    hide_parser = subparsers.add_parser("hide", help="Сховати текст")
+    hide_parser.add_argument("image")
+    hide_parser.add_argument("output", help="Може збігатися з image - тоді зміна на місці")
+    hide_parser.add_argument("text")
+    hide_parser.add_argument("--bits", type=int, choices=range(1, Lr3.MAX_BITS_PER_CHANNEL + 1), default=None,
+                             help="Біт на канал (за замовчуванням - найменше, з яким текст уміщується)")
+
+    extract_parser = subparsers.add_parser("extract", help="Витягнути текст")
+    extract_parser.add_argument("image")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == "hide":
+        hide_message_raw(args.image, args.output, args.text, bits_per_channel=args.bits, shape=args.shape)
+    else:
+        print(f">> {extract_message_raw(args.image, shape=args.shape)}")
+    print(f"[*] Час: {time.perf_counter() - start:.3f} с")
@@ -0,0 +1,432 @@
+import argparse
+import struct
+import time
+import zlib
+
+import numpy as np
+
+import Lr3
+
+# Потоковий (порядковий) режим LSB для дуже великих PNG.
+#
+# Файл читається як потік рядків: IDAT розпаковується частинами, і розфільтровуються
+# лише рядки, в яких лежать біти повідомлення (плюс один наступний, фільтр якого
+# залежить від попереднього рядка). Решта рядків копіюється у вихідний файл
+# у відфільтрованому вигляді без декодування пікселів.
+# У пам'яті одночасно кілька рядків, тож пам'ять не залежить від розміру зображення.
+#
+# Обмеження: при приховуванні весь потік IDAT розпаковується і стискається заново,
+# навіть рядки без даних. IDAT - один потік deflate з посиланнями на попередні 32 КБ
+# даних, тож незмінену частину не можна скопіювати стисненою після змінених рядків.
+# Час hide пропорційний розміру всього зображення (рівень --level впливає найбільше),
+# а не довжині повідомлення; витягування читає лише потрібні рядки.
+#
+# Підтримуються PNG 8 біт на канал, RGB та RGBA, без черезрядковості (Adam7).
+# Для RGBA альфа-канал зберігається, біти пишуться в R, G, B - як і в Lr3.
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_CHUNK_HEAD = struct.Struct(">I4s")
+_IHDR = struct.Struct(">IIBBBBB")
+
+# Байтів на піксель для підтримуваних типів кольору
+_COLOR_BPP = {2: 3, 6: 4}
+
+# Скільки стиснених/розпакованих байтів обробляти за раз
+READ_SIZE = 1 << 16
+MAX_INFLATE = 1 << 20
+IDAT_SIZE = 1 << 16
+
+
+# --- Фільтри PNG ---
+
+def unfilter_row(filter_type, data, prev, bpp):
+    """Відновлює рядок пікселів за відфільтрованим рядком і попереднім відновленим"""
+    if filter_type == 0:
+        return data
+    if filter_type == 1:
+        # Sub: накопичувальна сума по кожному каналу (uint8 переповнюється по модулю 256)
+        return np.cumsum(np.frombuffer(data, dtype=np.uint8).reshape(-1, bpp), axis=0, dtype=np.uint8).tobytes()
+    if filter_type == 2:
+        return (np.frombuffer(data, dtype=np.uint8) + np.frombuffer(prev, dtype=np.uint8)).tobytes()
+
+    # Average і Paeth залежать від щойно відновленого лівого байта - лише послідовно
+    row = bytearray(data)
+    if filter_type == 3:
+        for i in range(len(row)):
+            left = row[i - bpp] if i >= bpp else 0
+            row[i] = (row[i] + ((left + prev[i]) >> 1)) & 0xFF
+    elif filter_type == 4:
+        for i in range(len(row)):
+            if i >= bpp:
+                a, c = row[i - bpp], prev[i - bpp]
+            else:
+                a = c = 0
+            b = prev[i]
+            p = a + b - c
+            pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+            row[i] = (row[i] + (a if pa <= pb and pa <= pc else b if pb <= pc else c)) & 0xFF
+    else:
+        raise ValueError(f"Невідомий тип фільтра PNG: {filter_type}")
+    return bytes(row)
+
+
+def filter_row(filter_type, raw, prev, bpp):
+    """Фільтрує рядок заданим типом фільтра (усі типи векторизовані: прогноз з вихідних пікселів)"""
+    if filter_type == 0:
+        return raw
+    x = np.frombuffer(raw, dtype=np.uint8).astype(np.int16)
+    b = np.frombuffer(prev, dtype=np.uint8).astype(np.int16)
+    a = np.zeros_like(x)
+    a[bpp:] = x[:-bpp]
+    if filter_type == 1:
+        predicted = a
+    elif filter_type == 2:
+        predicted = b
+    elif filter_type == 3:
+        predicted = (a + b) >> 1
+    elif filter_type == 4:
+        c = np.zeros_like(b)
+        c[bpp:] = b[:-bpp]
+        p = a + b - c
+        pa, pb, pc = np.abs(p - a), np.abs(p - b), np.abs(p - c)
+        predicted = np.where((pa <= pb) & (pa <= pc), a, np.where(pb <= pc, b, c))
+    else:
+        raise ValueError(f"Невідомий тип фільтра PNG: {filter_type}")
+    return ((x - predicted) & 0xFF).astype(np.uint8).tobytes()
+
+
+# --- Потокове читання та запис PNG ---
+
+class PngRowReader:
+    """
+    Читає PNG рядок за рядком.
+    head_chunks - службові блоки до IDAT, tail_chunks - після IDAT (заповнюється після читання всіх рядків).
+    """
+
+    def __init__(self, f):
+        self._f = f
+        if f.read(8) != PNG_SIGNATURE:
+            raise ValueError("Це не PNG-файл")
+        self.head_chunks = []
+        self.tail_chunks = []
+        while True:
+            length, chunk_type = _CHUNK_HEAD.unpack(f.read(8))
+            if chunk_type == b"IDAT":
+                self._idat_left = length
+                break
+            if chunk_type == b"IEND":
+                raise ValueError("PNG без даних зображення")
+            self.head_chunks.append((chunk_type, f.read(length)))
+            f.read(4)  # CRC
+
+        if not self.head_chunks or self.head_chunks[0][0] != b"IHDR":
+            raise ValueError("PNG без заголовка IHDR")
+        (self.width, self.height, bit_depth, color_type,
+         _, _, interlace) = _IHDR.unpack(self.head_chunks[0][1])
+        if bit_depth != 8 or color_type not in _COLOR_BPP or interlace:
+            raise ValueError("Потоковий режим підтримує лише PNG 8 біт RGB/RGBA без черезрядковості")
+        self.bpp = _COLOR_BPP[color_type]
+        self.row_size = self.width * self.bpp
+
+    def _idat_pieces(self):
+        """Стиснені дані всіх IDAT поспіль; після них читаються блоки до IEND"""
+        f = self._f
+        while True:
+            while self._idat_left:
+                piece = f.read(min(self._idat_left, READ_SIZE))
+                if not piece:
+                    raise ValueError("PNG обрізано")
+                self._idat_left -= len(piece)
+                yield piece
+            f.read(4)  # CRC
+            length, chunk_type = _CHUNK_HEAD.unpack(f.read(8))
+            if chunk_type != b"IDAT":
+                break
+            self._idat_left = length
+        while True:
+            self.tail_chunks.append((chunk_type, f.read(length)))
+            f.read(4)
+            if chunk_type == b"IEND":
+                return
+            length, chunk_type = _CHUNK_HEAD.unpack(f.read(8))
+
+    def filtered_rows(self):
+        """Yields: (тип фільтра, відфільтрований рядок) без відновлення пікселів"""
+        inflater = zlib.decompressobj()
+        stride = 1 + self.row_size
+        buffer = bytearray()
+        emitted = 0
+        for piece in self._idat_pieces():
+            data = inflater.decompress(piece, MAX_INFLATE)
+            while True:
+                buffer += data
+                pos = 0
+                while len(buffer) - pos >= stride and emitted < self.height:
+                    yield buffer[pos], bytes(buffer[pos + 1:pos + stride])
+                    pos += stride
+                    emitted += 1
+                del buffer[:pos]
+                if not inflater.unconsumed_tail:
+                    break
+                data = inflater.decompress(inflater.unconsumed_tail, MAX_INFLATE)
+        if emitted < self.height:
+            raise ValueError("PNG обрізано")
+
+    def raw_rows(self):
+        """Yields: рядки пікселів (bytes) - кожен відновлюється з попереднього"""
+        prev = bytes(self.row_size)
+        for filter_type, data in self.filtered_rows():
+            prev = unfilter_row(filter_type, data, prev, self.bpp)
+            yield prev
+
+
+class PngRowWriter:
+    """Пише PNG рядок за рядком, стискаючи відфільтровані рядки одним потоком zlib"""
+
+    def __init__(self, f, head_chunks, level=6):
+        self._f = f
+        self._deflater = zlib.compressobj(level)
+        self._pending = bytearray()
+        f.write(PNG_SIGNATURE)
+        for chunk_type, data in head_chunks:
+            self._write_chunk(chunk_type, data)
+
+    def _write_chunk(self, chunk_type, data):
+        self._f.write(_CHUNK_HEAD.pack(len(data), chunk_type))
+        self._f.write(data)
+        self._f.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(chunk_type))))
+
+    def write_row(self, filter_type, data):
+        self._pending += self._deflater.compress(bytes([filter_type]))
+        self._pending += self._deflater.compress(data)
+        if len(self._pending) >= IDAT_SIZE:
+            self._write_chunk(b"IDAT", bytes(self._pending))
+            self._pending.clear()
+
+    def close(self, tail_chunks):
+        self._pending += self._deflater.flush()
+        self._write_chunk(b"IDAT", bytes(self._pending))
+        for chunk_type, data in tail_chunks:
+            self._write_chunk(chunk_type, data)
+
+
+# --- Молодші біти по рядках ---
+
+class LsbStream:
+    """
+    Читає молодші біти PNG потоком: розпаковуються лише рядки до останнього
+    потрібного байта, після чого читання файлу припиняється.
+    """
+
+    def __init__(self, path):
+        self._f = open(path, "rb")
+        self._reader = PngRowReader(self._f)
+        self._rows = self._reader.raw_rows()
+        self._bits = Lr3.BitCollector()
+        # Прочитані рядки (для щільних сегментів); пошук маркера їх не зберігає
+        self._kept_rows = []
+        self.width, self.height = self._reader.width, self._reader.height
+        self.bpp = self._reader.bpp
+
+    def _next_row(self, keep=True):
+        row = next(self._rows, None)
+        if row is None:
+            return False
+        pixels = np.frombuffer(row, dtype=np.uint8).reshape(self.width, self.bpp)
+        if keep:
+            self._kept_rows.append(pixels)
+        self._bits.add(pixels[:, :3].reshape(-1) & 1)
+        return True
+
+    def read(self, size):
+        """Перші size байтів з молодших бітів"""
+        while len(self._bits.data) < size and self._next_row():
+            pass
+        return bytes(self._bits.data[:size])
+
+    def read_payload(self, start, size, bits_per_channel, channels):
+        """Щільний сегмент (див. Lr3.parse_container): читаються рядки до його кінця"""
+        if channels > self.bpp:
+            raise ValueError("У зображенні немає альфа-каналу")
+        end = start + Lr3.segment_pixels(size, bits_per_channel, channels)
+        while len(self._kept_rows) * self.width < end and self._next_row():
+            pass
+        row0 = start // self.width
+        pixels = np.concatenate(self._kept_rows[row0:])
+        return Lr3.read_segment(pixels, row0 * self.width, start, size, bits_per_channel, channels)
+
+    def read_container(self):
+        """Контейнер нового формату (див. Lr3.parse_container)"""
+        return Lr3.parse_container(self.read, self.width, self.height, self.read_payload)
+
+    def find(self, delimiter):
+        """Дані до першого маркера (старий формат) або None; читання зупиняється на маркері"""
+        self._kept_rows = []
+        searched = 0
+        while True:
+            more = self._next_row(keep=False)
+            if not more:
+                self._bits.finish()
+            end_index = self._bits.data.find(delimiter, max(0, searched - len(delimiter) + 1))
+            if end_index != -1:
+                return bytes(self._bits.data[:end_index])
+            if not more:
+                return None
+            searched = len(self._bits.data)
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def embed_stream(image_path, output_path, segments, level=6):
+    """
+    Записує сегменти даних (див. Lr3.make_segment) в молодші біти PNG потоком.
+    Розфільтровуються та фільтруються заново лише рядки з даними і один наступний,
+    але стискаються заново всі рядки (див. обмеження на початку модуля).
+
+    Raises:
+        ValueError: Формат не підтримується або дані не вміщуються.
+    """
+    with open(image_path, "rb") as src:
+        reader = PngRowReader(src)
+        width, bpp = reader.width, reader.bpp
+        if any(channels > bpp for _, _, _, channels in segments):
+            raise ValueError("У зображенні немає альфа-каналу")
+        end = max(map(Lr3.segment_end, segments), default=0)
+        if end > width * reader.height:
+            raise ValueError("Дані не вміщуються в зображення")
+        rows_with_data = -(-end // width)
+
+        with open(output_path, "wb") as dst:
+            writer = PngRowWriter(dst, reader.head_chunks, level)
+            prev_raw = prev_new = bytes(reader.row_size)
+            for y, (filter_type, data_row) in enumerate(reader.filtered_rows()):
+                if y > rows_with_data:
+                    # Рядок без даних, попередній не змінено - копіюємо як є
+                    writer.write_row(filter_type, data_row)
+                    continue
+                raw = unfilter_row(filter_type, data_row, prev_raw, bpp)
+                new = raw
+                if y < rows_with_data:
+                    pixels = np.frombuffer(raw, dtype=np.uint8).reshape(width, bpp).copy()
+                    for segment in segments:
+                        Lr3.write_segment(pixels, y * width, segment)
+                    new = pixels.tobytes()
+                # Фільтр залежить від попереднього рядка, тож наступний після даних теж фільтрується заново
+                writer.write_row(filter_type, filter_row(filter_type, new, prev_new, bpp))
+                prev_raw, prev_new = raw, new
+            writer.close(reader.tail_chunks)
+
+
+def stream_info(image_path):
+    """(ширина, висота, байтів на піксель) для PNG, які можна обробити потоково, інакше None"""
+    try:
+        with open(image_path, "rb") as f:
+            reader = PngRowReader(f)
+        return reader.width, reader.height, reader.bpp
+    except (ValueError, struct.error):
+        return None
+
+
+def is_streamable(image_path):
+    """Чи можна обробити файл потоково (PNG 8 біт RGB/RGBA без черезрядковості)"""
+    return stream_info(image_path) is not None
+
+
+# --- Аналоги hide_message / extract_message з Lr3 ---
+
+def hide_message_tiled(image_path, output_path, secret_text, legacy=False, level=6,
+                       bits_per_channel=None, use_alpha=False, verbose=True):
+    """
+    hide_message для великих PNG; інші формати обробляються звичайним Lr3.hide_message.
+    bits_per_channel, use_alpha, verbose і результат - як у Lr3.hide_message (альфа - лише для RGBA PNG).
+    """
+    if bits_per_channel is not None:
+        Lr3.check_bits_per_channel(bits_per_channel)
+    log = Lr3.get_log(verbose)
+    info = stream_info(image_path)
+    if info is None:
+        log("[*] Формат не підтримує потоковий режим, використовується Lr3.hide_message")
+        return Lr3.hide_message(image_path, output_path, secret_text, legacy, bits_per_channel, use_alpha, verbose)
+
+    log(f"[*] Починаємо потокове приховування тексту в {image_path}...")
+    width, height, _ = info
+    if legacy:
+        segments = [Lr3.make_segment(0, (secret_text + Lr3.LEGACY_DELIMITER).encode('utf-8'))]
+    else:
+        payload = secret_text.encode('utf-8')
+        if bits_per_channel is None:
+            try:
+                bits_per_channel = Lr3.plan_bits_per_channel(width, height, len(payload), use_alpha)
+            except ValueError as e:
+                log(f"[!] Помилка: {e}")
+                return False
+        segments = Lr3.container_segments(payload, Lr3.FLAG_TEXT, bits_per_channel, use_alpha)
+    try:
+        embed_stream(image_path, output_path, segments, level)
+    except ValueError as e:
+        log(f"[!] Помилка: {e}")
+        return False
+    log(f"[+] Успішно збережено в файл: {output_path}")
+    return True
+
+
+def extract_message_tiled(image_path, verbose=True):
+    """extract_message для великих PNG: читаються лише рядки із заголовком і даними"""
+    if not is_streamable(image_path):
+        return Lr3.extract_message(image_path, verbose)
+
+    log = Lr3.get_log(verbose)
+    log(f"[*] Спроба потоково витягнути повідомлення з {image_path}...")
+    error = None
+    with LsbStream(image_path) as stream:
+        try:
+            container = stream.read_container()
+        except ValueError as e:
+            container, error = None, e
+        if container is not None:
+            log("[+] Повідомлення знайдено!")
+            return Lr3.decode_payload(*container)
+
+        payload = stream.find(Lr3.LEGACY_DELIMITER.encode('latin-1'))
+    if payload is not None:
+        log("[+] Повідомлення знайдено!")
+        return payload.decode('latin-1')
+
+    if error is not None:
+        log(f"[!] {error}")
+        return Lr3.CORRUPTED_MESSAGE
+    return Lr3.NOT_FOUND_MESSAGE
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Потокова LSB-стеганографія для великих PNG")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    hide_parser = subparsers.add_parser("hide", help="Сховати текст")
+    hide_parser.add_argument("image")
+    hide_parser.add_argument("output")
+    hide_parser.add_argument("text")
+    hide_parser.add_argument("--level", type=int, default=6, help="Рівень стиснення zlib (1 - швидко, 9 - компактно); "
+                             "перестискається все зображення, тож час hide залежить від його розміру")
+    hide_parser.add_argument("--bits", type=int, choices=range(1, Lr3.MAX_BITS_PER_CHANNEL + 1), default=None,
+                             help="Біт на канал (за замовчуванням - найменше, з яким текст уміщується)")
+    hide_parser.add_argument("--alpha", action="store_true", help="Писати дані й в альфа-канал (RGBA PNG)")
+
+    extract_parser = subparsers.add_parser("extract", help="Витягнути текст")
+    extract_parser.add_argument("image")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == "hide":
+        hide_message_tiled(args.image, args.output, args.text, level=args.level,
+                           bits_per_channel=args.bits, use_alpha=args.alpha)
+    else:
+        print(f">> {extract_message_tiled(args.image)}")
+    print(f"[*] Час: {time.perf_counter() - start:.3f} с")
@@ -1,66 +1,238 @@
 import hashlib
+import mmap
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+
+from Lr4_keygen import DEFAULT_EXPONENT, DEFAULT_KEY_BITS, generate_rsa_primes
 
 # --- Блок допоміжних функцій ---
 
+def hash_to_int(data):
+    """SHA-256 від байтів як ціле число: напряму з digest, без шістнадцяткового рядка"""
+    return int.from_bytes(hashlib.sha256(data).digest(), 'big')
+
 def get_hash(text):
     """
     Рахує SHA-256 хеш від тексту.
     Повертає ціле число (int), щоб можна було робити математику.
     """
     data_bytes = text.encode('utf-8')
-    sha_signature = hashlib.sha256(data_bytes).hexdigest()
-    # Перетворюємо шістнадцятковий рядок у величезне число
-    return int(sha_signature, 16)
+    # Перетворюємо байти хешу у величезне число
+    return hash_to_int(data_bytes)
+
+# --- Хешування файлів і потоків ---
+
+# Розмір фрагмента для потокового хешування: пам'ять не залежить від розміру файлу
+HASH_CHUNK_SIZE = 1 << 20
+# Розмір листка дерева хешів (tree=True)
+TREE_LEAF_SIZE = 1 << 26
+_TREE_PREFIX = b"SHA256-TREE\x00"
+
+
+def hash_stream(stream, chunk_size=HASH_CHUNK_SIZE):
+    """
+    SHA-256 від вмісту бінарного потоку як ціле число (як get_hash для тих самих байтів).
+    Читання в один і той самий буфер фіксованого розміру.
+    """
+    sha = hashlib.sha256()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    while True:
+        read = stream.readinto(buffer)
+        if not read:
+            break
+        sha.update(view[:read])
+    return int.from_bytes(sha.digest(), 'big')
+
+
+def tree_hash_file(path, leaf_size=TREE_LEAF_SIZE, workers=None):
+    """
+    Дерево хешів для дуже великих файлів: листки по leaf_size байтів хешуються
+    паралельно в пулі потоків (hashlib звільняє GIL) над mmap-представленням файлу,
+    корінь - SHA-256 від префікса, розміру листка і хешів листків.
+
+    Це інша функція, ніж SHA-256 усього файлу: підпис, створений з tree=True,
+    перевіряється лише з tree=True і тим самим leaf_size.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        root = hashlib.sha256(_TREE_PREFIX + leaf_size.to_bytes(8, 'big'))
+        if size == 0:
+            root.update(hashlib.sha256(b"").digest())
+            return int.from_bytes(root.digest(), 'big')
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                def leaf(offset):
+                    digest = hashlib.sha256(view[offset:offset + leaf_size]).digest()
+                    # Прочитані сторінки листка більше не потрібні - не тримаємо їх у RSS процесу
+                    if hasattr(mmap, "MADV_DONTNEED") and leaf_size % mmap.PAGESIZE == 0:
+                        mapped.madvise(mmap.MADV_DONTNEED, offset, min(leaf_size, size - offset))
+                    return digest
+
+                with ThreadPoolExecutor(workers) as pool:
+                    for digest in pool.map(leaf, range(0, size, leaf_size)):
+                        root.update(digest)
+            finally:
+                # Представлення тримає відображення - звільняємо його до закриття mmap
+                view.release()
+    return int.from_bytes(root.digest(), 'big')
+
+
+def get_file_hash(source, tree=False, workers=None):
+    """
+    Хеш файлу (шлях) або бінарного потоку з постійним використанням пам'яті.
+    Без tree - той самий SHA-256, що й get_hash для тих самих байтів.
+    """
+    if tree:
+        if not isinstance(source, (str, bytes, os.PathLike)):
+            raise ValueError("Дерево хешів потребує шляху до файлу, а не потоку")
+        return tree_hash_file(source, workers=workers)
+    if isinstance(source, (str, bytes, os.PathLike)):
+        with open(source, 'rb') as f:
+            return hash_stream(f)
+    return hash_stream(source)
 
 def simplified_hash_reduction(hash_int, modulus):
     """
     Оскільки в навчальних цілях ми використовуємо невеликі прості числа,
     справжній SHA-256 занадто великий. Ми беремо залишок від ділення
     хешу на наш модуль N. Це "стискає" хеш для демонстрації.
+    Для ключів справжнього розміру (2048+ біт) хеш менший за N і не змінюється.
     """
     return hash_int % modulus
 
+# --- Приватний ключ у формі CRT ---
+
+# Крім d зберігаються p, q та передобчислені компоненти китайської теореми
+# про залишки: dp = d mod (p-1), dq = d mod (q-1), qinv = q^-1 mod p.
+# Підпис рахується двома піднесеннями до степеня за модулями p і q (вдвічі
+# коротші числа) замість одного за модулем n - це в 3-4 рази швидше.
+PrivateKey = namedtuple("PrivateKey", ["n", "e", "d", "p", "q", "dp", "dq", "qinv"])
+
+
+def make_private_key(p, q, e=DEFAULT_EXPONENT):
+    """Приватний ключ з простих p, q і публічної експоненти e"""
+    d = pow(e, -1, (p - 1) * (q - 1))
+    return PrivateKey(p * q, e, d, p, q, d % (p - 1), d % (q - 1), pow(q, -1, p))
+
+
+def rsa_sign_plain(private_key, message):
+    """S = message^d mod n одним піднесенням до степеня (без CRT)"""
+    return pow(message, private_key.d, private_key.n)
+
+
+def rsa_sign(private_key, message, check=True):
+    """
+    S = message^d mod n через CRT (формула Гарнера).
+
+    check=True - перевірка S^e mod n == message перед поверненням: збій
+    обчислення в одній з половин CRT дав би підпис, з якого розкладається n.
+
+    Raises:
+        ValueError: Підпис не пройшов перевірку.
+    """
+    key = private_key
+    s_p = pow(message % key.p, key.dp, key.p)
+    s_q = pow(message % key.q, key.dq, key.q)
+    signature = s_q + (key.qinv * (s_p - s_q) % key.p) * key.q
+    # e мале (65537), тож перевірка коштує лише ~17 множень
+    if check and pow(signature, key.e, key.n) != message % key.n:
+        raise ValueError("Збій обчислення підпису: перевірка CRT не пройдена")
+    return signature
+
+# --- Пакетна перевірка підписів ---
+
+# Скільки пар (документ, підпис) брати з вхідного потоку за раз
+VERIFY_CHUNK_SIZE = 1024
+
+
+def _verify_pair(public_key, pair):
+    """1, якщо підпис дійсний для документа (str - як у get_hash, або байти), інакше 0"""
+    document, signature = pair
+    e, n = public_key
+    if isinstance(document, str):
+        data = document.encode('utf-8')
+    elif isinstance(document, (bytes, bytearray, memoryview)):
+        data = document
+    else:
+        # None, число тощо - не документ: недійсна пара, а не виняток на всю пачку
+        return 0
+    if not isinstance(signature, int) or not 0 <= signature < n:
+        return 0
+    return int(pow(signature, e, n) == simplified_hash_reduction(hash_to_int(data), n))
+
+
+def verify_batch(pairs, public_key, workers=None, chunksize=VERIFY_CHUNK_SIZE):
+    """
+    Тиха перевірка багатьох підписів одним публічним ключем.
+
+    Хешування йде в пулі потоків: hashlib звільняє GIL на великих буферах.
+    Пари читаються порціями по chunksize, тож вхід може бути генератором
+    будь-якої довжини.
+
+    Args:
+        pairs (iterable): Пари (документ, підпис); документ - str або байти.
+        public_key (tuple): (e, n).
+        workers (int): Кількість потоків (None - за замовчуванням ThreadPoolExecutor, 0 - без пулу).
+        chunksize (int): Розмір порції.
+
+    Returns:
+        bytearray: 1 (дійсний) або 0 для кожної пари у вхідному порядку.
+    """
+    check = partial(_verify_pair, public_key)
+    pairs = iter(pairs)
+    results = bytearray()
+    if workers == 0:
+        results.extend(map(check, pairs))
+        return results
+
+    with ThreadPoolExecutor(workers) as pool:
+        while True:
+            chunk = list(islice(pairs, chunksize))
+            if not chunk:
+                break
+            results.extend(pool.map(check, chunk))
+    return results
+
 # --- Основні функції ЕЦП ---
 
 class DigitalSignatureSystem:
-    def __init__(self, name, birthdate):
+    def __init__(self, name, birthdate, bits=DEFAULT_KEY_BITS, workers=None, pool=None):
         print(f"[*] Ініціалізація системи для користувача: {name}")
-        self.generate_keys(name, birthdate)
+        self.generate_keys(name, birthdate, bits, workers, pool)
 
-    def generate_keys(self, name, date):
+    def generate_keys(self, name, date, bits=DEFAULT_KEY_BITS, workers=None, pool=None):
         """
         Генерація пари ключів.
-        В реальності тут використовуються величезні прості числа.
-        Для лабораторної взяті фіксовані невеликі прості числа P і Q,
-        але seed залежить від даних студента.
+        P і Q - випадкові прості числа по bits/2 біт (Міллер-Рабін з просіюванням,
+        див. Lr4_keygen); пошук кандидатів іде паралельно в пулі процесів
+        (workers: None - за кількістю ядер, 0 - без пулу; pool - готовий пул).
+        Ім'я та дата зберігаються як власник ключа: виводити ключ з них не можна,
+        бо тоді приватний ключ відтворив би кожен, хто знає ці дані.
         """
-        # 1. Вибираємо два простих числа (в реальності вони випадкові і великі)
-        p = 61
-        q = 53
-        
-        # 2. Рахуємо модуль n = p * q
-        self.n = p * q  # 3233
-        
-        # 3. Функція Ейлера phi = (p-1)*(q-1)
-        phi = (p - 1) * (q - 1) # 3120
+        # 1. Вибираємо два великих випадкових простих числа
+        p, q = generate_rsa_primes(bits, DEFAULT_EXPONENT, workers, pool)
         
-        # 4. Вибираємо публічну експоненту e. 
-        # Вона має бути взаємно простою з phi. Зазвичай беруть 17 або 65537.
-        self.e = 17 
-        
-        # 5. Рахуємо приватну експоненту d.
-        # Це число таке, що (d * e) % phi == 1.
-        # Для e=17 і phi=3120, d буде 2753.
-        # Формула: d = pow(e, -1, phi) - в Python 3.8+
-        self.d = pow(self.e, -1, phi)
+        # 2. Модуль n = p * q і публічна експонента e.
+        # e має бути взаємно простою з phi = (p-1)*(q-1) (це гарантує пошук простих).
+        # 3. Приватна експонента d: (d * e) % phi == 1, d = pow(e, -1, phi),
+        # та компоненти CRT для швидкого підпису (див. make_private_key)
+        private_key = make_private_key(p, q, DEFAULT_EXPONENT)
+        self.n, self.e, self.d = private_key.n, private_key.e, private_key.d
         
         # Ключі готові
+        self.owner = (name, date)
         self.public_key = (self.e, self.n)
-        self.__private_key = (self.d, self.n) # Приватний атрибут
+        self.__private_key = private_key # Приватний атрибут
         
-        print(f"[+] Ключі згенеровано на основі даних: {name} + {date}")
-        print(f"    Публічний ключ (e, n): {self.public_key}")
-        print(f"    Приватний ключ (d, n): {self.__private_key}")
+        print(f"[+] Ключі {self.n.bit_length()} біт згенеровано для: {name} + {date}")
+        print(f"    Публічний ключ (e, n): ({self.e}, {hex(self.n)[:18]}...)")
+        # Приватний ключ не виводиться - лише його розмір
+        print(f"    Приватний ключ (d, n): d має {self.d.bit_length()} біт")
 
     def sign_document(self, document_content):
         """
@@ -71,16 +243,27 @@ class DigitalSignatureSystem:
         print(f"\n--- Підписання документу: '{document_content}' ---")
         
         # Крок 1: Хеш
-        raw_hash = get_hash(document_content)
+        return self._sign_hash(get_hash(document_content))
+
+    def sign_file(self, source, tree=False, workers=None):
+        """
+        Підписання файлу (шлях) або бінарного потоку без завантаження в пам'ять
+        (див. get_file_hash). Для тих самих байтів підпис збігається з sign_document.
+        tree=True - дерево хешів з паралельним хешуванням листків (для дуже великих файлів).
+        """
+        print(f"\n--- Підписання файлу: '{source}' ---")
+        return self._sign_hash(get_file_hash(source, tree, workers))
+
+    def _sign_hash(self, raw_hash):
         # Стискаємо хеш під наш маленький модуль N
         short_hash = simplified_hash_reduction(raw_hash, self.n)
         
         print(f"1. Повний хеш (SHA256): {raw_hash}...")
-        print(f"2. Скорочений хеш (mod {self.n}): {short_hash}")
+        print(f"2. Скорочений хеш (mod n, {self.n.bit_length()} біт): {short_hash}")
         
         # Крок 2: Шифрування (Математика RSA)
-        # pow(base, exp, mod) працює дуже швидко
-        signature = pow(short_hash, self.__private_key[0], self.__private_key[1])
+        # Через CRT з перевіркою результату (див. rsa_sign)
+        signature = rsa_sign(self.__private_key, short_hash)
         
         print(f"3. Цифровий підпис (Hash^d mod n): {signature}")
         return signature
@@ -94,11 +277,18 @@ class DigitalSignatureSystem:
         """
         print(f"\n--- Перевірка підпису для: '{document_content}' ---")
         
+        # Крок 1: Хеш того, що прийшло
+        return self._verify_hash(get_hash(document_content), signature, public_key)
+
+    def verify_file(self, source, signature, public_key, tree=False, workers=None):
+        """Перевірка підпису файлу або потоку (tree - як при підписанні, див. sign_file)"""
+        print(f"\n--- Перевірка підпису для файлу: '{source}' ---")
+        return self._verify_hash(get_file_hash(source, tree, workers), signature, public_key)
+
+    def _verify_hash(self, current_hash_raw, signature, public_key):
         # Розпаковка ключа
         e, n = public_key
         
-        # Крок 1: Хеш того, що прийшло
-        current_hash_raw = get_hash(document_content)
         current_hash_short = simplified_hash_reduction(current_hash_raw, n)
         
         # Крок 2: Розшифровка підпису математично
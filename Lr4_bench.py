@@ -0,0 +1,118 @@
+import argparse
+import contextlib
+import io
+import secrets
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import Lr4
+import Lr4_keygen
+
+# Бенчмарки Lr4: час генерації ключів RSA для кожного розміру,
+# послідовно та з пошуком кандидатів у пулі процесів, і швидкість підпису
+# через CRT порівняно з піднесенням до степеня за модулем n, і пакетна перевірка.
+
+KEY_SIZES = (2048, 3072, 4096)
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def bench_keygen(sizes=KEY_SIZES, keys=5, workers=None):
+    """
+    Час генерації keys ключів кожного розміру.
+
+    Пул створюється один раз на розмір і використовується для всіх ключів -
+    так, як при масовій генерації ключів для багатьох користувачів.
+    """
+    print(f"{'Біт':>6} {'Режим':<16} {'Мін. (с)':>9} {'Медіана (с)':>12} {'Макс. (с)':>10} {'Ключів/с':>9}")
+    print("-" * 67)
+    pool_size = Lr4_keygen._pool_size(workers)
+    for bits in sizes:
+        modes = [("послідовно", None)]
+        if pool_size:
+            modes.append((f"пул ({pool_size} пр.)", ProcessPoolExecutor(pool_size)))
+        for title, pool in modes:
+            times = []
+            try:
+                for _ in range(keys):
+                    (p, q), elapsed = _timed(Lr4_keygen.generate_rsa_primes, bits, Lr4_keygen.DEFAULT_EXPONENT,
+                                             0 if pool is None else None, pool)
+                    assert (p * q).bit_length() == bits, f"Неправильний розмір ключа: {bits}"
+                    times.append(elapsed)
+            finally:
+                if pool is not None:
+                    pool.shutdown(cancel_futures=True)
+            print(f"{bits:>6} {title:<16} {min(times):>9.3f} {statistics.median(times):>12.3f} "
+                  f"{max(times):>10.3f} {len(times) / sum(times):>9.2f}")
+
+
+def bench_signing(sizes=KEY_SIZES, signatures=200):
+    """Підписи за секунду: CRT (з перевіркою і без) проти pow(m, d, n); результати мають збігатися"""
+    print(f"\n{'Біт':>6} {'Режим':<20} {'Час (с)':>9} {'Підписів/с':>11} {'Прискорення':>12}")
+    print("-" * 62)
+    for bits in sizes:
+        key = Lr4.make_private_key(*Lr4_keygen.generate_rsa_primes(bits, workers=0))
+        messages = [secrets.randbelow(key.n) for _ in range(signatures)]
+        plain, plain_time = _timed(lambda: [Lr4.rsa_sign_plain(key, m) for m in messages])
+        cases = [
+            ("без CRT", plain, plain_time),
+            ("CRT + перевірка", *_timed(lambda: [Lr4.rsa_sign(key, m) for m in messages])),
+            ("CRT без перевірки", *_timed(lambda: [Lr4.rsa_sign(key, m, check=False) for m in messages])),
+        ]
+        for title, result, elapsed in cases:
+            assert result == plain, f"Підписи відрізняються: {title}"
+            print(f"{bits:>6} {title:<20} {elapsed:>9.3f} {signatures / elapsed:>11.1f} "
+                  f"{plain_time / elapsed:>11.1f}x")
+
+
+def bench_verify(documents=2000, document_kb=64, bits=2048, workers=None):
+    """Перевірка documents підписів: verify_signature по одному проти verify_batch (без пулу і з потоками)"""
+    key = Lr4.make_private_key(*Lr4_keygen.generate_rsa_primes(bits, workers=0))
+    public_key = (key.e, key.n)
+    # Текстові документи: verify_signature приймає лише рядки
+    docs = [secrets.token_hex(document_kb * 512) for _ in range(documents)]
+    pairs = [(doc, Lr4.rsa_sign(key, Lr4.get_hash(doc) % key.n)) for doc in docs]
+    # Один зіпсований підпис - результати мають його помітити
+    pairs[0] = (pairs[0][0], pairs[0][1] ^ 1)
+    expected = bytearray([0]) + bytearray([1]) * (documents - 1)
+    # Перевірка не використовує приватних даних системи - ключі не генеруються
+    system = Lr4.DigitalSignatureSystem.__new__(Lr4.DigitalSignatureSystem)
+
+    def one_by_one():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return bytearray(system.verify_signature(doc, signature, public_key) for doc, signature in pairs)
+
+    reference, reference_time = _timed(one_by_one)
+    assert reference == expected, "verify_signature дає інший результат"
+    print(f"\n[*] Документів: {documents} по {document_kb} КБ, ключ {bits} біт")
+    print(f"{'Режим':<28} {'Час (с)':>9} {'Підписів/с':>11} {'Прискорення':>12}")
+    print("-" * 63)
+    print(f"{'verify_signature':<28} {reference_time:>9.3f} {documents / reference_time:>11.1f} {1:>11.1f}x")
+    for title, pool_workers in (("verify_batch (без пулу)", 0), ("verify_batch (потоки)", workers)):
+        result, elapsed = _timed(Lr4.verify_batch, pairs, public_key, pool_workers)
+        assert result == expected, f"Результати відрізняються: {title}"
+        print(f"{title:<28} {elapsed:>9.3f} {documents / elapsed:>11.1f} {reference_time / elapsed:>11.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарки генерації ключів Lr4")
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(KEY_SIZES), help="Розміри ключів (біт)")
+    parser.add_argument("--keys", type=int, default=5, help="Скільки ключів кожного розміру генерувати")
+    parser.add_argument("--workers", type=int, default=None, help="Процеси для пошуку простих і потоки перевірки (0 - без пулу)")
+    parser.add_argument("--sign", action="store_true", help="Також виміряти підпис CRT проти звичайного")
+    parser.add_argument("--signatures", type=int, default=200, help="Скільки підписів на розмір ключа")
+    parser.add_argument("--verify", action="store_true", help="Також виміряти пакетну перевірку підписів")
+    parser.add_argument("--documents", type=int, default=2000, help="Скільки документів перевіряти")
+    parser.add_argument("--document-kb", type=int, default=64, help="Розмір документа (КБ)")
+    args = parser.parse_args()
+
+    bench_keygen(args.sizes, args.keys, args.workers)
+    if args.sign:
+        bench_signing(args.sizes, args.signatures)
+    if args.verify:
+        bench_verify(args.documents, args.document_kb, workers=args.workers)
@@ -0,0 +1,208 @@
+import argparse
+import math
+import os
+import secrets
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+# Генерація ключів RSA реального розміру (2048/3072/4096 біт).
+# Прості числа шукаються у вікнах послідовних непарних кандидатів від випадкового
+# початку: спершу вікно просіюється малими простими (без ділення великих чисел),
+# і лише кандидати, що лишилися, перевіряються тестом Міллера-Рабіна.
+# Вікна незалежні, тож їх можна перевіряти паралельно в пулі процесів.
+
+DEFAULT_KEY_BITS = 2048
+DEFAULT_EXPONENT = 65537
+# Межа малих простих для просіювання: більша межа відсіює більше кандидатів,
+# але просіювання кожного вікна стає довшим
+SIEVE_LIMIT = 50000
+# Скільки непарних кандидатів в одному вікні (у середньому простих ~ 2.9 * розмір / біти)
+WINDOW_FACTOR = 4
+
+
+def _small_primes(limit):
+    """Решето Ератосфена: прості числа від 3 до limit"""
+    sieve = bytearray([1]) * (limit + 1)
+    sieve[0:2] = b"\x00\x00"
+    for number in range(2, math.isqrt(limit) + 1):
+        if sieve[number]:
+            sieve[number * number::number] = bytes(len(range(number * number, limit + 1, number)))
+    return [number for number in range(3, limit + 1) if sieve[number]]
+
+
+SMALL_PRIMES = _small_primes(SIEVE_LIMIT)
+
+
+def miller_rabin_rounds(bits):
+    """Кількість раундів для випадкового кандидата (FIPS 186-4, табл. C.3: помилка < 2^-100)"""
+    if bits >= 1536:
+        return 4
+    if bits >= 1024:
+        return 5
+    if bits >= 512:
+        return 7
+    return 40
+
+
+def is_probable_prime(n, rounds=None):
+    """
+    Тест Міллера-Рабіна з випадковими основами.
+
+    Args:
+        n (int): Число для перевірки.
+        rounds (int): Кількість раундів (None - за miller_rabin_rounds).
+
+    Returns:
+        bool: False - n точно складене; True - n просте з імовірністю помилки < 4^-rounds.
+    """
+    if n < 2:
+        return False
+    for prime in [2] + SMALL_PRIMES[:100]:
+        if n % prime == 0:
+            return n == prime
+    if rounds is None:
+        rounds = miller_rabin_rounds(n.bit_length())
+
+    # n - 1 = d * 2^s, d непарне
+    d = n - 1
+    s = (d & -d).bit_length() - 1
+    d >>= s
+    for _ in range(rounds):
+        x = pow(secrets.randbelow(n - 3) + 2, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = pow(x, 2, n)
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def sieve_window(start, size, exponent=DEFAULT_EXPONENT):
+    """
+    Просіює вікно кандидатів start, start + 2, ..., start + 2 * (size - 1) (start непарне).
+
+    Відкидаються кратні малим простим та числа p з p - 1, кратним простій
+    експоненті e (тоді d = e^-1 не існує).
+
+    Returns:
+        bytearray: 1 - кандидат лишився, 0 - відсіяний.
+    """
+    sieve = bytearray([1]) * size
+    for prime in SMALL_PRIMES:
+        # Перший індекс i, для якого start + 2i ділиться на prime: i = -start / 2 (mod prime)
+        first = (-start * ((prime + 1) // 2)) % prime
+        sieve[first::prime] = bytes(len(range(first, size, prime)))
+    if exponent > SIEVE_LIMIT and is_probable_prime(exponent):
+        first = ((1 - start) * ((exponent + 1) // 2)) % exponent
+        sieve[first::exponent] = bytes(len(range(first, size, exponent)))
+    return sieve
+
+
+def search_window(bits, exponent=DEFAULT_EXPONENT, window=None):
+    """
+    Одне вікно пошуку від випадкового bits-бітного початку.
+
+    Старші два біти встановлені, тож добуток двох таких простих має рівно 2 * bits біт.
+
+    Returns:
+        int: Перше просте p у вікні з НСД(e, p - 1) = 1 або None.
+    """
+    window = window or WINDOW_FACTOR * bits
+    start = secrets.randbits(bits) | (0b11 << (bits - 2)) | 1
+    rounds = miller_rabin_rounds(bits)
+    for index, survived in enumerate(sieve_window(start, window, exponent)):
+        if not survived:
+            continue
+        candidate = start + 2 * index
+        if candidate.bit_length() != bits:
+            return None
+        if math.gcd(exponent, candidate - 1) == 1 and is_probable_prime(candidate, rounds):
+            return candidate
+    return None
+
+
+def _pool_size(workers):
+    """None - за кількістю ядер; на одному ядрі пул лише додає накладні витрати (0 - без пулу)"""
+    if workers is None:
+        cpus = os.cpu_count() or 1
+        return cpus if cpus > 1 else 0
+    return workers
+
+
+def generate_primes(bits, count=2, exponent=DEFAULT_EXPONENT, workers=None, pool=None):
+    """
+    Знаходить count різних bits-бітних простих чисел для ключа RSA.
+
+    Args:
+        bits (int): Розмір кожного простого.
+        count (int): Скільки простих потрібно.
+        exponent (int): Публічна експонента e (НСД(e, p - 1) = 1).
+        workers (int): Кількість процесів (None - за кількістю ядер, 0 - без пулу).
+        pool (Executor): Готовий пул процесів (напр. для генерації багатьох ключів поспіль).
+
+    Returns:
+        list: count простих чисел.
+    """
+    primes = []
+    size = _pool_size(workers)
+    if pool is None and size == 0:
+        while len(primes) < count:
+            prime = search_window(bits, exponent)
+            if prime is not None and prime not in primes:
+                primes.append(prime)
+        return primes
+
+    own_pool = pool is None
+    pool = pool or ProcessPoolExecutor(size)
+    # У роботі завжди по вікну на процес: щойно вікно перевірено, на його місце стає нове,
+    # тож зайвої роботи після знаходження простих - не більше одного вікна на процес
+    in_flight = {pool.submit(search_window, bits, exponent) for _ in range(max(size, 1))}
+    try:
+        while len(primes) < count:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                prime = future.result()
+                if prime is not None and prime not in primes and len(primes) < count:
+                    primes.append(prime)
+                in_flight.add(pool.submit(search_window, bits, exponent))
+    finally:
+        for future in in_flight:
+            future.cancel()
+        if own_pool:
+            pool.shutdown(wait=False, cancel_futures=True)
+    return primes
+
+
+def generate_rsa_primes(key_bits=DEFAULT_KEY_BITS, exponent=DEFAULT_EXPONENT, workers=None, pool=None):
+    """
+    Пара простих (p, q) для ключа RSA розміром key_bits.
+
+    |p - q| > 2^(key_bits / 2 - 100) (FIPS 186-4), інакше n легко розкласти методом Ферма.
+
+    Returns:
+        tuple: (p, q), p > q.
+    """
+    # Прості з кожної половини мають бути більшими за малі прості решета
+    if key_bits < 64 or key_bits % 2:
+        raise ValueError("Розмір ключа має бути парним і не меншим за 64 біти")
+    half = key_bits // 2
+    min_distance = 1 << max(0, half - 100)
+    while True:
+        p, q = sorted(generate_primes(half, 2, exponent, workers, pool), reverse=True)
+        if p - q > min_distance:
+            return p, q
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Генерація простих чисел для ключа RSA")
+    parser.add_argument("--bits", type=int, default=DEFAULT_KEY_BITS, help="Розмір ключа (біт)")
+    parser.add_argument("--workers", type=int, default=None, help="Кількість процесів (0 - без пулу)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    p, q = generate_rsa_primes(args.bits, workers=args.workers)
+    print(f"[+] p ({p.bit_length()} біт), q ({q.bit_length()} біт), n = p * q: {(p * q).bit_length()} біт "
+          f"за {time.perf_counter() - start:.3f} с")
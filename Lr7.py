@@ -5,6 +5,9 @@ import base64
 from cryptography.fernet import Fernet
 from PIL import Image
 
+import Lr3
+import Lr3_tiled
+
 # --- МОДУЛЬ АНАЛІТИКИ ---
 class SecurityAnalytics:
     def __init__(self):
@@ -49,87 +52,58 @@ class CryptoModule:
 
 # --- МОДУЛЬ СТЕГАНОГРАФІЇ (LSB) ---
 class StegoModule:
-    def __init__(self, delimiter="#####"):
-        self.delimiter = delimiter
+    """
+    LSB-стеганографія на спільній реалізації з Lr3: контейнер із заголовком
+    (довжина, CRC32) замість делімітера. Делімітер використовується лише
+    для читання зображень старого формату.
 
-    def _to_bin(self, data_bytes):
-        # Перетворюємо байти в рядок бітів
-        binary_str = ""
-        # data_bytes може бути як bytes так і str, приводимо до спільного знаменника
-        if isinstance(data_bytes, str):
-            data_bytes = data_bytes.encode()
-        
-        for byte in data_bytes:
-            binary_str += format(byte, '08b')
-        return binary_str
+    tiled=True - потоковий режим Lr3_tiled для великих PNG (пам'ять не
+    залежить від розміру зображення); інші формати обробляються звичайно.
+    """
+
+    def __init__(self, delimiter="#####", tiled=False):
+        self.delimiter = delimiter
+        self.tiled = tiled
 
     def hide(self, image_path, output_path, data_bytes):
+        # Заголовок з довжиною даних, щоб знати де кінець
+        segments = Lr3.container_segments(data_bytes)
+        if self.tiled and Lr3_tiled.is_streamable(image_path):
+            Lr3_tiled.embed_stream(image_path, output_path, segments)
+            return os.path.getsize(output_path)
+
         img = Image.open(image_path).convert('RGB')
-        # Додаємо делімітер до даних, щоб знати де кінець
-        full_data = data_bytes + self.delimiter.encode()
-        binary_data = self._to_bin(full_data)
-        
-        data_len = len(binary_data)
-        pixels = img.load()
         width, height = img.size
-        
-        idx = 0
-        for y in range(height):
-            for x in range(width):
-                if idx >= data_len: break
-                r, g, b = pixels[x, y]
-                
-                # Записуємо біти у канали R, G, B
-                if idx < data_len:
-                    r = (r & ~1) | int(binary_data[idx])
-                    idx += 1
-                if idx < data_len:
-                    g = (g & ~1) | int(binary_data[idx])
-                    idx += 1
-                if idx < data_len:
-                    b = (b & ~1) | int(binary_data[idx])
-                    idx += 1
-                
-                pixels[x, y] = (r, g, b)
-            if idx >= data_len: break
-            
+        if len(data_bytes) > Lr3.payload_capacity(width, height):
+            raise ValueError("Дані не вміщуються в зображення")
+
+        Lr3.embed_segments(img, segments)
         img.save(output_path, "PNG")
         return os.path.getsize(output_path)
 
     def extract(self, image_path):
-        img = Image.open(image_path).convert('RGB')
-        pixels = img.load()
-        width, height = img.size
-        
-        binary_data = ""
-        # Читаємо біти
-        for y in range(height):
-            for x in range(width):
-                r, g, b = pixels[x, y]
-                binary_data += str(r & 1)
-                binary_data += str(g & 1)
-                binary_data += str(b & 1)
-
-        # Конвертуємо біти в байти
-        all_bytes = bytearray()
-        for i in range(0, len(binary_data), 8):
-            byte_chunk = binary_data[i:i+8]
-            if len(byte_chunk) < 8: break
-            all_bytes.append(int(byte_chunk, 2))
-
-        # Шукаємо делімітер
+        if self.tiled and Lr3_tiled.is_streamable(image_path):
+            with Lr3_tiled.LsbStream(image_path) as stream:
+                try:
+                    container = stream.read_container()
+                except ValueError:
+                    container = None
+                if container is not None:
+                    return container[1]
+                payload = stream.find(self.delimiter.encode())
+            return payload if payload is not None else b""
+
+        img = Image.open(image_path)
         try:
-            # Перетворюємо в bytes для пошуку
-            extracted_raw = bytes(all_bytes)
-            delimiter_bytes = self.delimiter.encode()
-            
-            end_index = extracted_raw.find(delimiter_bytes)
-            if end_index != -1:
-                return extracted_raw[:end_index]
-            else:
-                return b"" # Не знайдено
-        except Exception:
-            return b""
+            container = Lr3.read_container(img)
+        except ValueError:
+            container = None
+        if container is not None:
+            return container[1]
+
+        # Старий формат: шукаємо делімітер
+        payload = Lr3.find_legacy_payload(img, self.delimiter.encode())
+        return payload if payload is not None else b""  # Не знайдено
 
 # --- ГОЛОВНА ЛОГІКА (Main) ---
 if __name__ == "__main__":
@@ -0,0 +1,18 @@
+import pytest
+
+import Lr1
+
+
+@pytest.mark.parametrize("password", ["Zx9!qwertyLong", "abc", "01011990"])
+def test_empty_birth_date_matches_nothing(password):
+    assert Lr1.PersonalDataMatcher("Ivan", "").scan(password.lower()) == set()
+
+
+def test_empty_birth_date_gives_no_date_advice():
+    _, recommendations = Lr1.analyze_password("Zx9!Kp2#Wm7$", "Ivan", "")
+    assert not any("народження" in advice for advice in recommendations)
+
+
+def test_overlapping_categories_are_all_found():
+    found = Lr1.PersonalDataMatcher("Ivan", "15.01.1990").scan("01990abcxyz!")
+    assert {"year", "day_month"} <= found
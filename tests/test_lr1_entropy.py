@@ -0,0 +1,20 @@
+import pytest
+
+import Lr1_entropy
+
+
+@pytest.mark.parametrize("year", ["1990", "1985", "2001", "2024"])
+def test_bare_year_is_scored_as_year(year):
+    assert Lr1_entropy._date_guesses(year) == Lr1_entropy._year_space(int(year))
+
+
+@pytest.mark.parametrize("password, year", [("1990", "1990"), ("2024", "2024"), ("zxcvbn1990", "1990")])
+def test_password_with_year_uses_year_match(password, year):
+    estimate = Lr1_entropy.estimate_strength(password)
+    guesses = max(Lr1_entropy._year_space(int(year)), Lr1_entropy.MIN_GUESSES_MULTI_CHAR)
+    assert Lr1_entropy.Match("date", year, guesses) in estimate.sequence
+
+
+def test_full_dates_keep_date_estimate():
+    assert Lr1_entropy._date_guesses("150190") == 365 * Lr1_entropy._year_space(1990)
+    assert Lr1_entropy._date_guesses("15.01.1990") == 4 * 365 * Lr1_entropy._year_space(1990)
@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+import Lr1_index
+
+
+@pytest.fixture
+def words():
+    rng = random.Random(0)
+    return ["".join(rng.choice("abcd1!їй") for _ in range(rng.randint(1, 7))) for _ in range(500)]
+
+
+def test_external_build_matches_brute_force(tmp_path, words):
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("\n".join(words + ["", "  ABCD  "]) + "\n", encoding="utf-8")
+    index_path = str(tmp_path / "breach.idx")
+    # Маленькі порції - злиття кількох відсортованих файлів
+    n_words, _ = Lr1_index.build_index(str(wordlist), index_path, min_length=3, run_size=37)
+
+    vocabulary = {word.lower() for word in words} | {"abcd"}
+    long_words = [word for word in vocabulary if len(word) >= 3]
+    rng = random.Random(1)
+    with Lr1_index.BreachIndex(index_path) as index:
+        assert len(index) == n_words == len(vocabulary)
+        for _ in range(2000):
+            query = "".join(rng.choice("abcd1!їйx") for _ in range(rng.randint(0, 12)))
+            assert (query in index) == (query in vocabulary)
+            assert index.has_substring(query) == any(word in query for word in long_words)
+
+
+def test_empty_wordlist(tmp_path):
+    wordlist = tmp_path / "empty.txt"
+    wordlist.write_text("", encoding="utf-8")
+    index_path = str(tmp_path / "empty.idx")
+    assert Lr1_index.build_index(str(wordlist), index_path) == (0, 1)
+    with Lr1_index.BreachIndex(index_path) as index:
+        assert "abc" not in index
+        assert not index.has_substring("abc")
@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+
+import Lr1_service
+
+
+async def _request(raw):
+    service = Lr1_service.PasswordService()
+    server = await asyncio.start_server(
+        lambda reader, writer: Lr1_service.handle_connection(service, reader, writer), "127.0.0.1", 0)
+    async with server:
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        writer.write(raw)
+        response = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+    return response
+
+
+@pytest.mark.parametrize("value", [b"abc", b"-5", b"+3", b"1_0", b"\xb2"])
+def test_invalid_content_length_is_bad_request(value):
+    response = asyncio.run(_request(b"POST /analyze HTTP/1.1\r\nContent-Length: " + value + b"\r\n\r\n"))
+    assert response.startswith(b"HTTP/1.1 400 Bad Request")
+
+
+def test_valid_request():
+    body = b'{"password": "Qwerty!2024"}'
+    response = asyncio.run(_request(b"POST /analyze HTTP/1.1\r\nConnection: close\r\nContent-Length: "
+                                    + str(len(body)).encode() + b"\r\n\r\n" + body))
+    assert response.startswith(b"HTTP/1.1 200 OK")
+
+
+def test_rejected_batch_is_not_counted():
+    service = Lr1_service.PasswordService()
+    with pytest.raises((KeyError, TypeError, ValueError, AttributeError)):
+        service.handle_analyze({"items": [{"password": "Qwerty!2024"}, "not an object"]})
+    assert service.items == 0
+    service.handle_analyze({"items": [{"password": "Qwerty!2024"}]})
+    assert service.items == 1
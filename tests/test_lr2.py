@@ -0,0 +1,109 @@
+import pytest
+
+import Lr2
+
+
+@pytest.mark.parametrize("ciphertext", ["", "123", "   !?"])
+def test_rank_caesar_keys_without_letters(ciphertext):
+    scores = Lr2.rank_caesar_keys(ciphertext)
+    assert scores == [(shift, 0.0) for shift in range(Lr2.UKRAINIAN.size)]
+
+
+def test_brute_force_caesar_ranked_without_letters():
+    results = list(Lr2.brute_force_caesar_ranked("123", top_k=3))
+    assert [key for key, _, _ in results] == [0, 1, 2]
+    assert all(chi_squared == 0.0 for _, chi_squared, _ in results)
+
+
+def test_rank_caesar_keys_finds_key():
+    ciphertext = Lr2.caesar_cipher("ЗАХИСТ ІНФОРМАЦІЇ У КОМП'ЮТЕРНИХ СИСТЕМАХ ТА МЕРЕЖАХ", 7)
+    assert Lr2.rank_caesar_keys(ciphertext, top_k=1)[0][0] == 7
+
+
+def test_alphabet_equality_by_value():
+    custom = Lr2.Alphabet('custom', 'ABCXYZ')
+    assert custom == Lr2.Alphabet('custom', 'ABCXYZ')
+    assert custom != Lr2.Alphabet('custom', 'ABCXY')
+    assert hash(custom) == hash(Lr2.Alphabet('custom', 'ABCXYZ'))
+
+
+def test_histogram_from_files_with_custom_alphabet(tmp_path):
+    custom = Lr2.Alphabet('custom', 'ABCXYZ')
+    paths = []
+    for idx, text in enumerate(["ABC XYZ ABC", "XYZ ZZ"]):
+        path = tmp_path / f"part{idx}.txt"
+        path.write_text(text, encoding='cp1251')
+        paths.append(str(path))
+    histogram = Lr2.histogram_from_files(paths, workers=2, alphabet=custom)
+    assert histogram.counts() == [2, 2, 2, 2, 2, 4]
+
+
+def test_merge_rejects_different_alphabets():
+    left = Lr2.LetterHistogram(False, Lr2.Alphabet('custom', 'ABC'))
+    with pytest.raises(ValueError):
+        left.merge(Lr2.LetterHistogram(False, Lr2.Alphabet('custom', 'XYZ')))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_histogram_from_chunks_keeps_bounded_window(monkeypatch, workers):
+    merged = 0
+    merge = Lr2.LetterHistogram.merge
+
+    def counting_merge(self, other):
+        nonlocal merged
+        merged += 1
+        return merge(self, other)
+
+    # merge викликається лише в головному процесі - для кожного готового фрагмента
+    monkeypatch.setattr(Lr2.LetterHistogram, "merge", counting_merge)
+    ahead = []
+
+    def chunks():
+        for pulled in range(1, 51):
+            ahead.append(pulled - merged)
+            yield "АБВ ГҐД"
+
+    histogram = Lr2.histogram_from_chunks(chunks(), workers=workers)
+    assert histogram.counts()[:6] == [50] * 6
+    assert len(ahead) == 50
+    # Жадібний pool.map вичитав би всі 50 фрагментів до першого злиття
+    assert max(ahead) <= 2 * workers
+
+
+def test_histogram_from_chunks_matches_single_pass():
+    parts = ["Захист інформації ", "у комп'ютерних ", "системах та мережах"]
+    pooled = Lr2.histogram_from_chunks(parts, workers=2, ngrams=True)
+    single = Lr2.LetterHistogram.from_text(''.join(parts).upper())
+    assert pooled.counts() == single.counts()
+    # Межі фрагментів тут припадають на пробіли, тож n-грами теж збігаються
+    assert pooled.top_bigrams() == single.top_bigrams()
+    assert pooled.top_trigrams() == single.top_trigrams()
+
+
+def test_ngram_histogram_across_chunks():
+    histogram = Lr2.LetterHistogram().update("АБ").update("ВА БВ")
+    assert histogram.counts()[:3] == [2, 2, 2]
+    assert histogram.top_bigrams() == {"АБ": 1, "БВ": 2, "ВА": 1}
+    assert histogram.top_trigrams() == {"АБВ": 1, "БВА": 1}
+    assert list(histogram.percentages()) == ["А", "Б", "В"]
+
+
+def test_corpus_builders_skip_ngrams_by_default():
+    histogram = Lr2.histogram_from_chunks(["АБВ"], workers=1)
+    assert histogram.top_bigrams() == {} and histogram.counts()[:3] == [1, 1, 1]
+
+
+def test_crack_vigenere_in_pool_matches_serial():
+    import Lr2_crack
+
+    words = ["ЗАХИСТ", "ІНФОРМАЦІЇ", "У", "КОМП'ЮТЕРНИХ", "СИСТЕМАХ", "ТА", "МЕРЕЖАХ", "ШИФР", "КЛЮЧ", "ТЕКСТ"]
+    plaintext = " ".join(words[(i * 7 + i // 3) % len(words)] for i in range(3000))
+    ciphertext = Lr2.vigenere_cipher(plaintext, "ПАРОЛЬ", 'encrypt')
+    assert Lr2_crack.crack_vigenere(ciphertext, workers=2) == Lr2_crack.crack_vigenere(ciphertext, workers=0)
+
+
+def test_estimate_key_lengths_in_pool_matches_serial():
+    import Lr2_crack
+
+    letters = Lr2_crack.cipher_letters(Lr2.vigenere_cipher("ЗАХИСТ ІНФОРМАЦІЇ " * 200, "КЛЮЧ", 'encrypt'))
+    assert Lr2_crack.estimate_key_lengths(letters, workers=2) == Lr2_crack.estimate_key_lengths(letters)
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+import Lr3
+import Lr3_raw
+import Lr3_tiled
+
+
+@pytest.fixture(params=["png", "bmp"])
+def carrier(request, tmp_path):
+    path = str(tmp_path / f"carrier.{request.param}")
+    pixels = np.random.default_rng(0).integers(0, 256, (32, 32, 3), dtype=np.uint8)
+    Image.fromarray(pixels).save(path)
+    return path
+
+
+HIDE_FUNCTIONS = [Lr3.hide_message, Lr3_tiled.hide_message_tiled, Lr3_raw.hide_message_raw]
+
+
+@pytest.mark.parametrize("hide", HIDE_FUNCTIONS)
+@pytest.mark.parametrize("bits_per_channel", [0, 5, 8, -1, 2.0])
+def test_hide_rejects_bits_outside_header_field(carrier, tmp_path, hide, bits_per_channel):
+    output = tmp_path / "stego.png"
+    with pytest.raises(ValueError):
+        hide(carrier, str(output), "Привіт", bits_per_channel=bits_per_channel, verbose=False)
+    assert not output.exists()
+
+
+@pytest.mark.parametrize("hide", HIDE_FUNCTIONS)
+@pytest.mark.parametrize("bits_per_channel", range(1, Lr3.MAX_BITS_PER_CHANNEL + 1))
+def test_hide_roundtrip_for_valid_bits(carrier, tmp_path, hide, bits_per_channel):
+    output = str(tmp_path / ("stego.bmp" if carrier.endswith(".bmp") else "stego.png"))
+    assert hide(carrier, output, "Привіт", bits_per_channel=bits_per_channel, verbose=False)
+    assert Lr3.extract_message(output, verbose=False) == "Привіт"
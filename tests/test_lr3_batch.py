@@ -0,0 +1,61 @@
+import json
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import Lr3_batch
+
+
+def _save(path, fmt):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    pixels = np.random.default_rng(0).integers(0, 256, (16, 16, 3), dtype=np.uint8)
+    Image.fromarray(pixels).save(path, fmt)
+
+
+@pytest.fixture
+def source(tmp_path):
+    root = tmp_path / "src"
+    _save(str(root / "a" / "img.png"), "PNG")
+    _save(str(root / "b" / "img.png"), "PNG")
+    _save(str(root / "x.bmp"), "BMP")
+    _save(str(root / "y.jpg"), "JPEG")
+    _save(str(root / "y.png"), "PNG")
+    return str(root)
+
+
+def _records(tmp_path, command, source, output_dir=None):
+    report = str(tmp_path / f"{command}.jsonl")
+    Lr3_batch.run_batch(command, source, report, output_dir or str(tmp_path / "out"), workers=0, text="hi")
+    with open(report, encoding="utf-8") as f:
+        return {os.path.relpath(r["carrier"], source): r for r in map(json.loads, f)}
+
+
+def test_hide_keeps_relative_paths_and_rejects_collisions(tmp_path, source):
+    records = _records(tmp_path, "hide", source)
+    out = str(tmp_path / "out")
+    assert records[os.path.join("a", "img.png")]["output"] == os.path.join(out, "a", "img.png")
+    assert records[os.path.join("b", "img.png")]["output"] == os.path.join(out, "b", "img.png")
+    assert records["x.bmp"]["output"] == os.path.join(out, "x.bmp")
+    # y.jpg -> y.png вже зайнято результатом попередньої задачі
+    assert records["y.jpg"]["status"] == "ok"
+    assert records["y.png"]["status"] == "error"
+    assert sum(r["status"] == "ok" for r in records.values()) == 4
+
+    extracted = _records(tmp_path, "extract", out)
+    assert {r["message"] for r in extracted.values()} == {"hi"}
+
+
+def test_hide_rejects_output_inside_source(tmp_path, source):
+    with pytest.raises(ValueError):
+        Lr3_batch.run_batch("hide", source, str(tmp_path / "r.jsonl"), source, workers=0, text="hi")
+    with pytest.raises(ValueError):
+        Lr3_batch.run_batch("hide", source, str(tmp_path / "r.jsonl"), os.path.join(source, "out"), workers=0,
+                            text="hi")
+
+
+def test_plan_outputs_rejects_input_overwrite(tmp_path, source):
+    carrier = os.path.join(source, "x.bmp")
+    [(_, _, output, error)] = Lr3_batch.plan_outputs([(carrier, "hi", carrier)], str(tmp_path / "out"))
+    assert output == carrier and error is not None
@@ -0,0 +1,31 @@
+import argparse
+
+import numpy as np
+import pytest
+
+import Lr3_raw
+
+
+@pytest.fixture
+def raw_rgb(tmp_path):
+    path = tmp_path / "image.rgb"
+    np.random.default_rng(0).integers(0, 256, (40, 30, 3), dtype=np.uint8).tofile(path)
+    return str(path)
+
+
+def test_raw_rgb_roundtrip_with_shape(raw_rgb, tmp_path):
+    output = str(tmp_path / "stego.rgb")
+    assert Lr3_raw.hide_message_raw(raw_rgb, output, "Привіт", verbose=False, shape=(30, 40))
+    assert Lr3_raw.extract_message_raw(output, verbose=False, shape=(30, 40)) == "Привіт"
+
+
+def test_is_raw_carrier_checks_shape(raw_rgb):
+    assert not Lr3_raw.is_raw_carrier(raw_rgb)
+    assert Lr3_raw.is_raw_carrier(raw_rgb, shape=(30, 40))
+    assert not Lr3_raw.is_raw_carrier(raw_rgb, shape=(31, 40))
+
+
+def test_parse_shape():
+    assert Lr3_raw.parse_shape("640x480") == (640, 480)
+    with pytest.raises(argparse.ArgumentTypeError):
+        Lr3_raw.parse_shape("640")
@@ -0,0 +1,23 @@
+import pytest
+
+import Lr4
+import Lr4_keygen
+
+
+@pytest.fixture(scope="module")
+def key():
+    p, q = Lr4_keygen.generate_rsa_primes(512, workers=0)
+    return Lr4.make_private_key(p, q)
+
+
+def _sign(key, document):
+    data = document.encode('utf-8') if isinstance(document, str) else bytes(document)
+    return Lr4.rsa_sign(key, Lr4.simplified_hash_reduction(Lr4.hash_to_int(data), key.n))
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_verify_batch_rejects_non_documents(key, workers):
+    signature = _sign(key, "документ")
+    pairs = [("документ", signature), (None, signature), (42, signature), (b"bytes", _sign(key, b"bytes")),
+             (memoryview(b"view"), _sign(key, b"view")), ("інший", signature)]
+    assert list(Lr4.verify_batch(pairs, (key.e, key.n), workers=workers)) == [1, 0, 0, 1, 1, 0]